@@ -0,0 +1,40 @@
+"""Add ON DELETE CASCADE and indexes to submenu and dish foreign keys
+
+Revision ID: 3a7c1e5d9b42
+Revises: e4f1ff7eeae4
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3a7c1e5d9b42'
+down_revision: str | None = 'e4f1ff7eeae4'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.drop_constraint('submenu_menu_id_fkey', 'submenu', type_='foreignkey')
+    op.create_foreign_key(
+        'submenu_menu_id_fkey', 'submenu', 'menu', ['menu_id'], ['id'], ondelete='CASCADE'
+    )
+    op.drop_constraint('dish_submenu_id_fkey', 'dish', type_='foreignkey')
+    op.create_foreign_key(
+        'dish_submenu_id_fkey', 'dish', 'submenu', ['submenu_id'], ['id'], ondelete='CASCADE'
+    )
+
+    # Индексы по внешним ключам, чтобы каскадное удаление не просматривало дочерние таблицы целиком
+    op.create_index(op.f('ix_submenu_menu_id'), 'submenu', ['menu_id'], unique=False)
+    op.create_index(op.f('ix_dish_submenu_id'), 'dish', ['submenu_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_dish_submenu_id'), table_name='dish')
+    op.drop_index(op.f('ix_submenu_menu_id'), table_name='submenu')
+    op.drop_constraint('dish_submenu_id_fkey', 'dish', type_='foreignkey')
+    op.create_foreign_key('dish_submenu_id_fkey', 'dish', 'submenu', ['submenu_id'], ['id'])
+    op.drop_constraint('submenu_menu_id_fkey', 'submenu', type_='foreignkey')
+    op.create_foreign_key('submenu_menu_id_fkey', 'submenu', 'menu', ['menu_id'], ['id'])
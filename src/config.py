@@ -13,9 +13,95 @@ DB_NAME = os.environ.get('DB_NAME')
 DB_USER = os.environ.get('DB_USER')
 DB_PASS = os.environ.get('DB_PASS')
 
+# Пул соединений с БД
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 30))
+DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', -1))
+DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'false').lower() == 'true'
+
+# Кэш подготовленных запросов asyncpg (на каждое соединение)
+DB_STATEMENT_CACHE_SIZE = int(os.environ.get('DB_STATEMENT_CACHE_SIZE', 100))
+DB_STATEMENT_CACHE_LIFETIME = int(os.environ.get('DB_STATEMENT_CACHE_LIFETIME', 300))
+DB_PREPARED_STATEMENT_CACHE_SIZE = int(os.environ.get('DB_PREPARED_STATEMENT_CACHE_SIZE', 100))
+
 REDIS_HOST = os.environ.get('REDIS_HOST')
 REDIS_PORT = os.environ.get('REDIS_PORT')
 
+# Время жизни записей кэша (в секундах, 0 - без ограничения): общее и по классам ключей - все данные,
+# страницы списков, отдельные записи. После смены поколения кэша меню старые записи подменю и блюд больше
+# не читаются и удаляются Redis по истечении TTL
+CACHE_TTL = int(os.environ.get('CACHE_TTL', 3600))
+CACHE_TTL_ALL_DATA = int(os.environ.get('CACHE_TTL_ALL_DATA', CACHE_TTL))
+CACHE_TTL_LIST = int(os.environ.get('CACHE_TTL_LIST', CACHE_TTL))
+CACHE_TTL_ITEM = int(os.environ.get('CACHE_TTL_ITEM', CACHE_TTL))
+# Максимальная случайная надбавка к времени жизни записи (доля от TTL)
+CACHE_TTL_JITTER = float(os.environ.get('CACHE_TTL_JITTER', 0.1))
+# Время жизни маркера отсутствующей в БД записи (в секундах, 0 - отсутствие записей не кэшируется)
+CACHE_NOT_FOUND_TTL = int(os.environ.get('CACHE_NOT_FOUND_TTL', 10))
+
+# Время (в секундах), в течение которого после очистки отдается устаревший кэш со всеми данными и списком меню,
+# пока он пересобирается в фоне (0 - устаревший кэш не отдается, записи удаляются сразу)
+CACHE_STALE_TTL = int(os.environ.get('CACHE_STALE_TTL', 0))
+
+# Сжатие значений кэша в Redis по классам ключей: все данные, страницы списков, отдельные записи
+# (none, zlib, zstd - пакет zstandard, lz4 - пакет lz4) и минимальный размер сжимаемого значения (в байтах)
+CACHE_CODEC_ALL_DATA = os.environ.get('CACHE_CODEC_ALL_DATA', 'zlib')
+CACHE_CODEC_LIST = os.environ.get('CACHE_CODEC_LIST', 'zlib')
+CACHE_CODEC_ITEM = os.environ.get('CACHE_CODEC_ITEM', 'none')
+CACHE_COMPRESSION_MIN_SIZE = int(os.environ.get('CACHE_COMPRESSION_MIN_SIZE', 16 * 1024))
+
+# Автоматический выключатель кэша: таймаут операции с Redis (в секундах), таймаут чтения и записи объемных
+# документов (все данные и их фрагменты), кол-во ошибок подряд, после которого Redis перестает использоваться,
+# и время (в секундах) до пробной операции
+CACHE_BREAKER_TIMEOUT = float(os.environ.get('CACHE_BREAKER_TIMEOUT', 0.25))
+CACHE_BREAKER_BULK_TIMEOUT = float(os.environ.get('CACHE_BREAKER_BULK_TIMEOUT', 2))
+CACHE_BREAKER_FAILURES = int(os.environ.get('CACHE_BREAKER_FAILURES', 5))
+CACHE_BREAKER_COOLDOWN = float(os.environ.get('CACHE_BREAKER_COOLDOWN', 10))
+
+# Кол-во записей, записываемых в кэш одним пайплайном при заполнении кэша после синхронизации с exel-файлом
+# (каждая часть ограничена таймаутом CACHE_BREAKER_BULK_TIMEOUT)
+CACHE_PREWARM_CHUNK = int(os.environ.get('CACHE_PREWARM_CHUNK', 500))
+
+# Кэширование ответов на CDN / обратном прокси по роутам: время хранения ответа на CDN (s-maxage заголовка
+# Cache-Control, в секундах, 0 - no-cache) и время, в течение которого CDN может отдавать устаревший ответ,
+# пока перепроверяет его (0 - не отдает). Значения по умолчанию задаются по классам ответов - все данные,
+# списки, отдельные записи - и общим stale-while-revalidate, значения роутов (списки и записи меню, подменю
+# и блюд) их переопределяют
+EDGE_MAX_AGE_ALL_DATA = int(os.environ.get('EDGE_MAX_AGE_ALL_DATA', 0))
+EDGE_MAX_AGE_LIST = int(os.environ.get('EDGE_MAX_AGE_LIST', 0))
+EDGE_MAX_AGE_ITEM = int(os.environ.get('EDGE_MAX_AGE_ITEM', 0))
+EDGE_MAX_AGE_MENUS = int(os.environ.get('EDGE_MAX_AGE_MENUS', EDGE_MAX_AGE_LIST))
+EDGE_MAX_AGE_MENU = int(os.environ.get('EDGE_MAX_AGE_MENU', EDGE_MAX_AGE_ITEM))
+EDGE_MAX_AGE_SUBMENUS = int(os.environ.get('EDGE_MAX_AGE_SUBMENUS', EDGE_MAX_AGE_LIST))
+EDGE_MAX_AGE_SUBMENU = int(os.environ.get('EDGE_MAX_AGE_SUBMENU', EDGE_MAX_AGE_ITEM))
+EDGE_MAX_AGE_DISHES = int(os.environ.get('EDGE_MAX_AGE_DISHES', EDGE_MAX_AGE_LIST))
+EDGE_MAX_AGE_DISH = int(os.environ.get('EDGE_MAX_AGE_DISH', EDGE_MAX_AGE_ITEM))
+EDGE_STALE_WHILE_REVALIDATE = int(os.environ.get('EDGE_STALE_WHILE_REVALIDATE', 0))
+EDGE_STALE_WHILE_REVALIDATE_ALL_DATA = int(os.environ.get('EDGE_STALE_WHILE_REVALIDATE_ALL_DATA', EDGE_STALE_WHILE_REVALIDATE))
+EDGE_STALE_WHILE_REVALIDATE_MENUS = int(os.environ.get('EDGE_STALE_WHILE_REVALIDATE_MENUS', EDGE_STALE_WHILE_REVALIDATE))
+EDGE_STALE_WHILE_REVALIDATE_MENU = int(os.environ.get('EDGE_STALE_WHILE_REVALIDATE_MENU', EDGE_STALE_WHILE_REVALIDATE))
+EDGE_STALE_WHILE_REVALIDATE_SUBMENUS = int(os.environ.get('EDGE_STALE_WHILE_REVALIDATE_SUBMENUS', EDGE_STALE_WHILE_REVALIDATE))
+EDGE_STALE_WHILE_REVALIDATE_SUBMENU = int(os.environ.get('EDGE_STALE_WHILE_REVALIDATE_SUBMENU', EDGE_STALE_WHILE_REVALIDATE))
+EDGE_STALE_WHILE_REVALIDATE_DISHES = int(os.environ.get('EDGE_STALE_WHILE_REVALIDATE_DISHES', EDGE_STALE_WHILE_REVALIDATE))
+EDGE_STALE_WHILE_REVALIDATE_DISH = int(os.environ.get('EDGE_STALE_WHILE_REVALIDATE_DISH', EDGE_STALE_WHILE_REVALIDATE))
+# Очистка кэша CDN по суррогатным ключам при очистке кэша Redis: none, local (в памяти процесса, для тестов),
+# http (запрос PURGE на EDGE_PURGE_URL), токен для заголовка Authorization и таймаут запроса (в секундах)
+EDGE_PURGER = os.environ.get('EDGE_PURGER', 'none')
+EDGE_PURGE_URL = os.environ.get('EDGE_PURGE_URL', '')
+EDGE_PURGE_TOKEN = os.environ.get('EDGE_PURGE_TOKEN', '')
+EDGE_PURGE_TIMEOUT = float(os.environ.get('EDGE_PURGE_TIMEOUT', 2))
+
+# Процессный (L1) кэш перед Redis
+L1_CACHE_ENABLED = os.environ.get('L1_CACHE_ENABLED', 'true').lower() == 'true'
+L1_CACHE_TTL = float(os.environ.get('L1_CACHE_TTL', 30))
+L1_CACHE_MAX_BYTES = int(os.environ.get('L1_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+
+# Пересборка отсутствующих в кэше горячих ключей одним запросом (в секундах): время жизни блокировки в Redis
+# и максимальное время ожидания результата пересборки другим процессом
+SINGLE_FLIGHT_LOCK_TTL = float(os.environ.get('SINGLE_FLIGHT_LOCK_TTL', 5))
+SINGLE_FLIGHT_WAIT = float(os.environ.get('SINGLE_FLIGHT_WAIT', 5))
+
 RABBITMQ_USER = os.environ.get('RABBITMQ_USER')
 RABBITMQ_PASS = os.environ.get('RABBITMQ_PASS')
 RABBITMQ_HOST = os.environ.get('RABBITMQ_HOST')
@@ -1,14 +1,97 @@
+import time
 from typing import AsyncGenerator
 
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, exc
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+from src.config import (
+    DB_HOST,
+    DB_MAX_OVERFLOW,
+    DB_NAME,
+    DB_PASS,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_PORT,
+    DB_PREPARED_STATEMENT_CACHE_SIZE,
+    DB_STATEMENT_CACHE_LIFETIME,
+    DB_STATEMENT_CACHE_SIZE,
+    DB_USER,
+)
+
+
+class ObservableAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений с БД со сбором статистики по выдаче соединений
+    """
+
+    # Счетчики общие для всех экземпляров пула (пул пересоздается при dispose() / инвалидации)
+    _checkouts: int = 0
+    _timeouts: int = 0
+    _wait_time_total: float = 0.0
+    _wait_time_max: float = 0.0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        """
+        Получение соединения из пула с замером времени ожидания и подсчетом таймаутов
+        """
+        start = time.perf_counter()
+
+        try:
+            connection = super()._do_get()
+
+        except exc.TimeoutError:
+            ObservableAsyncPool._timeouts += 1
+            raise
+
+        finally:
+            wait_time = time.perf_counter() - start
+            ObservableAsyncPool._wait_time_total += wait_time
+            ObservableAsyncPool._wait_time_max = max(ObservableAsyncPool._wait_time_max, wait_time)
+
+        ObservableAsyncPool._checkouts += 1
+
+        return connection
+
+    def stats(self) -> dict:
+        """
+        Текущее состояние пула и накопленная статистика выдачи соединений
+        :return: словарь со статистикой
+        """
+        return {
+            'pool_size': self.size(),
+            'max_overflow': self._max_overflow,
+            'checked_in': self.checkedin(),
+            'checked_out': self.checkedout(),
+            'overflow': max(self.overflow(), 0),
+            'checkouts': ObservableAsyncPool._checkouts,
+            'timeouts': ObservableAsyncPool._timeouts,
+            'wait_time_total': round(ObservableAsyncPool._wait_time_total, 6),
+            'wait_time_max': round(ObservableAsyncPool._wait_time_max, 6),
+        }
 
-from src.config import DB_HOST, DB_NAME, DB_PASS, DB_PORT, DB_USER
 
 DATABASE_URL = f'postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
 metadata = MetaData()
-engine = create_async_engine(DATABASE_URL)
+engine = create_async_engine(
+    DATABASE_URL,
+    poolclass=ObservableAsyncPool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    connect_args={
+        # Кэш подготовленных запросов на стороне asyncpg
+        'statement_cache_size': DB_STATEMENT_CACHE_SIZE,
+        'max_cached_statement_lifetime': DB_STATEMENT_CACHE_LIFETIME,
+        # Кэш подготовленных запросов в адаптере SQLAlchemy для asyncpg
+        'prepared_statement_cache_size': DB_PREPARED_STATEMENT_CACHE_SIZE,
+    },
+)
 
 
 class Base(DeclarativeBase):
@@ -31,3 +114,11 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """
     async with async_session_maker() as session:
         yield session
+
+
+def get_pool_stats() -> dict:
+    """
+    Функция возвращает статистику пула соединений с БД
+    :return: словарь со статистикой
+    """
+    return engine.pool.stats()
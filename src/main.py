@@ -1,5 +1,8 @@
+import asyncio
+
 from fastapi import FastAPI
 
+from src.repositories.cache.storage import CacheStorage
 from src.urls import register_routers
 from src.utils.exceptions import CustomApiException, custom_api_exception_handler
 
@@ -10,3 +13,19 @@ register_routers(app)
 
 # Регистрация кастомного исключения
 app.add_exception_handler(CustomApiException, custom_api_exception_handler)
+
+
+@app.on_event('startup')
+async def start_cache_invalidation_listener() -> None:
+    """
+    Запуск фоновой подписки на очистку кэша (для L1-кэша процесса)
+    """
+    app.state.cache_invalidation_listener = asyncio.create_task(CacheStorage.listen_invalidations())
+
+
+@app.on_event('shutdown')
+async def stop_cache_invalidation_listener() -> None:
+    """
+    Остановка фоновой подписки на очистку кэша
+    """
+    app.state.cache_invalidation_listener.cancel()
@@ -1,10 +1,18 @@
-from sqlalchemy import Float, ForeignKey, Integer
+from decimal import ROUND_HALF_UP, Decimal
+
+from sqlalchemy import Float, ForeignKey, Integer, Numeric, cast, func
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.util.preloaded import orm
 
 from src.models.abc_model import BaseABC
 
+# Цена хранится в real: Postgres приводит real к numeric с 6-ю значащими цифрами (FLT_DIG),
+# поэтому в Python цена приводится к Decimal так же
+PRICE_DIGITS = 6
+PRICE_QUANTUM = Decimal('0.01')
+
 
 class Dish(BaseABC):
     """
@@ -15,20 +23,26 @@ class Dish(BaseABC):
 
     price: Mapped[float] = mapped_column(Float(precision=2))
     discount: Mapped[int] = mapped_column(Integer, default=0)
-    submenu_id: Mapped[int] = mapped_column(ForeignKey('submenu.id'))
+    submenu_id: Mapped[int] = mapped_column(ForeignKey('submenu.id', ondelete='CASCADE'), index=True)
 
     @hybrid_property
-    def discount_price(self) -> int:
+    def discount_price(self) -> Decimal:
         """
-        Цена с учетом скидки
+        Цена с учетом скидки, округленная до 2-х знаков после запятой (половина округляется от нуля,
+        как round() для numeric в Postgres)
         """
-        if self.discount > 0:
-            discount = self.price * (self.discount / 100)
-            new_price = round(self.price - discount, 2)
+        price = Decimal(f'{self.price:.{PRICE_DIGITS}g}')
+        discount_price = price * (100 - (self.discount or 0)) / 100
 
-            return new_price
+        return discount_price.quantize(PRICE_QUANTUM, rounding=ROUND_HALF_UP)
 
-        return round(self.price, 2)
+    @discount_price.inplace.expression
+    @classmethod
+    def _discount_price_expression(cls) -> ColumnElement[Decimal]:
+        """
+        Цена с учетом скидки в запросах к БД (вычисляется в numeric по тому же правилу округления)
+        """
+        return func.round(cast(cls.price, Numeric) * (100 - cls.discount) / 100, 2)
 
     @orm.validates('discount')
     def validate_discount(self, key, value):
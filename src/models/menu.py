@@ -1,7 +1,9 @@
+from sqlalchemy import ScalarSelect, func, select
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, relationship
 
 from src.models.abc_model import BaseABC
+from src.models.dish import Dish
 from src.models.submenu import Submenu
 
 
@@ -12,8 +14,9 @@ class Menu(BaseABC):
 
     __tablename__ = 'menu'
 
+    # passive_deletes - дочерние записи удаляются каскадно на стороне БД (ON DELETE CASCADE)
     submenus: Mapped[list['Submenu']] = relationship(
-        backref='menu', cascade='all, delete'
+        backref='menu', cascade='all, delete', passive_deletes=True
     )
 
     @hybrid_property
@@ -23,6 +26,18 @@ class Menu(BaseABC):
         """
         return len(self.submenus)
 
+    @submenus_count.inplace.expression
+    @classmethod
+    def _submenus_count_expression(cls) -> ScalarSelect[int]:
+        """
+        Подсчет кол-ва подменю в меню на стороне БД (без загрузки связанных записей)
+        """
+        return (
+            select(func.count(Submenu.id))
+            .where(Submenu.menu_id == cls.id)
+            .scalar_subquery()
+        )
+
     @hybrid_property
     def dishes_count(self) -> int:
         """
@@ -31,6 +46,19 @@ class Menu(BaseABC):
         count = sum(submenu.dishes_count for submenu in self.submenus)
         return count
 
+    @dishes_count.inplace.expression
+    @classmethod
+    def _dishes_count_expression(cls) -> ScalarSelect[int]:
+        """
+        Подсчет кол-ва блюд в меню на стороне БД (без загрузки связанных записей)
+        """
+        return (
+            select(func.count(Dish.id))
+            .join(Submenu, Dish.submenu_id == Submenu.id)
+            .where(Submenu.menu_id == cls.id)
+            .scalar_subquery()
+        )
+
     def as_dict(self):
         """
         Преобразование модели в словарь (для кэширования в Redis)
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, ScalarSelect, func, select
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -13,9 +13,11 @@ class Submenu(BaseABC):
 
     __tablename__ = 'submenu'
 
-    menu_id: Mapped[int] = mapped_column(ForeignKey('menu.id'))
+    menu_id: Mapped[int] = mapped_column(ForeignKey('menu.id', ondelete='CASCADE'), index=True)
+
+    # passive_deletes - дочерние записи удаляются каскадно на стороне БД (ON DELETE CASCADE)
     dishes: Mapped[list['Dish']] = relationship(
-        backref='submenu', cascade='all, delete'
+        backref='submenu', cascade='all, delete', passive_deletes=True
     )
 
     @hybrid_property
@@ -26,6 +28,18 @@ class Submenu(BaseABC):
         """
         return len(self.dishes)
 
+    @dishes_count.inplace.expression
+    @classmethod
+    def _dishes_count_expression(cls) -> ScalarSelect[int]:
+        """
+        Подсчет кол-ва блюд в подменю на стороне БД (без загрузки связанных записей)
+        """
+        return (
+            select(func.count(Dish.id))
+            .where(Dish.submenu_id == cls.id)
+            .scalar_subquery()
+        )
+
     def as_dict(self) -> dict:
         """
         Преобразование модели в словарь (для кэширования в Redis)
@@ -0,0 +1,130 @@
+from sqlalchemy import Integer, Select, Text, cast, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.models.dish import Dish
+from src.models.menu import Menu
+from src.models.submenu import Submenu
+
+# Пустой json-массив для записей без вложенных подменю / блюд (json_agg по пустой выборке возвращает NULL)
+EMPTY_JSON_ARRAY = literal_column("'[]'::json")
+
+
+def _json_object(**fields: ColumnElement) -> ColumnElement:
+    """
+    Функция формирует выражение json_build_object() с переданными полями
+    :param fields: ключи и значения json-объекта
+    :return: SQL-выражение
+    """
+    args = []
+
+    for key, value in fields.items():
+        # Ключи передаются литералами, а не параметрами, т.к. Postgres не может определить тип параметра
+        # в аргументах json_build_object()
+        args.extend((literal_column(f"'{key}'"), value))
+
+    return func.json_build_object(*args)
+
+
+def _menus_query(menus_ids: list[str] | None = None) -> Select:
+    """
+    Функция формирует запрос id меню и json-объекта меню со всеми связанными подменю и блюдами,
+    собранного на стороне БД (структура объекта соответствует MenuWithSubmenusOutSchema)
+    :param menus_ids: список id меню (None - все меню)
+    :return: SQL-запрос
+    """
+    dishes = (
+        select(
+            Dish.submenu_id,
+            func.json_agg(
+                _json_object(
+                    id=Dish.id,
+                    title=Dish.title,
+                    description=Dish.description,
+                    # Цена со скидкой в numeric с 2-мя знаками после запятой выводится как '100.00'
+                    price=cast(Dish.discount_price, Text),
+                )
+            ).label('dishes'),
+            func.count(Dish.id).label('dishes_count'),
+        )
+        .group_by(Dish.submenu_id)
+    )
+
+    if menus_ids is not None:
+        # Фильтр по меню добавляется и в подзапросы, чтобы подменю и блюда остальных меню не агрегировались
+        dishes = dishes.where(Dish.submenu_id.in_(select(Submenu.id).where(Submenu.menu_id.in_(menus_ids))))
+
+    dishes = dishes.subquery()
+    submenu_dishes_count = func.coalesce(dishes.c.dishes_count, 0)
+    submenus = (
+        select(
+            Submenu.menu_id,
+            func.json_agg(
+                _json_object(
+                    id=Submenu.id,
+                    title=Submenu.title,
+                    description=Submenu.description,
+                    dishes_count=submenu_dishes_count,
+                    dishes=func.coalesce(dishes.c.dishes, EMPTY_JSON_ARRAY),
+                )
+            ).label('submenus'),
+            func.count(Submenu.id).label('submenus_count'),
+            cast(func.sum(submenu_dishes_count), Integer).label('dishes_count'),
+        )
+        .outerjoin(dishes, dishes.c.submenu_id == Submenu.id)
+        .group_by(Submenu.menu_id)
+    )
+
+    if menus_ids is not None:
+        submenus = submenus.where(Submenu.menu_id.in_(menus_ids))
+
+    submenus = submenus.subquery()
+
+    menu = _json_object(
+        id=Menu.id,
+        title=Menu.title,
+        description=Menu.description,
+        submenus_count=func.coalesce(submenus.c.submenus_count, 0),
+        dishes_count=func.coalesce(submenus.c.dishes_count, 0),
+        submenus=func.coalesce(submenus.c.submenus, EMPTY_JSON_ARRAY),
+    )
+    query = (
+        select(Menu.id, cast(menu, Text))
+        .outerjoin(submenus, submenus.c.menu_id == Menu.id)
+        .order_by(Menu.id)
+    )
+
+    if menus_ids is not None:
+        query = query.where(Menu.id.in_(menus_ids))
+
+    return query
+
+
+class AllDataRepository:
+    """
+    Получение всех меню со всеми связанными подменю и блюдами из БД
+    """
+
+    @classmethod
+    async def get_menus_ids(cls, session: AsyncSession) -> list[str]:
+        """
+        Метод возвращает id всех меню в порядке вывода всех данных
+        :param session: объект асинхронной сессии для запросов к БД
+        :return: список id меню
+        """
+        res = await session.execute(select(Menu.id).order_by(Menu.id))
+
+        return [str(menu_id) for menu_id in res.scalars().all()]
+
+    @classmethod
+    async def get_menus_json(cls, session: AsyncSession, menus_ids: list[str] | None = None) -> dict[str, str]:
+        """
+        Метод возвращает меню со всеми связанными подменю и блюдами в виде готовых json-документов,
+        собранных на стороне БД (по одному документу на меню, структура соответствует MenuWithSubmenusOutSchema)
+        :param session: объект асинхронной сессии для запросов к БД
+        :param menus_ids: список id меню (None - все меню)
+        :return: словарь с id меню и json-строкой меню в порядке id меню
+        """
+        res = await session.execute(_menus_query(menus_ids=menus_ids))
+
+        return {str(menu_id): menu for menu_id, menu in res.all()}
@@ -1,38 +1,115 @@
-from fastapi_redis import redis_client
+import json
+
 from loguru import logger
 
-from src.models.menu import Menu
+from src.repositories.cache.metrics import CacheMetrics
+from src.repositories.cache.storage import CacheStorage
 
 
 class AllDataCacheRepository:
     """
-    Проверка и добавление записей о меню со всеми связанными подменю и со всеми связанными блюдами в кэш
+    Проверка и добавление записей о меню со всеми связанными подменю и со всеми связанными блюдами в кэш.
+    Кроме собранного документа со всеми данными, в кэше хранятся документы каждого меню (фрагменты) и порядок
+    меню: при изменении одного меню очищается только его фрагмент, остальные фрагменты переиспользуются
     """
     __all_data = 'all_data'
+    __menus = 'all_data_menus'
+    __fragment = 'menu_{menu_id}_all_data'
+
+    @classmethod
+    def key(cls) -> str:
+        """
+        Метод возвращает ключ кэша со всеми данными
+        :return: ключ
+        """
+        return cls.__all_data
 
     @classmethod
-    async def get_data(cls) -> list | None:
+    def menus_key(cls) -> str:
+        """
+        Метод возвращает ключ кэша со списком id меню в порядке вывода всех данных
+        :return: ключ
+        """
+        return cls.__menus
+
+    @classmethod
+    def fragment_key(cls, menu_id: str) -> str:
+        """
+        Метод возвращает ключ кэша фрагмента всех данных с одним меню
+        :param menu_id: id меню
+        :return: ключ
+        """
+        return cls.__fragment.format(menu_id=menu_id)
+
+    @classmethod
+    @CacheMetrics.observe
+    async def get_data(cls) -> bytes | None:
         """
         Метод проверяет в кэше записи о всех данных
-        :return: словарь с данными, если есть кэш, иначе None
+        :return: готовый json-документ с данными, если есть кэш, иначе None
+        """
+        return await CacheStorage.get(cls.__all_data)
+
+    @classmethod
+    @CacheMetrics.observe
+    async def get_etag(cls) -> str | None:
+        """
+        Метод проверяет в кэше ETag записи о всех данных
+        :return: ETag, если есть кэш, иначе None
+        """
+        return await CacheStorage.get_etag(cls.__all_data)
+
+    @classmethod
+    @CacheMetrics.observe
+    async def get_stale_data(cls) -> bytes | None:
+        """
+        Метод проверяет в кэше устаревшие записи о всех данных, сохраненные при очистке кэша
+        :return: готовый json-документ с данными, если есть устаревший кэш, иначе None
+        """
+        return await CacheStorage.get_stale(cls.__all_data)
+
+    @classmethod
+    @CacheMetrics.observe
+    async def get_menus_order(cls) -> bytes | None:
+        """
+        Метод проверяет в кэше список id меню в порядке вывода всех данных
+        :return: json-документ со списком id меню, если есть кэш, иначе None
+        """
+        return await CacheStorage.get(cls.__menus)
+
+    @classmethod
+    @CacheMetrics.observe
+    async def get_fragments(cls, menus_ids: list[str]) -> list[bytes | None]:
+        """
+        Метод проверяет в кэше фрагменты всех данных для нескольких меню (одной командой MGET)
+        :param menus_ids: список id меню
+        :return: список json-документов меню в порядке id (None для отсутствующих в кэше)
         """
-        return await redis_client.get(cls.__all_data)
+        return await CacheStorage.get_many([cls.fragment_key(menu_id=menu_id) for menu_id in menus_ids])
 
     @classmethod
-    async def set_data(cls, menus_list: list[Menu]) -> None:
+    @CacheMetrics.observe
+    async def set_data(cls, data: bytes, menus_ids: list[str], fragments: dict[str, bytes]) -> None:
         """
-        Метод записывает в кэш данные о всех записях
-        :param menus_list: список с меню
+        Метод записывает в кэш данные о всех записях, список id меню и пересобранные фрагменты
+        за один обмен с Redis
+        :param data: готовый json-документ со всеми меню, подменю и блюдами
+        :param menus_ids: список id меню в порядке вывода
+        :param fragments: словарь с id меню и json-документом меню (только пересобранные фрагменты)
         :return: None
         """
-        await redis_client.set(cls.__all_data, [menu.as_all_dict() for menu in menus_list])
-        logger.info('Все данные кэшированы')
+        await CacheStorage.set_many({
+            cls.__all_data: data,
+            cls.__menus: json.dumps(menus_ids).encode(),
+            **{cls.fragment_key(menu_id=menu_id): fragment for menu_id, fragment in fragments.items()},
+        })
+        logger.info(f'Все данные кэшированы (пересобрано меню: {len(fragments)} из {len(menus_ids)})')
 
     @classmethod
     async def delete_data(cls) -> None:
         """
-        Метод очищает кэш со списком меню
+        Метод очищает кэш со всеми данными и порядком меню (фрагменты меню очищаются при изменении своего меню)
         :return: None
         """
-        await redis_client.delete(cls.__all_data)
+        await CacheStorage.delete(cls.__all_data, cls.__menus)
         logger.info('Кэш со всеми данными очищен')
@@ -0,0 +1,228 @@
+import asyncio
+import functools
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable
+
+from aioredis.exceptions import RedisError
+from fastapi_redis import redis_client
+from loguru import logger
+
+from src.config import (
+    CACHE_BREAKER_COOLDOWN,
+    CACHE_BREAKER_FAILURES,
+    CACHE_BREAKER_TIMEOUT,
+)
+
+
+class CacheCircuitBreaker:
+    """
+    Автоматический выключатель кэша: операции с Redis ограничены коротким таймаутом (чтение и запись
+    объемных документов - CACHE_BREAKER_BULK_TIMEOUT), после CACHE_BREAKER_FAILURES
+    ошибок подряд Redis не используется CACHE_BREAKER_COOLDOWN секунд (операции сразу возвращают значение
+    по умолчанию, данные читаются из БД), затем одна пробная операция проверяет, восстановлен ли Redis
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    __state: str = CLOSED
+    __failures: int = 0
+    __opened_at: float = 0.0
+
+    # Статистика: кол-во размыканий и операций, выполненных без обращения к Redis
+    __opened: int = 0
+    __rejected: int = 0
+
+    # Счетчик операций, вернувших значение по умолчанию, в вызове, выполняемом через track()
+    # (значение по умолчанию не должно учитываться в статистике кэша как промах)
+    __fallbacks: ContextVar[list[int] | None] = ContextVar('cache_breaker_fallbacks', default=None)
+
+    # Функции, вызываемые после восстановления Redis, и их задачи
+    __recovery_callbacks: list[Callable[[], Awaitable[None]]] = []
+    __recovery_tasks: set[asyncio.Task] = set()
+
+    @classmethod
+    def protect(
+            cls,
+            fallback: Callable[..., Any] | None = None,
+            timeout: Callable[..., float] | None = None,
+    ) -> Callable:
+        """
+        Декоратор метода (под @classmethod), обращающегося к Redis
+        :param fallback: функция, вызываемая с аргументами метода, когда Redis недоступен
+            (ее результат возвращается вместо результата метода; None - метод возвращает None)
+        :param timeout: функция, вызываемая с аргументами метода, возвращает таймаут операции в секундах
+            (None - CACHE_BREAKER_TIMEOUT)
+        :return: декоратор
+        """
+        def decorator(method: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+            @functools.wraps(method)
+            async def wrapper(*args, **kwargs) -> Any:
+                if not cls.__allow():
+                    cls.__rejected += 1
+                    cls.__count_fallback()
+                    return fallback(*args, **kwargs) if fallback else None
+
+                limit = timeout(*args, **kwargs) if timeout else CACHE_BREAKER_TIMEOUT
+
+                try:
+                    result = await asyncio.wait_for(method(*args, **kwargs), timeout=limit)
+
+                except (RedisError, OSError, asyncio.TimeoutError) as exc:
+                    await cls.__failure(exc)
+                    cls.__count_fallback()
+                    return fallback(*args, **kwargs) if fallback else None
+
+                except BaseException:
+                    # Пробная операция прервана не ошибкой Redis (отмена запроса) - следующая операция
+                    # снова будет пробной
+                    if cls.__state == cls.HALF_OPEN:
+                        cls.__state = cls.OPEN
+                    raise
+
+                cls.__success()
+
+                return result
+
+            return wrapper
+
+        return decorator
+
+    @classmethod
+    async def track(cls, call: Awaitable[Any]) -> tuple[Any, int]:
+        """
+        Метод выполняет вызов и подсчитывает операции с Redis внутри него, вернувшие значение по умолчанию
+        (вложенные вызовы учитываются и во внешнем)
+        :param call: вызов метода
+        :return: результат вызова и кол-во операций, вернувших значение по умолчанию
+        """
+        outer = cls.__fallbacks.get()
+        fallbacks = [0]
+        token = cls.__fallbacks.set(fallbacks)
+
+        try:
+            result = await call
+
+        finally:
+            cls.__fallbacks.reset(token)
+
+            if outer is not None:
+                outer[0] += fallbacks[0]
+
+        return result, fallbacks[0]
+
+    @classmethod
+    def available(cls) -> bool:
+        """
+        Метод проверяет, используется ли Redis (выключатель замкнут)
+        :return: True - Redis используется, иначе False
+        """
+        return cls.__state == cls.CLOSED
+
+    @classmethod
+    def on_recovery(cls, callback: Callable[[], Awaitable[None]]) -> None:
+        """
+        Метод регистрирует функцию, запускаемую в фоне после восстановления Redis
+        :param callback: асинхронная функция без аргументов
+        :return: None
+        """
+        cls.__recovery_callbacks.append(callback)
+
+    @classmethod
+    def stats(cls) -> dict:
+        """
+        Метод возвращает состояние выключателя и накопленную статистику
+        :return: словарь со статистикой
+        """
+        return {
+            'state': cls.__state,
+            'failures': cls.__failures,
+            'opened': cls.__opened,
+            'rejected': cls.__rejected,
+        }
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Метод замыкает выключатель и сбрасывает счетчик ошибок
+        :return: None
+        """
+        cls.__state = cls.CLOSED
+        cls.__failures = 0
+
+    @classmethod
+    def __count_fallback(cls) -> None:
+        """
+        Метод учитывает операцию, вернувшую значение по умолчанию, в вызове, выполняемом через track()
+        :return: None
+        """
+        fallbacks = cls.__fallbacks.get()
+
+        if fallbacks is not None:
+            fallbacks[0] += 1
+
+    @classmethod
+    def __allow(cls) -> bool:
+        """
+        Метод проверяет, можно ли выполнить операцию с Redis. По истечении CACHE_BREAKER_COOLDOWN
+        разрешается одна пробная операция, остальные операции до ее завершения выполняются без Redis
+        :return: True - операцию можно выполнить, иначе False
+        """
+        if cls.__state == cls.CLOSED:
+            return True
+
+        if cls.__state == cls.OPEN and time.monotonic() - cls.__opened_at >= CACHE_BREAKER_COOLDOWN:
+            cls.__state = cls.HALF_OPEN
+            return True
+
+        return False
+
+    @classmethod
+    def __success(cls) -> None:
+        """
+        Метод учитывает успешную операцию: сбрасывает счетчик ошибок, после пробной операции
+        замыкает выключатель и запускает функции восстановления
+        :return: None
+        """
+        cls.__failures = 0
+
+        if cls.__state != cls.HALF_OPEN:
+            return
+
+        cls.__state = cls.CLOSED
+        logger.info('Redis восстановлен, кэш снова используется')
+
+        for callback in cls.__recovery_callbacks:
+            task = asyncio.create_task(callback())
+            cls.__recovery_tasks.add(task)
+            task.add_done_callback(cls.__recovery_tasks.discard)
+
+    @classmethod
+    async def __failure(cls, exc: Exception) -> None:
+        """
+        Метод учитывает ошибку операции и размыкает выключатель после CACHE_BREAKER_FAILURES ошибок подряд
+        (либо при ошибке пробной операции)
+        :param exc: ошибка
+        :return: None
+        """
+        if isinstance(exc, asyncio.TimeoutError):
+            # Ответ на прерванную по таймауту команду мог остаться в соединении, возвращенном в пул, -
+            # свободные соединения закрываются (используемые, в т.ч. подписка на инвалидацию, не затрагиваются)
+            try:
+                await redis_client.connection_pool.disconnect(inuse_connections=False)
+
+            except (RedisError, OSError):
+                pass
+
+        cls.__failures += 1
+        logger.warning(f'Ошибка Redis ({cls.__failures} подряд): {exc!r}')
+
+        if cls.__state == cls.HALF_OPEN or cls.__failures >= CACHE_BREAKER_FAILURES:
+            if cls.__state != cls.OPEN:
+                cls.__opened += 1
+                logger.error(f'Redis недоступен, кэш не используется {CACHE_BREAKER_COOLDOWN} с')
+
+            cls.__state = cls.OPEN
+            cls.__opened_at = time.monotonic()
@@ -0,0 +1,210 @@
+import time
+import zlib
+from typing import Callable
+
+from loguru import logger
+
+from src.config import (
+    CACHE_CODEC_ALL_DATA,
+    CACHE_CODEC_ITEM,
+    CACHE_CODEC_LIST,
+    CACHE_COMPRESSION_MIN_SIZE,
+)
+from src.repositories.cache.key_class import CacheKeyClass
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+
+def _zlib() -> tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    """
+    Сжатие zlib (стандартная библиотека, уровень 1 - быстрое сжатие)
+    :return: функции сжатия и распаковки
+    """
+    return lambda data: zlib.compress(data, 1), zlib.decompress
+
+
+def _zstd() -> tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    """
+    Сжатие zstd (пакет zstandard)
+    :return: функции сжатия и распаковки
+    """
+    return zstandard.ZstdCompressor().compress, zstandard.ZstdDecompressor().decompress
+
+
+def _lz4() -> tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    """
+    Сжатие lz4 (пакет lz4)
+    :return: функции сжатия и распаковки
+    """
+    return lz4_frame.compress, lz4_frame.decompress
+
+
+class CacheCodec:
+    """
+    Кодирование значений кэша перед записью в Redis: json-документы больше CACHE_COMPRESSION_MIN_SIZE
+    сжимаются алгоритмом, настроенным для класса ключа. Собирается статистика размеров и времени кодирования
+    """
+
+    # Сжатое значение начинается с нулевого байта (json-документ с него начинаться не может) и номера алгоритма
+    __MARKER = b'\x00'
+
+    # Алгоритмы сжатия: имя -> (номер алгоритма, модуль-зависимость либо None, фабрика функций)
+    __ALGORITHMS = {
+        'zlib': (1, zlib, _zlib),
+        'zstd': (2, zstandard, _zstd),
+        'lz4': (3, lz4_frame, _lz4),
+    }
+
+    # Функции распаковки по номеру алгоритма
+    __decompressors: dict[int, Callable[[bytes], bytes]] = {}
+
+    # Алгоритм сжатия по классу ключа: (номер алгоритма, функция сжатия) либо None - без сжатия
+    __compressors: dict[str, tuple[int, Callable[[bytes], bytes]] | None] = {}
+
+    # Статистика по классу ключа
+    __stats: dict[str, dict[str, float]] = {}
+
+    @classmethod
+    def configure(cls, codecs: dict[str, str]) -> None:
+        """
+        Метод настраивает алгоритмы сжатия для классов ключей.
+        Алгоритм, для которого не установлен пакет, отключается с предупреждением в логе
+        :param codecs: словарь с классом ключа и именем алгоритма ('none' - без сжатия)
+        :return: None
+        """
+        # Распаковываются значения любого доступного алгоритма (в т.ч. записанные до смены настроек)
+        cls.__decompressors = {
+            number: factory()[1] for number, dependency, factory in cls.__ALGORITHMS.values() if dependency
+        }
+        cls.__compressors = {}
+
+        for key_class, name in codecs.items():
+            cls.__compressors[key_class] = None
+
+            if name == 'none':
+                continue
+
+            if name not in cls.__ALGORITHMS:
+                logger.warning(f'Неизвестный алгоритм сжатия кэша {name} для {key_class}, сжатие отключено')
+                continue
+
+            number, dependency, factory = cls.__ALGORITHMS[name]
+
+            if dependency is None:
+                logger.warning(f'Пакет для сжатия кэша {name} не установлен, сжатие {key_class} отключено')
+                continue
+
+            cls.__compressors[key_class] = (number, factory()[0])
+
+    @classmethod
+    def encode(cls, data: bytes, key_class: str) -> bytes:
+        """
+        Метод кодирует json-документ для записи в Redis
+        :param data: json-документ
+        :param key_class: класс ключа
+        :return: значение для записи в Redis
+        """
+        compressor = cls.__compressors.get(key_class)
+
+        if compressor is None or len(data) < CACHE_COMPRESSION_MIN_SIZE:
+            cls.__record(key_class, encoded=len(data), raw=len(data))
+            return data
+
+        start = time.perf_counter()
+        number, compress = compressor
+        encoded = cls.__MARKER + bytes([number]) + compress(data)
+        cls.__record(key_class, encoded=len(encoded), raw=len(data), encode_time=time.perf_counter() - start)
+
+        return encoded
+
+    @classmethod
+    def decode(cls, value: bytes | None, key_class: str) -> bytes | None:
+        """
+        Метод декодирует значение, прочитанное из Redis
+        :param value: значение из Redis
+        :param key_class: класс ключа
+        :return: json-документ либо None, если значения нет
+        """
+        if not value or value[:1] != cls.__MARKER:
+            return value
+
+        decompress = cls.__decompressors.get(value[1])
+
+        if decompress is None:
+            # Значение сжато алгоритмом, пакет которого не установлен в этом процессе - считаем промахом кэша
+            logger.warning(f'Нет алгоритма для распаковки значения кэша {key_class}: {value[1]}')
+            return None
+
+        start = time.perf_counter()
+        data = decompress(value[2:])
+        cls.__record(key_class, decode_time=time.perf_counter() - start)
+
+        return data
+
+    @classmethod
+    def stats(cls) -> dict[str, dict[str, float]]:
+        """
+        Метод возвращает накопленную статистику кодирования по классам ключей
+        :return: словарь с классом ключа и статистикой
+        """
+        return {
+            key_class: {
+                'encoded': int(stats['encoded']),
+                'decoded': int(stats['decoded']),
+                'raw_bytes': int(stats['raw_bytes']),
+                'encoded_bytes': int(stats['encoded_bytes']),
+                'encode_time_total': round(stats['encode_time_total'], 6),
+                'decode_time_total': round(stats['decode_time_total'], 6),
+            }
+            for key_class, stats in cls.__stats.items()
+        }
+
+    @classmethod
+    def __record(
+            cls,
+            key_class: str,
+            encoded: int | None = None,
+            raw: int = 0,
+            encode_time: float = 0.0,
+            decode_time: float = 0.0
+    ) -> None:
+        """
+        Метод учитывает в статистике одну операцию кодирования либо декодирования
+        :param key_class: класс ключа
+        :param encoded: размер закодированного значения в байтах (None - операция декодирования)
+        :param raw: размер json-документа в байтах
+        :param encode_time: время кодирования в секундах
+        :param decode_time: время декодирования в секундах
+        :return: None
+        """
+        stats = cls.__stats.setdefault(
+            key_class,
+            dict.fromkeys(
+                ('encoded', 'decoded', 'raw_bytes', 'encoded_bytes', 'encode_time_total', 'decode_time_total'), 0
+            ),
+        )
+
+        if encoded is None:
+            stats['decoded'] += 1
+            stats['decode_time_total'] += decode_time
+            return
+
+        stats['encoded'] += 1
+        stats['raw_bytes'] += raw
+        stats['encoded_bytes'] += encoded
+        stats['encode_time_total'] += encode_time
+
+
+CacheCodec.configure({
+    CacheKeyClass.ALL_DATA: CACHE_CODEC_ALL_DATA,
+    CacheKeyClass.LIST: CACHE_CODEC_LIST,
+    CacheKeyClass.ITEM: CACHE_CODEC_ITEM,
+})
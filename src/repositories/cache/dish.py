@@ -1,80 +1,243 @@
-from fastapi_redis import redis_client
+import json
+
 from loguru import logger
 
-from src.models.dish import Dish
+from src.repositories.cache.menu import MenuGenerationCacheRepository
+from src.repositories.cache.metrics import CacheMetrics
+from src.repositories.cache.storage import CacheStorage
 
 
 class DishesListCacheRepository:
     """
     Проверка и добавление записей о списке блюд в кэш
+    (ключ содержит поколение кэша меню)
     """
-    __dishes_list = 'submenu_{submenu_id}_dishes_list'
+    __dishes_list = '{prefix}submenu_{submenu_id}_dishes_list'
 
     @classmethod
-    async def get_list(cls, submenu_id: str) -> list | None:
+    async def key(cls, menu_id: str, submenu_id: str, prefix: str | None = None) -> str:
         """
-        Метод проверяет в кэше записи о списке блюд
+        Метод возвращает ключ кэша списка блюд для текущего поколения кэша меню
+        :param menu_id: id меню, к которому относится подменю
         :param submenu_id: id подменю
-        :return: словарь с данными, если есть кэш, иначе None
+        :param prefix: префикс ключей поколения кэша меню (None - префикс текущего поколения)
+        :return: ключ
         """
-        return await redis_client.get(cls.__dishes_list.format(submenu_id=submenu_id))
+        prefix = prefix or await MenuGenerationCacheRepository.prefix(menu_id=menu_id)
+
+        return cls.__dishes_list.format(prefix=prefix, submenu_id=submenu_id)
 
     @classmethod
-    async def set_list(cls, submenu_id: str, dishes_list: list[Dish]) -> None:
+    @CacheMetrics.observe
+    async def get_list(
+            cls,
+            menu_id: str,
+            submenu_id: str,
+            limit: int | None = None,
+            after: str | None = None
+    ) -> tuple[bytes, str | None] | None:
         """
-        Метод записывает в кэш данные о списке блюд
+        Метод проверяет в кэше записи о списке блюд (каждая страница списка кэшируется отдельно)
+        :param menu_id: id меню, к которому относится подменю
         :param submenu_id: id подменю
-        :param submenus_list: список с блюдами
-        :return: None
+        :param limit: кол-во блюд на странице (None - полный список)
+        :param after: id блюда, после которого начинается страница
+        :return: json-документ со списком блюд и id для следующей страницы, если есть кэш, иначе None
         """
-        await redis_client.set(
-            cls.__dishes_list.format(submenu_id=submenu_id),
-            [dish.as_dict() for dish in dishes_list]
+        return await CacheStorage.get_page(
+            await cls.key(menu_id=menu_id, submenu_id=submenu_id), CacheStorage.page_field(limit=limit, after=after)
+        )
+
+    @classmethod
+    @CacheMetrics.observe
+    async def get_list_etag(
+            cls,
+            menu_id: str,
+            submenu_id: str,
+            limit: int | None = None,
+            after: str | None = None
+    ) -> str | None:
+        """
+        Метод проверяет в кэше ETag страницы списка блюд
+        :param menu_id: id меню, к которому относится подменю
+        :param submenu_id: id подменю
+        :param limit: кол-во блюд на странице (None - полный список)
+        :param after: id блюда, после которого начинается страница
+        :return: ETag, если есть кэш, иначе None
+        """
+        return await CacheStorage.get_etag(
+            await cls.key(menu_id=menu_id, submenu_id=submenu_id), CacheStorage.page_field(limit=limit, after=after)
         )
-        logger.info('Список блюд кэширован')
 
     @classmethod
-    async def delete_list(cls, submenu_id: str) -> None:
+    @CacheMetrics.observe
+    async def set_list(
+            cls,
+            menu_id: str,
+            submenu_id: str,
+            dishes_list: bytes,
+            next_after: str | None = None,
+            limit: int | None = None,
+            after: str | None = None
+    ) -> None:
         """
-        Метод очищает кэш со списком блюд
-        :param submenu_id: id подменю, к которому относятся блюда
+        Метод записывает в кэш данные о списке блюд
+        :param menu_id: id меню, к которому относится подменю
+        :param submenu_id: id подменю
+        :param dishes_list: json-документ со списком блюд
+        :param next_after: id последнего блюда, если есть следующая страница, иначе None
+        :param limit: кол-во блюд на странице (None - полный список)
+        :param after: id блюда, после которого начинается страница
         :return: None
         """
-        await redis_client.delete(cls.__dishes_list.format(submenu_id=submenu_id))
-        logger.info('Кэш списка блюд очищен')
+        await CacheStorage.set_page(
+            await cls.key(menu_id=menu_id, submenu_id=submenu_id),
+            CacheStorage.page_field(limit=limit, after=after),
+            dishes_list,
+            next_after,
+        )
+        logger.info('Список блюд кэширован')
 
 
 class DishCacheRepository:
     """
     Проверка и добавление записей о блюде в кэш
+    (ключ содержит поколение кэша меню и id подменю блюда)
     """
-    __dish_id = 'dish_{dish_id}'
+    __dish_id = '{prefix}submenu_{submenu_id}_dish_{dish_id}'
+    __location = 'dish_{dish_id}_location'
+
+    @classmethod
+    async def key(cls, menu_id: str, submenu_id: str, dish_id: str, prefix: str | None = None) -> str:
+        """
+        Метод возвращает ключ кэша блюда для текущего поколения кэша меню
+        :param menu_id: id меню, к которому относится блюдо
+        :param submenu_id: id подменю, к которому относится блюдо
+        :param dish_id: id блюда
+        :param prefix: префикс ключей поколения кэша меню (None - префикс текущего поколения)
+        :return: ключ
+        """
+        prefix = prefix or await MenuGenerationCacheRepository.prefix(menu_id=menu_id)
+
+        return cls.__dish_id.format(prefix=prefix, submenu_id=submenu_id, dish_id=dish_id)
 
     @classmethod
-    async def get(cls, dish_id: str) -> dict | None:
+    @CacheMetrics.observe
+    async def get(cls, menu_id: str, submenu_id: str, dish_id: str) -> bytes | None:
         """
         Метод проверяет в кэше запись о блюде
+        :param menu_id: id меню, к которому относится блюдо
+        :param submenu_id: id подменю, к которому относится блюдо
         :param dish_id: id блюда
-        :return: словарь с данными, если есть кэш, иначе None
+        :return: json-документ с данными либо маркер CacheStorage.NOT_FOUND, если есть кэш, иначе None
         """
-        return await redis_client.get(cls.__dish_id.format(dish_id=dish_id))
+        return await CacheStorage.get(await cls.key(menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id))
 
     @classmethod
-    async def set(cls, dish: Dish) -> None:
+    @CacheMetrics.observe
+    async def get_etag(cls, menu_id: str, submenu_id: str, dish_id: str) -> str | None:
+        """
+        Метод проверяет в кэше ETag записи о блюде
+        :param menu_id: id меню, к которому относится блюдо
+        :param submenu_id: id подменю, к которому относится блюдо
+        :param dish_id: id блюда
+        :return: ETag, если есть кэш, иначе None
+        """
+        return await CacheStorage.get_etag(await cls.key(menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id))
+
+    @classmethod
+    @CacheMetrics.observe
+    async def set(cls, menu_id: str, submenu_id: str, dish_id: str, dish: bytes) -> None:
         """
         Метод записывает в кэш данные о блюде
-        :param dish: объект блюда
+        :param menu_id: id меню, к которому относится блюдо
+        :param submenu_id: id подменю, к которому относится блюдо
+        :param dish_id: id блюда
+        :param dish: json-документ с данными блюда
         :return: None
         """
-        await redis_client.set(cls.__dish_id.format(dish_id=dish.id), dish.as_dict())
+        key = await cls.key(menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id)
+        await CacheStorage.set(key, dish)
         logger.info('Данные о блюде кэшированы')
 
     @classmethod
-    async def delete(cls, dish_id: str) -> None:
+    @CacheMetrics.observe
+    async def set_not_found(cls, menu_id: str, submenu_id: str, dish_id: str) -> None:
         """
-        Метод очищает кэш с данными о блюде
+        Метод записывает в кэш маркер блюда, отсутствующего в БД в переданных меню и подменю
+        :param menu_id: id меню, к которому относится блюдо
+        :param submenu_id: id подменю, к которому относится блюдо
         :param dish_id: id блюда
         :return: None
         """
-        await redis_client.delete(cls.__dish_id.format(dish_id=dish_id))
-        logger.info('Кэш блюда очищен')
+        await CacheStorage.set_not_found(await cls.key(menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id))
+
+    @classmethod
+    def location_key(cls, dish_id: str) -> str:
+        """
+        Метод возвращает ключ кэша с расположением блюда - id меню и подменю, входящими в ключ записи о блюде
+        (расположение блюда не меняется, поэтому ключ не содержит поколение кэша меню)
+        :param dish_id: id блюда
+        :return: ключ
+        """
+        return cls.__location.format(dish_id=dish_id)
+
+    @classmethod
+    async def get_locations(cls, dishes_ids: list[str]) -> dict[str, tuple[str, str]]:
+        """
+        Метод проверяет в кэше расположение нескольких блюд одной командой MGET
+        :param dishes_ids: список id блюд
+        :return: словарь с id блюда и парой id меню и id подменю (только для блюд, расположение которых есть в кэше)
+        """
+        locations = await CacheStorage.get_many([cls.location_key(dish_id=dish_id) for dish_id in dishes_ids])
+
+        return {
+            dish_id: tuple(json.loads(location))
+            for dish_id, location in zip(dishes_ids, locations)
+            if location
+        }
+
+    @classmethod
+    @CacheMetrics.observe
+    async def get_many(cls, locations: dict[str, tuple[str, str]]) -> list[bytes | None]:
+        """
+        Метод проверяет в кэше записи о нескольких блюдах любых меню и подменю (поколения кэша меню
+        и записи читаются командами MGET)
+        :param locations: словарь с id блюда и парой id меню и id подменю
+        :return: список json-документов с данными в порядке словаря (None, если кэша нет)
+        """
+        if not locations:
+            return []
+
+        prefixes = await MenuGenerationCacheRepository.prefixes(
+            list(dict.fromkeys(menu_id for menu_id, _ in locations.values()))
+        )
+
+        return await CacheStorage.get_many([
+            cls.__dish_id.format(prefix=prefixes[menu_id], submenu_id=submenu_id, dish_id=dish_id)
+            for dish_id, (menu_id, submenu_id) in locations.items()
+        ])
+
+    @classmethod
+    @CacheMetrics.observe
+    async def set_many(cls, dishes: dict[str, bytes], locations: dict[str, tuple[str, str]]) -> None:
+        """
+        Метод записывает в кэш данные о нескольких блюдах вместе с их расположением одним пайплайном
+        :param dishes: словарь с id блюд и json-документами с их данными
+        :param locations: словарь с id блюда и парой id меню и id подменю
+        :return: None
+        """
+        if not dishes:
+            return
+
+        prefixes = await MenuGenerationCacheRepository.prefixes(
+            list(dict.fromkeys(locations[dish_id][0] for dish_id in dishes))
+        )
+        items = {}
+
+        for dish_id, dish in dishes.items():
+            menu_id, submenu_id = locations[dish_id]
+            items[cls.__dish_id.format(prefix=prefixes[menu_id], submenu_id=submenu_id, dish_id=dish_id)] = dish
+            items[cls.location_key(dish_id=dish_id)] = json.dumps([menu_id, submenu_id]).encode()
+
+        await CacheStorage.set_many(items)
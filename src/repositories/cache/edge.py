@@ -0,0 +1,244 @@
+import asyncio
+import urllib.request
+
+from loguru import logger
+
+from src.config import (
+    EDGE_MAX_AGE_ALL_DATA,
+    EDGE_MAX_AGE_DISH,
+    EDGE_MAX_AGE_DISHES,
+    EDGE_MAX_AGE_MENU,
+    EDGE_MAX_AGE_MENUS,
+    EDGE_MAX_AGE_SUBMENU,
+    EDGE_MAX_AGE_SUBMENUS,
+    EDGE_PURGER,
+    EDGE_PURGE_TIMEOUT,
+    EDGE_PURGE_TOKEN,
+    EDGE_PURGE_URL,
+    EDGE_STALE_WHILE_REVALIDATE_ALL_DATA,
+    EDGE_STALE_WHILE_REVALIDATE_DISH,
+    EDGE_STALE_WHILE_REVALIDATE_DISHES,
+    EDGE_STALE_WHILE_REVALIDATE_MENU,
+    EDGE_STALE_WHILE_REVALIDATE_MENUS,
+    EDGE_STALE_WHILE_REVALIDATE_SUBMENU,
+    EDGE_STALE_WHILE_REVALIDATE_SUBMENUS,
+)
+
+
+class EdgeRoute:
+    """
+    Роуты, для которых настраиваются заголовки кэширования ответа на CDN
+    """
+
+    ALL_DATA = 'all_data'
+    MENUS = 'menus'
+    MENU = 'menu'
+    SUBMENUS = 'submenus'
+    SUBMENU = 'submenu'
+    DISHES = 'dishes'
+    DISH = 'dish'
+
+
+class LocalEdgePurger:
+    """
+    Очистка кэша CDN в памяти процесса: суррогатные ключи только накапливаются (замена CDN в тестах)
+    """
+
+    purged: list[str] = []
+
+    @classmethod
+    async def purge(cls, keys: list[str]) -> None:
+        """
+        Метод запоминает очищаемые суррогатные ключи
+        :param keys: суррогатные ключи
+        :return: None
+        """
+        cls.purged.extend(keys)
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Метод сбрасывает накопленные ключи
+        :return: None
+        """
+        cls.purged = []
+
+
+class HttpEdgePurger:
+    """
+    Очистка кэша CDN / обратного прокси запросом PURGE на EDGE_PURGE_URL с суррогатными ключами
+    в заголовке Surrogate-Key (и токеном в заголовке Authorization, если задан EDGE_PURGE_TOKEN)
+    """
+
+    @classmethod
+    async def purge(cls, keys: list[str]) -> None:
+        """
+        Метод отправляет запрос на очистку кэша CDN (в отдельном потоке, чтобы не блокировать event loop)
+        :param keys: суррогатные ключи
+        :return: None
+        """
+        headers = {EdgeCache.SURROGATE_KEY_HEADER: ' '.join(keys)}
+
+        if EDGE_PURGE_TOKEN:
+            headers['Authorization'] = f'Bearer {EDGE_PURGE_TOKEN}'
+
+        request = urllib.request.Request(EDGE_PURGE_URL, method='PURGE', headers=headers)
+
+        await asyncio.to_thread(cls.__send, request)
+
+    @classmethod
+    def __send(cls, request: urllib.request.Request) -> None:
+        """
+        Метод выполняет запрос на очистку кэша CDN
+        :param request: запрос
+        :return: None
+        """
+        with urllib.request.urlopen(request, timeout=EDGE_PURGE_TIMEOUT):
+            pass
+
+
+class EdgeCache:
+    """
+    Кэширование ответов на CDN / обратном прокси: заголовки Cache-Control и Surrogate-Key для ответов
+    и очистка кэша CDN по суррогатным ключам при тех же событиях, при которых очищается кэш Redis.
+    Суррогатные ключи записей подменю и блюд дополнительно содержат ключ поддерева меню, который очищается
+    вместе со сменой поколения кэша меню
+    """
+
+    CACHE_CONTROL_HEADER = 'Cache-Control'
+    SURROGATE_KEY_HEADER = 'Surrogate-Key'
+
+    # Суррогатные ключи со всеми данными и списком меню
+    ALL_DATA = 'all_data'
+    MENUS = 'menus'
+
+    # Время хранения ответа на CDN и stale-while-revalidate по роутам (браузер всегда перепроверяет ответ по ETag,
+    # CDN хранит его до истечения s-maxage либо до очистки по суррогатному ключу)
+    __POLICIES = {
+        EdgeRoute.ALL_DATA: (EDGE_MAX_AGE_ALL_DATA, EDGE_STALE_WHILE_REVALIDATE_ALL_DATA),
+        EdgeRoute.MENUS: (EDGE_MAX_AGE_MENUS, EDGE_STALE_WHILE_REVALIDATE_MENUS),
+        EdgeRoute.MENU: (EDGE_MAX_AGE_MENU, EDGE_STALE_WHILE_REVALIDATE_MENU),
+        EdgeRoute.SUBMENUS: (EDGE_MAX_AGE_SUBMENUS, EDGE_STALE_WHILE_REVALIDATE_SUBMENUS),
+        EdgeRoute.SUBMENU: (EDGE_MAX_AGE_SUBMENU, EDGE_STALE_WHILE_REVALIDATE_SUBMENU),
+        EdgeRoute.DISHES: (EDGE_MAX_AGE_DISHES, EDGE_STALE_WHILE_REVALIDATE_DISHES),
+        EdgeRoute.DISH: (EDGE_MAX_AGE_DISH, EDGE_STALE_WHILE_REVALIDATE_DISH),
+    }
+
+    # Способы очистки кэша CDN по имени из настроек (none - кэш CDN не очищается)
+    __PURGERS = {
+        'local': LocalEdgePurger,
+        'http': HttpEdgePurger,
+    }
+    __purger: type | None = None
+
+    @classmethod
+    def configure(cls, purger: str) -> None:
+        """
+        Метод настраивает способ очистки кэша CDN. Неизвестный способ отключается с предупреждением в логе
+        :param purger: имя способа очистки
+        :return: None
+        """
+        cls.__purger = cls.__PURGERS.get(purger)
+
+        if cls.__purger is None and purger != 'none':
+            logger.warning(f'Неизвестный способ очистки кэша CDN {purger}, очистка отключена')
+
+    @classmethod
+    def menu(cls, menu_id: str) -> str:
+        """
+        Метод возвращает суррогатный ключ меню
+        :param menu_id: id меню
+        :return: суррогатный ключ
+        """
+        return f'menu_{menu_id}'
+
+    @classmethod
+    def menu_tree(cls, menu_id: str) -> str:
+        """
+        Метод возвращает суррогатный ключ поддерева меню (списков и записей подменю и блюд меню)
+        :param menu_id: id меню
+        :return: суррогатный ключ
+        """
+        return f'menu_{menu_id}_tree'
+
+    @classmethod
+    def submenus(cls, menu_id: str) -> str:
+        """
+        Метод возвращает суррогатный ключ списка подменю
+        :param menu_id: id меню
+        :return: суррогатный ключ
+        """
+        return f'menu_{menu_id}_submenus'
+
+    @classmethod
+    def submenu(cls, submenu_id: str) -> str:
+        """
+        Метод возвращает суррогатный ключ подменю
+        :param submenu_id: id подменю
+        :return: суррогатный ключ
+        """
+        return f'submenu_{submenu_id}'
+
+    @classmethod
+    def dishes(cls, submenu_id: str) -> str:
+        """
+        Метод возвращает суррогатный ключ списка блюд
+        :param submenu_id: id подменю
+        :return: суррогатный ключ
+        """
+        return f'submenu_{submenu_id}_dishes'
+
+    @classmethod
+    def dish(cls, dish_id: str) -> str:
+        """
+        Метод возвращает суррогатный ключ блюда
+        :param dish_id: id блюда
+        :return: суррогатный ключ
+        """
+        return f'dish_{dish_id}'
+
+    @classmethod
+    def headers(cls, route: str, *keys: str) -> dict[str, str]:
+        """
+        Метод возвращает заголовки кэширования ответа на CDN
+        :param route: роут ответа (см. EdgeRoute)
+        :param keys: суррогатные ключи ответа
+        :return: словарь с заголовками
+        """
+        max_age, stale_while_revalidate = cls.__POLICIES.get(route, (0, 0))
+
+        if not max_age:
+            cache_control = 'no-cache'
+
+        else:
+            cache_control = f'public, max-age=0, s-maxage={max_age}'
+
+            if stale_while_revalidate:
+                cache_control += f', stale-while-revalidate={stale_while_revalidate}'
+
+        return {cls.CACHE_CONTROL_HEADER: cache_control, cls.SURROGATE_KEY_HEADER: ' '.join(keys)}
+
+    @classmethod
+    async def purge(cls, *keys: str) -> None:
+        """
+        Метод очищает кэш CDN по суррогатным ключам (ошибка очистки только логируется: ответы на CDN
+        устареют не позже s-maxage)
+        :param keys: суррогатные ключи
+        :return: None
+        """
+        if cls.__purger is None or not keys:
+            return
+
+        keys = list(dict.fromkeys(keys))
+
+        try:
+            await cls.__purger.purge(keys)
+
+        except Exception as exc:
+            logger.error(f'Ошибка очистки кэша CDN {keys}: {exc!r}')
+
+        else:
+            logger.debug(f'Кэш CDN очищен: {keys}')
+
+
+EdgeCache.configure(EDGE_PURGER)
@@ -0,0 +1,18 @@
+class CacheKeyClass:
+    """
+    Классы ключей кэша: для каждого класса задаются кодирование и время жизни записей, ведется статистика
+    """
+
+    # Записи с данными
+    ALL_DATA = 'all_data'
+    LIST = 'list'
+    ITEM = 'item'
+
+    # Служебные записи
+    GENERATION = 'generation'
+    STALE = 'stale'
+    LOCK = 'lock'
+    ETAG = 'etag'
+
+    DATA = (ALL_DATA, LIST, ITEM)
+    ALL = (*DATA, GENERATION, STALE, LOCK, ETAG)
@@ -0,0 +1,159 @@
+import time
+from collections import OrderedDict
+from typing import Any
+
+from src.config import L1_CACHE_ENABLED, L1_CACHE_MAX_BYTES, L1_CACHE_TTL
+
+
+class LocalCache:
+    """
+    Процессный (L1) LRU-кэш с TTL и ограничением по памяти перед кэшем Redis.
+    Записи хранятся уже десериализованными, поэтому возвращаемые значения нельзя изменять
+    """
+
+    # Записи: (ключ, поле хэша либо None) -> (время устаревания, размер в байтах, значение)
+    __entries: OrderedDict[tuple[str, str | None], tuple[float, int, Any]] = OrderedDict()
+    # Поля хэшей по ключу (для очистки всех страниц списка вместе с ключом)
+    __fields: dict[str, set[str | None]] = {}
+    __size: int = 0
+
+    # Номер последней очистки и номера последних очисток по ключам: значение, прочитанное из Redis до очистки
+    # ключа, не записывается в L1-кэш (иначе запись, очищенная во время чтения, отдавалась бы до L1_CACHE_TTL).
+    # Хранятся номера последних INVALIDATED_KEYS очищенных ключей, для более старых известен только
+    # наибольший забытый номер
+    INVALIDATED_KEYS = 10000
+    __invalidations: int = 0
+    __invalidated: OrderedDict[str, int] = OrderedDict()
+    __forgotten: int = 0
+
+    # Кэш включается только в процессе, получающем сообщения об инвалидации из Redis
+    active: bool = False
+
+    @classmethod
+    def enabled(cls) -> bool:
+        """
+        Метод проверяет, используется ли L1-кэш в текущем процессе
+        :return: True - кэш используется, иначе False
+        """
+        return L1_CACHE_ENABLED and cls.active
+
+    @classmethod
+    def get(cls, key: str, field: str | None = None) -> Any | None:
+        """
+        Метод возвращает запись из L1-кэша
+        :param key: ключ записи
+        :param field: поле хэша (для страниц списков)
+        :return: значение, если запись есть и не устарела, иначе None
+        """
+        if not cls.enabled():
+            return None
+
+        entry = cls.__entries.get((key, field))
+
+        if entry is None:
+            return None
+
+        expires, _, value = entry
+
+        if expires < time.monotonic():
+            cls.__pop((key, field))
+            return None
+
+        cls.__entries.move_to_end((key, field))
+
+        return value
+
+    @classmethod
+    def version(cls) -> int:
+        """
+        Метод возвращает номер последней очистки (запоминается перед чтением значения из Redis)
+        :return: номер очистки
+        """
+        return cls.__invalidations
+
+    @classmethod
+    def set(cls, key: str, value: Any, size: int, field: str | None = None, version: int | None = None) -> None:
+        """
+        Метод записывает значение в L1-кэш, вытесняя давно не использованные записи при превышении лимита памяти
+        :param key: ключ записи
+        :param value: значение
+        :param size: размер сериализованного значения в байтах
+        :param field: поле хэша (для страниц списков)
+        :param version: номер очистки на момент чтения значения из Redis (значение не записывается,
+            если ключ очищен после чтения; None - без проверки)
+        :return: None
+        """
+        if not cls.enabled() or size > L1_CACHE_MAX_BYTES:
+            return
+
+        if version is not None and cls.__invalidated_since(key, version):
+            return
+
+        cls.__pop((key, field))
+        cls.__entries[(key, field)] = (time.monotonic() + L1_CACHE_TTL, size, value)
+        cls.__fields.setdefault(key, set()).add(field)
+        cls.__size += size
+
+        while cls.__size > L1_CACHE_MAX_BYTES:
+            cls.__pop(next(iter(cls.__entries)))
+
+    @classmethod
+    def delete(cls, *keys: str) -> None:
+        """
+        Метод удаляет из L1-кэша записи по ключам (вместе со всеми полями хэшей)
+        :param keys: ключи записей
+        :return: None
+        """
+        for key in keys:
+            cls.__invalidations += 1
+            cls.__invalidated[key] = cls.__invalidations
+            cls.__invalidated.move_to_end(key)
+
+            for field in cls.__fields.get(key, set()).copy():
+                cls.__pop((key, field))
+
+        while len(cls.__invalidated) > cls.INVALIDATED_KEYS:
+            _, cls.__forgotten = cls.__invalidated.popitem(last=False)
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Метод полностью очищает L1-кэш
+        :return: None
+        """
+        cls.__entries.clear()
+        cls.__fields.clear()
+        cls.__size = 0
+        cls.__invalidations += 1
+        cls.__invalidated.clear()
+        cls.__forgotten = cls.__invalidations
+
+    @classmethod
+    def __invalidated_since(cls, key: str, version: int) -> bool:
+        """
+        Метод проверяет, был ли ключ очищен после очистки с переданным номером
+        :param key: ключ записи
+        :param version: номер очистки
+        :return: True - ключ мог быть очищен, иначе False
+        """
+        return cls.__forgotten > version or cls.__invalidated.get(key, 0) > version
+
+    @classmethod
+    def __pop(cls, entry_key: tuple[str, str | None]) -> None:
+        """
+        Метод удаляет запись и обновляет занятый объем памяти
+        :param entry_key: ключ записи и поле хэша
+        :return: None
+        """
+        entry = cls.__entries.pop(entry_key, None)
+
+        if entry is None:
+            return
+
+        key, field = entry_key
+        cls.__size -= entry[1]
+        fields = cls.__fields[key]
+        fields.discard(field)
+
+        if not fields:
+            del cls.__fields[key]
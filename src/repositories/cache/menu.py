@@ -1,7 +1,7 @@
-from fastapi_redis import redis_client
 from loguru import logger
 
-from src.models.menu import Menu
+from src.repositories.cache.metrics import CacheMetrics
+from src.repositories.cache.storage import CacheStorage
 
 
 class MenusListCacheRepository:
@@ -11,21 +11,70 @@ class MenusListCacheRepository:
     __menus_list = 'menus_list'
 
     @classmethod
-    async def get_list(cls) -> list | None:
+    def key(cls) -> str:
         """
-        Метод проверяет в кэше записи о списке меню
-        :return: словарь с данными, если есть кэш, иначе None
+        Метод возвращает ключ кэша списка меню
+        :return: ключ
         """
-        return await redis_client.get(cls.__menus_list)
+        return cls.__menus_list
 
     @classmethod
-    async def set_list(cls, menus_list: list[Menu]) -> None:
+    @CacheMetrics.observe
+    async def get_list(cls, limit: int | None = None, after: str | None = None) -> tuple[bytes, str | None] | None:
+        """
+        Метод проверяет в кэше записи о списке меню (каждая страница списка кэшируется отдельно)
+        :param limit: кол-во меню на странице (None - полный список)
+        :param after: id меню, после которого начинается страница
+        :return: json-документ со списком меню и id для следующей страницы, если есть кэш, иначе None
+        """
+        return await CacheStorage.get_page(cls.__menus_list, CacheStorage.page_field(limit=limit, after=after))
+
+    @classmethod
+    @CacheMetrics.observe
+    async def get_list_etag(cls, limit: int | None = None, after: str | None = None) -> str | None:
+        """
+        Метод проверяет в кэше ETag страницы списка меню
+        :param limit: кол-во меню на странице (None - полный список)
+        :param after: id меню, после которого начинается страница
+        :return: ETag, если есть кэш, иначе None
+        """
+        return await CacheStorage.get_etag(cls.__menus_list, CacheStorage.page_field(limit=limit, after=after))
+
+    @classmethod
+    @CacheMetrics.observe
+    async def get_stale_list(
+            cls,
+            limit: int | None = None,
+            after: str | None = None
+    ) -> tuple[bytes, str | None] | None:
+        """
+        Метод проверяет в кэше устаревшие записи о списке меню, сохраненные при очистке кэша
+        :param limit: кол-во меню на странице (None - полный список)
+        :param after: id меню, после которого начинается страница
+        :return: json-документ со списком меню и id для следующей страницы, если есть устаревший кэш, иначе None
+        """
+        return await CacheStorage.get_stale_page(cls.__menus_list, CacheStorage.page_field(limit=limit, after=after))
+
+    @classmethod
+    @CacheMetrics.observe
+    async def set_list(
+            cls,
+            menus_list: bytes,
+            next_after: str | None = None,
+            limit: int | None = None,
+            after: str | None = None
+    ) -> None:
         """
         Метод записывает в кэш данные о списке меню
-        :param menus_list: список с меню
+        :param menus_list: json-документ со списком меню
+        :param next_after: id последнего меню, если есть следующая страница, иначе None
+        :param limit: кол-во меню на странице (None - полный список)
+        :param after: id меню, после которого начинается страница
         :return: None
         """
-        await redis_client.set(cls.__menus_list, [menu.as_dict() for menu in menus_list])
+        await CacheStorage.set_page(
+            cls.__menus_list, CacheStorage.page_field(limit=limit, after=after), menus_list, next_after
+        )
         logger.info('Список меню кэширован')
 
     @classmethod
@@ -34,7 +83,7 @@ class MenusListCacheRepository:
         Метод очищает кэш со списком меню
         :return: None
         """
-        await redis_client.delete(cls.__menus_list)
+        await CacheStorage.delete(cls.__menus_list)
         logger.info('Кэш списка меню очищен')
 
 
@@ -45,24 +94,56 @@ class MenuCacheRepository:
     __menu_id = 'menu_{menu_id}'
 
     @classmethod
-    async def get(cls, menu_id: str) -> dict | None:
+    def key(cls, menu_id: str) -> str:
+        """
+        Метод возвращает ключ кэша меню
+        :param menu_id: id меню
+        :return: ключ
+        """
+        return cls.__menu_id.format(menu_id=menu_id)
+
+    @classmethod
+    @CacheMetrics.observe
+    async def get(cls, menu_id: str) -> bytes | None:
         """
         Метод проверяет в кэше запись о меню
         :param menu_id: id меню
-        :return: словарь с данными, если есть кэш, иначе None
+        :return: json-документ с данными либо маркер CacheStorage.NOT_FOUND, если есть кэш, иначе None
+        """
+        return await CacheStorage.get(cls.__menu_id.format(menu_id=menu_id))
+
+    @classmethod
+    @CacheMetrics.observe
+    async def get_etag(cls, menu_id: str) -> str | None:
+        """
+        Метод проверяет в кэше ETag записи о меню
+        :param menu_id: id меню
+        :return: ETag, если есть кэш, иначе None
         """
-        return await redis_client.get(cls.__menu_id.format(menu_id=menu_id))
+        return await CacheStorage.get_etag(cls.__menu_id.format(menu_id=menu_id))
 
     @classmethod
-    async def set(cls, menu: Menu) -> None:
+    @CacheMetrics.observe
+    async def set(cls, menu_id: str, menu: bytes) -> None:
         """
         Метод записывает в кэш данные о меню
-        :param menu: объект меню
+        :param menu_id: id меню
+        :param menu: json-документ с данными меню
         :return: None
         """
-        await redis_client.set(cls.__menu_id.format(menu_id=menu.id), menu.as_dict())
+        await CacheStorage.set(cls.__menu_id.format(menu_id=menu_id), menu)
         logger.info('Данные о меню кэшированы')
 
+    @classmethod
+    @CacheMetrics.observe
+    async def set_not_found(cls, menu_id: str) -> None:
+        """
+        Метод записывает в кэш маркер отсутствующего в БД меню
+        :param menu_id: id меню
+        :return: None
+        """
+        await CacheStorage.set_not_found(cls.__menu_id.format(menu_id=menu_id))
+
     @classmethod
     async def delete(cls, menu_id: str) -> None:
         """
@@ -70,5 +151,70 @@ class MenuCacheRepository:
         :param menu_id: id меню
         :return: None
         """
-        await redis_client.delete(cls.__menu_id.format(menu_id=menu_id))
+        await CacheStorage.delete(cls.__menu_id.format(menu_id=menu_id))
         logger.info('Кэш меню очищен')
+
+    @classmethod
+    @CacheMetrics.observe
+    async def get_many(cls, menus_ids: list[str]) -> list[bytes | None]:
+        """
+        Метод проверяет в кэше записи о нескольких меню одной командой
+        :param menus_ids: список id меню
+        :return: список json-документов с данными в порядке id (None, если кэша нет)
+        """
+        return await CacheStorage.get_many([cls.__menu_id.format(menu_id=menu_id) for menu_id in menus_ids])
+
+    @classmethod
+    @CacheMetrics.observe
+    async def set_many(cls, menus: dict[str, bytes]) -> None:
+        """
+        Метод записывает в кэш данные о нескольких меню одним пайплайном
+        :param menus: словарь с id меню и json-документами с их данными
+        :return: None
+        """
+        await CacheStorage.set_many({cls.__menu_id.format(menu_id=menu_id): menu for menu_id, menu in menus.items()})
+
+
+class MenuGenerationCacheRepository:
+    """
+    Поколение кэша меню: номер поколения входит в ключи записей о подменю и блюдах меню,
+    смена поколения одной командой очищает кэш всего поддерева меню (номер поколения монотонно растет)
+    """
+    __generation = 'menu_{menu_id}_generation'
+    __prefix = 'menu_{menu_id}:v{generation}:'
+
+    @classmethod
+    def key(cls, menu_id: str) -> str:
+        """
+        Метод возвращает ключ счетчика поколения кэша меню
+        :param menu_id: id меню
+        :return: ключ
+        """
+        return cls.__generation.format(menu_id=menu_id)
+
+    @classmethod
+    async def prefix(cls, menu_id: str) -> str:
+        """
+        Метод возвращает префикс ключей записей о подменю и блюдах меню для текущего поколения
+        :param menu_id: id меню
+        :return: префикс ключей
+        """
+        generation = await CacheStorage.get_generation(cls.__generation.format(menu_id=menu_id))
+
+        return cls.__prefix.format(menu_id=menu_id, generation=generation)
+
+    @classmethod
+    async def prefixes(cls, menus_ids: list[str]) -> dict[str, str]:
+        """
+        Метод возвращает префиксы ключей текущего поколения для нескольких меню (поколения читаются одной командой)
+        :param menus_ids: список id меню
+        :return: словарь с id меню и префиксом ключей
+        """
+        generations = await CacheStorage.get_generations(
+            [cls.__generation.format(menu_id=menu_id) for menu_id in menus_ids]
+        )
+
+        return {
+            menu_id: cls.__prefix.format(menu_id=menu_id, generation=generation)
+            for menu_id, generation in zip(menus_ids, generations)
+        }
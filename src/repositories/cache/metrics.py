@@ -0,0 +1,188 @@
+import functools
+import time
+from bisect import bisect_left
+from typing import Any, Awaitable, Callable
+
+from src.repositories.cache.breaker import CacheCircuitBreaker
+
+
+class CacheMetrics:
+    """
+    Статистика операций репозиториев кэша по классу репозитория и операции (методу): кол-во вызовов,
+    попаданий и промахов чтения, прочитанных маркеров отсутствующих в БД записей, ошибок, объем переданных документов и гистограмма времени выполнения
+    """
+
+    # Верхние границы интервалов гистограммы времени выполнения (в секундах), последний интервал - без границы
+    BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+    # Статистика по (класс репозитория, операция)
+    __stats: dict[tuple[str, str], dict[str, Any]] = {}
+
+    @classmethod
+    def observe(cls, method: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        """
+        Декоратор метода репозитория кэша (под @classmethod) для сбора статистики.
+        Методы get* считаются операциями чтения: пустой результат - промах, иначе попадание
+        (для чтения нескольких записей - по каждой записи). Маркер отсутствующей в БД записи учитывается
+        отдельно от попаданий, чтобы кэширование 404 не завышало долю попаданий.
+        Ошибкой считается исключение либо значение по умолчанию, возвращенное выключателем кэша (Redis недоступен),
+        такой результат не учитывается как промах. Проверка ETag (методы get*_etag) выполняется
+        до чтения документа, поэтому учитывается без попаданий и промахов.
+        Очистка кэша учитывается только в CacheStorage (методы-обертки репозиториев не декорируются)
+        :param method: метод репозитория
+        :return: метод со сбором статистики
+        """
+        read = method.__name__.startswith('get') and not method.__name__.endswith('_etag')
+
+        @functools.wraps(method)
+        async def wrapper(repository: type, *args, **kwargs) -> Any:
+            start = time.perf_counter()
+
+            try:
+                result, fallbacks = await CacheCircuitBreaker.track(method(repository, *args, **kwargs))
+
+            except Exception:
+                cls.__record(repository.__name__, method.__name__, time.perf_counter() - start, error=True)
+                raise
+
+            if fallbacks:
+                cls.__record(repository.__name__, method.__name__, time.perf_counter() - start, error=True)
+                return result
+
+            if read:
+                hits, misses, not_found = cls.__hits(result)
+                size = cls.__size(result)
+
+            else:
+                hits, misses, not_found = 0, 0, 0
+                size = sum(cls.__size(value) for value in (*args, *kwargs.values()))
+
+            cls.__record(
+                repository.__name__,
+                method.__name__,
+                time.perf_counter() - start,
+                hits=hits,
+                misses=misses,
+                not_found=not_found,
+                size=size,
+            )
+
+            return result
+
+        return wrapper
+
+    @classmethod
+    def stats(cls) -> list[dict]:
+        """
+        Метод возвращает накопленную статистику операций
+        :return: список словарей со статистикой по классу репозитория и операции
+        """
+        return [
+            {
+                'repository': repository,
+                'operation': operation,
+                'calls': stats['calls'],
+                'hits': stats['hits'],
+                'misses': stats['misses'],
+                'not_found': stats['not_found'],
+                'errors': stats['errors'],
+                'bytes': stats['bytes'],
+                'time_total': round(stats['time_total'], 6),
+                'time_max': round(stats['time_max'], 6),
+                'latency_buckets': dict(zip([*map(str, cls.BUCKETS), '+Inf'], stats['buckets'])),
+            }
+            for (repository, operation), stats in sorted(cls.__stats.items())
+        ]
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Метод сбрасывает накопленную статистику
+        :return: None
+        """
+        cls.__stats = {}
+
+    @classmethod
+    def __hits(cls, result: Any) -> tuple[int, int, int]:
+        """
+        Метод подсчитывает попадания и промахи операции чтения
+        :param result: результат чтения (документ, страница списка, список документов либо None)
+        :return: кол-во попаданий, промахов и маркеров отсутствующей в БД записи
+        """
+        documents = result if isinstance(result, list) else [result]
+        misses = sum(1 for document in documents if document is None)
+        # Маркер отсутствующей в БД записи (CacheStorage.NOT_FOUND) - пустой документ
+        not_found = sum(1 for document in documents if document == b'')
+
+        return len(documents) - misses - not_found, misses, not_found
+
+    @classmethod
+    def __size(cls, value: Any) -> int:
+        """
+        Метод подсчитывает объем json-документов в аргументе либо результате операции
+        :param value: документ, страница списка, список либо словарь с документами
+        :return: объем в байтах
+        """
+        if isinstance(value, bytes):
+            return len(value)
+
+        if isinstance(value, tuple):
+            return cls.__size(value[0]) if value else 0
+
+        if isinstance(value, list):
+            return sum(cls.__size(document) for document in value)
+
+        if isinstance(value, dict):
+            return sum(cls.__size(document) for document in value.values())
+
+        return 0
+
+    @classmethod
+    def __record(
+            cls,
+            repository: str,
+            operation: str,
+            duration: float,
+            hits: int = 0,
+            misses: int = 0,
+            not_found: int = 0,
+            size: int = 0,
+            error: bool = False
+    ) -> None:
+        """
+        Метод учитывает в статистике одну операцию
+        :param repository: класс репозитория
+        :param operation: операция (метод репозитория)
+        :param duration: время выполнения в секундах
+        :param hits: кол-во попаданий
+        :param misses: кол-во промахов
+        :param not_found: кол-во прочитанных маркеров отсутствующей в БД записи
+        :param size: объем документов в байтах
+        :param error: операция завершилась ошибкой
+        :return: None
+        """
+        stats = cls.__stats.get((repository, operation))
+
+        if stats is None:
+            stats = {
+                'calls': 0,
+                'hits': 0,
+                'misses': 0,
+                'not_found': 0,
+                'errors': 0,
+                'bytes': 0,
+                'time_total': 0.0,
+                'time_max': 0.0,
+                'buckets': [0] * (len(cls.BUCKETS) + 1),
+            }
+            cls.__stats[(repository, operation)] = stats
+
+        stats['calls'] += 1
+        stats['hits'] += hits
+        stats['misses'] += misses
+        stats['not_found'] += not_found
+        stats['errors'] += int(error)
+        stats['bytes'] += size
+        stats['time_total'] += duration
+        stats['time_max'] = max(stats['time_max'], duration)
+        stats['buckets'][bisect_left(cls.BUCKETS, duration)] += 1
@@ -0,0 +1,204 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from aioredis.exceptions import LockError
+from aioredis.lock import Lock
+from fastapi_redis import redis_client
+from loguru import logger
+
+from src.config import SINGLE_FLIGHT_LOCK_TTL, SINGLE_FLIGHT_WAIT
+from src.repositories.cache.breaker import CacheCircuitBreaker
+
+
+class SingleFlight:
+    """
+    Пересборка отсутствующей в кэше записи одним запросом к БД: одновременные запросы процесса ожидают
+    результат общей задачи, а процессы между собой - блокировку в Redis, пока запись пересобирает другой процесс
+    """
+
+    # Задачи пересборки текущего процесса по ключу кэша
+    __flights: dict[str, asyncio.Task] = {}
+
+    # Интервал проверки кэша при ожидании пересборки другим процессом (в секундах)
+    POLL_INTERVAL = 0.05
+
+    LOCK_PREFIX = 'lock:'
+    __lock = LOCK_PREFIX + '{key}'
+
+    @classmethod
+    async def run(
+            cls,
+            key: str,
+            get_cached: Callable[[], Awaitable[Any]],
+            load: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Метод возвращает запись, пересобранную одним запросом на все одновременные промахи кэша по ключу
+        :param key: ключ кэша пересобираемой записи
+        :param get_cached: функция чтения записи из кэша
+        :param load: функция запроса записи из БД (записывает результат в кэш и возвращает его)
+        :return: запись
+        """
+        # shield - отмена одного из ожидающих запросов не отменяет пересборку для остальных
+        return await asyncio.shield(cls.__start(key=key, get_cached=get_cached, load=load))
+
+    @classmethod
+    def refresh(
+            cls,
+            key: str,
+            get_cached: Callable[[], Awaitable[Any]],
+            load: Callable[[], Awaitable[Any]]
+    ) -> None:
+        """
+        Метод запускает фоновую пересборку записи без ожидания результата
+        (используется при отдаче устаревшей записи, повторные вызовы присоединяются к уже запущенной пересборке)
+        :param key: ключ кэша пересобираемой записи
+        :param get_cached: функция чтения записи из кэша
+        :param load: функция запроса записи из БД (записывает результат в кэш)
+        :return: None
+        """
+        cls.__start(key=key, get_cached=get_cached, load=load)
+
+    @classmethod
+    def __start(
+            cls,
+            key: str,
+            get_cached: Callable[[], Awaitable[Any]],
+            load: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Task:
+        """
+        Метод возвращает задачу пересборки записи, запуская ее, если в процессе она еще не выполняется
+        :param key: ключ кэша пересобираемой записи
+        :param get_cached: функция чтения записи из кэша
+        :param load: функция запроса записи из БД
+        :return: задача пересборки
+        """
+        flight = cls.__flights.get(key)
+
+        if flight is None:
+            flight = asyncio.create_task(cls.__fly(key=key, get_cached=get_cached, load=load))
+            cls.__flights[key] = flight
+            flight.add_done_callback(lambda task: cls.__land(key=key, task=task))
+
+        else:
+            logger.debug(f'Ожидание пересборки кэша: {key}')
+
+        return flight
+
+    @classmethod
+    def __land(cls, key: str, task: asyncio.Task) -> None:
+        """
+        Метод удаляет завершенную задачу пересборки и логирует ошибку пересборки
+        :param key: ключ кэша пересобираемой записи
+        :param task: завершенная задача
+        :return: None
+        """
+        cls.__flights.pop(key, None)
+
+        if not task.cancelled() and task.exception():
+            logger.error(f'Ошибка пересборки кэша {key}: {task.exception()}')
+
+    @classmethod
+    async def __fly(
+            cls,
+            key: str,
+            get_cached: Callable[[], Awaitable[Any]],
+            load: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Метод пересобирает запись под блокировкой в Redis либо дожидается записи, пересобранной другим процессом
+        :param key: ключ кэша пересобираемой записи
+        :param get_cached: функция чтения записи из кэша
+        :param load: функция запроса записи из БД
+        :return: запись
+        """
+        if not CacheCircuitBreaker.available():
+            # Redis недоступен - запись запрашивается из БД без блокировки (в пределах процесса запросы
+            # по-прежнему объединяются)
+            return await load()
+
+        lock = redis_client.lock(cls.__lock.format(key=key), timeout=SINGLE_FLIGHT_LOCK_TTL)
+        acquired = await cls.__acquire(lock)
+
+        if acquired is None:
+            # Redis не ответил - запись запрашивается из БД без блокировки
+            logger.warning(f'Блокировка пересборки кэша недоступна: {key}')
+            return await load()
+
+        if not acquired:
+            cached = await cls.__wait(key=key, get_cached=get_cached)
+
+            if cached is not None:
+                return cached
+
+            # Другой процесс не записал кэш за отведенное время либо Redis стал недоступен - пересобираем запись сами
+            logger.warning(f'Кэш не пересобран другим процессом: {key}')
+            return await load()
+
+        try:
+            return await load()
+
+        finally:
+            await cls.__release(lock)
+
+    @classmethod
+    @CacheCircuitBreaker.protect()
+    async def __acquire(cls, lock: Lock) -> bool | None:
+        """
+        Метод захватывает блокировку пересборки без ожидания
+        :param lock: блокировка
+        :return: True - блокировка захвачена, False - блокировка занята другим процессом,
+            None - Redis недоступен
+        """
+        return await lock.acquire(blocking=False)
+
+    @classmethod
+    @CacheCircuitBreaker.protect()
+    async def __release(cls, lock: Lock) -> None:
+        """
+        Метод снимает блокировку пересборки (если Redis недоступен, блокировка будет снята по таймауту)
+        :param lock: блокировка
+        :return: None
+        """
+        try:
+            await lock.release()
+
+        except LockError:
+            # Блокировка истекла до окончания пересборки - ошибкой Redis не считается
+            pass
+
+    @classmethod
+    @CacheCircuitBreaker.protect(fallback=lambda cls, lock_key: False)
+    async def __locked(cls, lock_key: str) -> bool:
+        """
+        Метод проверяет, удерживается ли блокировка пересборки другим процессом
+        :param lock_key: ключ блокировки
+        :return: True - блокировка удерживается, False - блокировка снята либо Redis недоступен
+        """
+        return bool(await redis_client.exists(lock_key))
+
+    @classmethod
+    async def __wait(cls, key: str, get_cached: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Метод ожидает запись в кэше, пока она пересобирается другим процессом
+        :param key: ключ кэша пересобираемой записи
+        :param get_cached: функция чтения записи из кэша
+        :return: запись либо None, если блокировка снята без записи в кэш или время ожидания истекло
+        """
+        lock_key = cls.__lock.format(key=key)
+        deadline = time.monotonic() + SINGLE_FLIGHT_WAIT
+
+        while time.monotonic() < deadline:
+            await asyncio.sleep(cls.POLL_INTERVAL)
+            cached = await get_cached()
+
+            if cached is not None:
+                return cached
+
+            if not await cls.__locked(lock_key):
+                # Блокировка могла быть снята сразу после записи в кэш - проверяем кэш повторно
+                # (если Redis недоступен, кэш не читается и запись пересобирается из БД)
+                return await get_cached()
+
+        return None
@@ -0,0 +1,676 @@
+import asyncio
+import json
+import re
+
+from aioredis.client import Pipeline
+from aioredis.exceptions import RedisError
+from fastapi_redis import redis_client
+from loguru import logger
+
+from src.config import CACHE_BREAKER_BULK_TIMEOUT, CACHE_BREAKER_TIMEOUT, CACHE_STALE_TTL
+from src.repositories.cache.breaker import CacheCircuitBreaker
+from src.repositories.cache.codec import CacheCodec
+from src.repositories.cache.key_class import CacheKeyClass
+from src.repositories.cache.local import LocalCache
+from src.repositories.cache.metrics import CacheMetrics
+from src.repositories.cache.single_flight import SingleFlight
+from src.repositories.cache.ttl import CacheTTL
+from src.utils.etag import make_etag
+
+
+class CacheStorage:
+    """
+    Низкоуровневые операции с кэшем, общие для репозиториев кэша.
+    Чтение идет через процессный L1-кэш, очистка ключей рассылается всем процессам API ч/з Redis pub/sub
+    """
+
+    # Поле хэша со страницей, содержащей полный список записей (запрос без пагинации)
+    FULL_PAGE = 'all'
+
+    # Канал Redis для рассылки очищенных ключей
+    INVALIDATION_CHANNEL = 'cache_invalidation'
+
+    # Пауза перед переподключением к каналу инвалидации при потере соединения с Redis (в секундах)
+    RECONNECT_DELAY = 1
+
+    # Ключи, которые при очистке не удаляются, а сохраняются как устаревшие на время CACHE_STALE_TTL
+    # (устаревшая запись отдается, пока актуальная пересобирается в фоне)
+    STALE_KEYS = frozenset({'all_data', 'menus_list'})
+    STALE_PREFIX = 'stale:'
+
+    # Маркер записи, отсутствующей в БД: хранится под ключом записи с коротким временем жизни и очищается
+    # вместе с записью (при создании записи, смене поколения кэша меню)
+    NOT_FOUND = b''
+
+    # ETag json-документа вычисляется один раз при записи в кэш и хранится рядом с ним с тем же временем жизни:
+    # отдельным ключом для записей, полем хэша для страниц списков (в L1-кэше - полем записи)
+    ETAG_PREFIX = 'etag:'
+    ETAG_FIELD = 'etag'
+
+    # Классы ключей, определяемые по ключу целиком и по окончанию ключа (остальные ключи - отдельные записи).
+    # Порядок меню и фрагменты всех данных с одним меню хранятся и кодируются так же, как все данные
+    __KEY_CLASSES = {'all_data': CacheKeyClass.ALL_DATA, 'all_data_menus': CacheKeyClass.ALL_DATA}
+    __KEY_SUFFIXES = {
+        '_list': CacheKeyClass.LIST,
+        '_generation': CacheKeyClass.GENERATION,
+        '_all_data': CacheKeyClass.ALL_DATA,
+    }
+
+    # Кол-во ключей, запрашиваемых за одну итерацию SCAN при подсчете ключей
+    SCAN_COUNT = 1000
+
+    # Ключи и счетчики поколений, очистка которых не выполнена, пока Redis был недоступен
+    # (очищаются после восстановления Redis)
+    __deferred_keys: set[str] = set()
+    __deferred_generations: set[str] = set()
+
+    # Префикс ключей с номером поколения кэша меню (см. MenuGenerationCacheRepository): номер поколения
+    # в ключах, собранных без Redis, неизвестен, поэтому вместо таких ключей меняется поколение меню
+    __VERSIONED_KEY = re.compile(r'^(menu_[^:]+):v\d+:')
+
+    # Смена поколения: новый номер не меньше текущего времени Redis в миллисекундах, поэтому после устаревания
+    # счетчика номера поколений не повторяются (записи с номером поколения до устаревания счетчика не читаются).
+    # Время жизни счетчика продлевается при каждой смене поколения
+    __BUMP_GENERATION = """
+    local time = redis.call('TIME')
+    local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+    local generation = math.max(tonumber(redis.call('GET', KEYS[1]) or '0') + 1, now)
+    redis.call('SET', KEYS[1], string.format('%d', generation))
+    if tonumber(ARGV[1]) > 0 then
+        redis.call('EXPIRE', KEYS[1], ARGV[1])
+    end
+    return generation
+    """
+
+    # Переименование записи в устаревшую (без ошибки, если записи нет)
+    __MARK_STALE = """
+    if redis.call('EXISTS', KEYS[1]) == 1 then
+        redis.call('RENAME', KEYS[1], KEYS[2])
+        redis.call('EXPIRE', KEYS[2], ARGV[1])
+    end
+    """
+
+    @classmethod
+    def page_field(cls, limit: int | None, after: str | None) -> str:
+        """
+        Метод возвращает имя поля хэша для страницы списка
+        :param limit: кол-во записей на странице (None - полный список)
+        :param after: id записи, после которой начинается страница
+        :return: имя поля
+        """
+        if limit is None:
+            return cls.FULL_PAGE
+
+        return f'{limit}:{after or ""}'
+
+    @classmethod
+    def next_after_field(cls, field: str) -> str:
+        """
+        Метод возвращает имя поля хэша с id последней записи страницы списка (для запроса следующей страницы)
+        :param field: поле хэша со страницей
+        :return: имя поля
+        """
+        return f'{field}:next_after'
+
+    @classmethod
+    def etag_field(cls, field: str | None) -> str:
+        """
+        Метод возвращает имя поля с ETag записи (в L1-кэше) либо страницы списка (в хэше и L1-кэше)
+        :param field: поле хэша со страницей (None - запись)
+        :return: имя поля
+        """
+        if field is None:
+            return cls.ETAG_FIELD
+
+        return f'{field}:{cls.ETAG_FIELD}'
+
+    @classmethod
+    def key_class(cls, key: str) -> str:
+        """
+        Метод возвращает класс ключа записи (для настроек кодирования, времени жизни и статистики)
+        :param key: ключ записи
+        :return: класс ключа
+        """
+        if key.startswith(cls.STALE_PREFIX):
+            return CacheKeyClass.STALE
+
+        if key.startswith(SingleFlight.LOCK_PREFIX):
+            return CacheKeyClass.LOCK
+
+        if key.startswith(cls.ETAG_PREFIX):
+            return CacheKeyClass.ETAG
+
+        if key in cls.__KEY_CLASSES:
+            return cls.__KEY_CLASSES[key]
+
+        for suffix, key_class in cls.__KEY_SUFFIXES.items():
+            if key.endswith(suffix):
+                return key_class
+
+        return CacheKeyClass.ITEM
+
+    @classmethod
+    def timeout(cls, *keys: str) -> float:
+        """
+        Метод возвращает таймаут операции с Redis по ключам записей: чтение и запись всех данных и их фрагментов
+        (документы в несколько МБ) ограничены CACHE_BREAKER_BULK_TIMEOUT, чтобы штатная передача объемного
+        документа не считалась ошибкой Redis
+        :param keys: ключи записей
+        :return: таймаут в секундах
+        """
+        if any(cls.key_class(key) == CacheKeyClass.ALL_DATA for key in keys):
+            return CACHE_BREAKER_BULK_TIMEOUT
+
+        return CACHE_BREAKER_TIMEOUT
+
+    @classmethod
+    @CacheCircuitBreaker.protect(timeout=lambda cls, key: cls.timeout(key))
+    async def get(cls, key: str) -> bytes | None:
+        """
+        Метод возвращает из кэша готовый json-документ (тело ответа) без десериализации
+        :param key: ключ записи
+        :return: документ либо маркер NOT_FOUND, если есть кэш, иначе None
+        """
+        data = LocalCache.get(key)
+
+        if data is not None:
+            return data
+
+        # Номер очистки запоминается до чтения: значение, очищенное во время чтения, не попадет в L1-кэш
+        version = LocalCache.version()
+        # execute_command - читаем значение "как есть", без json-декодирования в redis_client.get()
+        data = CacheCodec.decode(await redis_client.execute_command('GET', key), key_class=cls.key_class(key))
+
+        if data:
+            LocalCache.set(key, data, size=len(data), version=version)
+
+        return data
+
+    @classmethod
+    @CacheCircuitBreaker.protect(timeout=lambda cls, key, data: cls.timeout(key))
+    async def set(cls, key: str, data: bytes) -> None:
+        """
+        Метод записывает в кэш готовый json-документ (тело ответа) и его ETag со временем жизни по классу ключа
+        :param key: ключ записи
+        :param data: документ
+        :return: None
+        """
+        version = LocalCache.version()
+
+        async with redis_client.pipeline(transaction=False) as pipe:
+            etag = cls.__pipe_set(pipe, key=key, data=data)
+            await pipe.execute()
+
+        LocalCache.set(key, data, size=len(data), version=version)
+        LocalCache.set(key, etag, size=len(etag), field=cls.ETAG_FIELD, version=version)
+
+    @classmethod
+    @CacheCircuitBreaker.protect()
+    async def set_not_found(cls, key: str) -> None:
+        """
+        Метод записывает в кэш маркер отсутствующей в БД записи (в L1-кэш не записывается, чтобы маркер
+        не пережил свое время жизни в Redis)
+        :param key: ключ записи
+        :return: None
+        """
+        ttl = CacheTTL.not_found()
+
+        if ttl:
+            await redis_client.execute_command('SET', key, cls.NOT_FOUND, 'EX', ttl)
+
+    @classmethod
+    @CacheCircuitBreaker.protect()
+    async def get_page(cls, key: str, field: str) -> tuple[bytes, str | None] | None:
+        """
+        Метод возвращает страницу списка из кэша одной командой HMGET
+        (все страницы списка хранятся в одном хэше и очищаются вместе с ним)
+        :param key: ключ хэша со страницами списка
+        :param field: поле хэша со страницей
+        :return: json-документ со страницей и id последней записи для следующей страницы, если есть кэш, иначе None
+        """
+        page = LocalCache.get(key, field=field)
+
+        if page is not None:
+            return page
+
+        version = LocalCache.version()
+        page = await cls.__hget_page(key=key, field=field)
+
+        if page:
+            LocalCache.set(key, page, size=len(page[0]), field=field, version=version)
+
+        return page
+
+    @classmethod
+    @CacheCircuitBreaker.protect()
+    async def set_page(
+            cls,
+            key: str,
+            field: str,
+            data: bytes,
+            next_after: str | None
+    ) -> None:
+        """
+        Метод записывает страницу списка в кэш (время жизни хэша со страницами продлевается при записи страницы)
+        :param key: ключ хэша со страницами списка
+        :param field: поле хэша со страницей
+        :param data: json-документ со страницей
+        :param next_after: id последней записи страницы, если есть следующая страница, иначе None
+        :return: None
+        """
+        version = LocalCache.version()
+
+        async with redis_client.pipeline(transaction=False) as pipe:
+            etag = cls.__pipe_set_page(pipe, key=key, field=field, data=data, next_after=next_after)
+            await pipe.execute()
+
+        LocalCache.set(key, (data, next_after), size=len(data), field=field, version=version)
+        LocalCache.set(key, etag, size=len(etag), field=cls.etag_field(field), version=version)
+
+    @classmethod
+    @CacheCircuitBreaker.protect()
+    async def get_etag(cls, key: str, field: str | None = None) -> str | None:
+        """
+        Метод возвращает ETag записи либо страницы списка, вычисленный при записи в кэш (без чтения документа)
+        :param key: ключ записи либо хэша со страницами списка
+        :param field: поле хэша со страницей (None - запись)
+        :return: ETag, если есть кэш, иначе None
+        """
+        etag_field = cls.etag_field(field)
+        etag = LocalCache.get(key, field=etag_field)
+
+        if etag is not None:
+            return etag
+
+        version = LocalCache.version()
+
+        if field is None:
+            etag = await redis_client.execute_command('GET', cls.ETAG_PREFIX + key)
+
+        else:
+            etag = await redis_client.hget(key, etag_field)
+
+        if not etag:
+            return None
+
+        etag = etag.decode()
+        LocalCache.set(key, etag, size=len(etag), field=etag_field, version=version)
+
+        return etag
+
+    @classmethod
+    @CacheCircuitBreaker.protect(
+        fallback=lambda cls, keys: [None] * len(keys),
+        timeout=lambda cls, keys: cls.timeout(*keys),
+    )
+    async def get_many(cls, keys: list[str]) -> list[bytes | None]:
+        """
+        Метод возвращает json-документы из кэша по нескольким ключам (отсутствующие в L1-кэше - одной командой MGET)
+        :param keys: ключи записей
+        :return: список документов в порядке ключей (None для отсутствующих в кэше)
+        """
+        values = [LocalCache.get(key) for key in keys]
+        missed_keys = [key for key, value in zip(keys, values) if value is None]
+
+        if not missed_keys:
+            return values
+
+        version = LocalCache.version()
+        missed = dict(zip(missed_keys, await redis_client.mget(missed_keys)))
+
+        for i, key in enumerate(keys):
+            data = CacheCodec.decode(missed.get(key), key_class=cls.key_class(key))
+
+            if values[i] is None and data:
+                values[i] = data
+                LocalCache.set(key, data, size=len(data), version=version)
+
+        return values
+
+    @classmethod
+    @CacheCircuitBreaker.protect(timeout=lambda cls, items: cls.timeout(*items))
+    async def set_many(cls, items: dict[str, bytes]) -> None:
+        """
+        Метод записывает в кэш несколько json-документов за один обмен с Redis (пайплайн без транзакции)
+        :param items: словарь с ключами и документами
+        :return: None
+        """
+        if not items:
+            return
+
+        version = LocalCache.version()
+        etags = {}
+
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key, data in items.items():
+                etags[key] = cls.__pipe_set(pipe, key=key, data=data)
+
+            await pipe.execute()
+
+        for key, data in items.items():
+            LocalCache.set(key, data, size=len(data), version=version)
+            LocalCache.set(key, etags[key], size=len(etags[key]), field=cls.ETAG_FIELD, version=version)
+
+    @classmethod
+    @CacheCircuitBreaker.protect(timeout=lambda cls, key: cls.timeout(key))
+    async def get_stale(cls, key: str) -> bytes | None:
+        """
+        Метод возвращает устаревший json-документ, сохраненный при очистке записи (в L1-кэш не записывается)
+        :param key: ключ записи
+        :return: документ, если устаревшая запись есть, иначе None
+        """
+        if not CACHE_STALE_TTL:
+            return None
+
+        value = await redis_client.execute_command('GET', cls.STALE_PREFIX + key)
+
+        return CacheCodec.decode(value, key_class=cls.key_class(key))
+
+    @classmethod
+    @CacheCircuitBreaker.protect()
+    async def get_stale_page(cls, key: str, field: str) -> tuple[bytes, str | None] | None:
+        """
+        Метод возвращает устаревшую страницу списка, сохраненную при очистке списка (в L1-кэш не записывается)
+        :param key: ключ хэша со страницами списка
+        :param field: поле хэша со страницей
+        :return: json-документ со страницей и id последней записи для следующей страницы, если устаревшая
+            страница есть, иначе None
+        """
+        if not CACHE_STALE_TTL:
+            return None
+
+        return await cls.__hget_page(key=cls.STALE_PREFIX + key, field=field)
+
+    @classmethod
+    async def __hget_page(cls, key: str, field: str) -> tuple[bytes, str | None] | None:
+        """
+        Метод читает из Redis страницу списка вместе с id для следующей страницы одной командой HMGET
+        :param key: ключ хэша со страницами списка
+        :param field: поле хэша со страницей
+        :return: json-документ со страницей и id последней записи для следующей страницы, если есть кэш, иначе None
+        """
+        value, next_after = await redis_client.hmget(key, field, cls.next_after_field(field))
+        data = CacheCodec.decode(value, key_class=CacheKeyClass.LIST)
+
+        if not data:
+            return None
+
+        return data, next_after.decode() if next_after else None
+
+    @classmethod
+    @CacheCircuitBreaker.protect(fallback=lambda cls, key: 0)
+    async def get_generation(cls, key: str) -> int:
+        """
+        Метод возвращает текущее поколение кэша (номер входит в ключи записей, очищаемых сменой поколения)
+        :param key: ключ счетчика поколения
+        :return: номер поколения (0, если поколение еще не менялось)
+        """
+        generation = LocalCache.get(key)
+
+        if generation is not None:
+            return generation
+
+        version = LocalCache.version()
+        raw = await redis_client.execute_command('GET', key)
+        generation = int(raw) if raw else 0
+        LocalCache.set(key, generation, size=len(raw or b''), version=version)
+
+        return generation
+
+    @classmethod
+    @CacheCircuitBreaker.protect(fallback=lambda cls, keys: [0] * len(keys))
+    async def get_generations(cls, keys: list[str]) -> list[int]:
+        """
+        Метод возвращает текущие поколения кэша по нескольким счетчикам (отсутствующие в L1-кэше - одной
+        командой MGET)
+        :param keys: ключи счетчиков поколений
+        :return: список номеров поколений в порядке ключей
+        """
+        generations = [LocalCache.get(key) for key in keys]
+        missed_keys = [key for key, generation in zip(keys, generations) if generation is None]
+
+        if not missed_keys:
+            return generations
+
+        version = LocalCache.version()
+        missed = dict(zip(missed_keys, await redis_client.mget(missed_keys)))
+
+        for i, key in enumerate(keys):
+            if generations[i] is None:
+                raw = missed[key]
+                generations[i] = int(raw) if raw else 0
+                LocalCache.set(key, generations[i], size=len(raw or b''), version=version)
+
+        return generations
+
+    @classmethod
+    @CacheMetrics.observe
+    @CacheCircuitBreaker.protect(fallback=lambda cls, *keys, generations=None: cls.__defer(keys, generations or []))
+    async def delete(cls, *keys: str, generations: list[str] | None = None) -> None:
+        """
+        Метод очищает записи в кэше, меняет поколения (все записи с прежним номером поколения
+        в ключе перестают читаться за одну команду) и рассылает очищенные ключи всем процессам
+        для очистки их L1-кэша. Записи из STALE_KEYS при включенном CACHE_STALE_TTL не удаляются,
+        а сохраняются как устаревшие.
+        Повторяющиеся ключи отбрасываются, UNLINK, смена поколений и рассылка выполняются за один обмен
+        с Redis (пайплайн)
+        :param keys: ключи записей
+        :param generations: ключи счетчиков поколений
+        :return: None
+        """
+        await cls.__invalidate(items={}, keys=keys, generations=generations or [], pages={})
+
+    @classmethod
+    @CacheMetrics.observe
+    @CacheCircuitBreaker.protect(
+        fallback=lambda cls, items, *keys, pages=None: cls.__defer((*items, *keys, *(pages or {})), []),
+        timeout=lambda cls, items, *keys, pages=None: cls.timeout(*items),
+    )
+    async def write_through(cls, items: dict[str, bytes], *keys: str, pages: dict[str, bytes] | None = None) -> None:
+        """
+        Метод перезаписывает в кэше обновленные записи и очищает зависящие от них записи (списки, все данные).
+        Перезаписанные ключи рассылаются всем процессам вместе с очищенными для очистки их L1-кэша.
+        Запись, очистка и рассылка выполняются за один обмен с Redis (пайплайн)
+        :param items: словарь с ключами и json-документами обновленных записей
+        :param keys: ключи очищаемых записей
+        :param pages: словарь с ключами хэшей списков и json-документами полных списков
+            (остальные страницы списков очищаются)
+        :return: None
+        """
+        await cls.__invalidate(items=items, keys=keys, generations=[], pages=pages or {})
+
+    @classmethod
+    @CacheCircuitBreaker.protect(
+        fallback=lambda cls, items, pages: False,
+        timeout=lambda cls, items, pages: CACHE_BREAKER_BULK_TIMEOUT,
+    )
+    async def fill(cls, items: dict[str, bytes], pages: dict[str, bytes]) -> bool:
+        """
+        Метод записывает в кэш часть записей и полных списков при заполнении кэша (с рассылкой ключей для очистки
+        L1-кэша всех процессов). В отличие от write_through ошибка Redis не откладывает очистку ключей,
+        а возвращается вызывающему
+        :param items: словарь с ключами и json-документами записей
+        :param pages: словарь с ключами хэшей списков и json-документами полных списков
+        :return: True - записи записаны, False - Redis недоступен либо не ответил за CACHE_BREAKER_BULK_TIMEOUT
+        """
+        await cls.__invalidate(items=items, keys=(), generations=[], pages=pages)
+
+        return True
+
+    @classmethod
+    async def __invalidate(
+            cls,
+            items: dict[str, bytes],
+            keys: tuple[str, ...],
+            generations: list[str],
+            pages: dict[str, bytes]
+    ) -> None:
+        """
+        Метод перезаписывает и очищает записи в кэше, увеличивает счетчики поколений и рассылает
+        измененные ключи всем процессам одним пайплайном
+        :param items: словарь с ключами и json-документами перезаписываемых записей
+        :param keys: ключи очищаемых записей
+        :param generations: ключи счетчиков поколений
+        :param pages: словарь с ключами хэшей списков и json-документами полных списков
+            (хэш очищается, затем в него записывается полный список)
+        :return: None
+        """
+        keys = [key for key in dict.fromkeys((*keys, *pages)) if key not in items]
+        generations = list(dict.fromkeys(generations))
+
+        if not items and not keys and not generations:
+            return
+
+        LocalCache.delete(*items, *keys, *generations)
+
+        stale = [key for key in keys if key in cls.STALE_KEYS] if CACHE_STALE_TTL else []
+        unlinked = [key for key in keys if key not in stale]
+
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key, data in items.items():
+                cls.__pipe_set(pipe, key=key, data=data)
+
+            for key in stale:
+                pipe.eval(cls.__MARK_STALE, 2, key, cls.STALE_PREFIX + key, CACHE_STALE_TTL)
+
+            if keys:
+                # UNLINK - память освобождается Redis в фоне, без блокировки на больших значениях (all_data).
+                # ETag очищается и у записей, сохраненных как устаревшие: устаревшая запись отдается без него
+                pipe.unlink(*unlinked, *(cls.ETAG_PREFIX + key for key in keys))
+
+            for key, data in pages.items():
+                cls.__pipe_set_page(pipe, key=key, field=cls.FULL_PAGE, data=data, next_after=None)
+
+            generation_ttl = CacheTTL.generation() or 0
+
+            for generation in generations:
+                pipe.eval(cls.__BUMP_GENERATION, 1, generation, generation_ttl)
+
+            pipe.publish(cls.INVALIDATION_CHANNEL, json.dumps([*items, *keys, *generations]))
+            await pipe.execute()
+
+    @classmethod
+    def __defer(cls, keys: tuple[str, ...], generations: list[str]) -> None:
+        """
+        Метод откладывает очистку записей до восстановления Redis (L1-кэш процесса очищается сразу)
+        :param keys: ключи очищаемых записей
+        :param generations: ключи счетчиков поколений
+        :return: None
+        """
+        LocalCache.delete(*keys, *generations)
+
+        for key in keys:
+            versioned = cls.__VERSIONED_KEY.match(key)
+
+            if versioned:
+                cls.__deferred_generations.add(f'{versioned[1]}_generation')
+
+            else:
+                cls.__deferred_keys.add(key)
+
+        cls.__deferred_generations.update(generations)
+        logger.warning(f'Очистка кэша отложена до восстановления Redis: {keys}, {generations}')
+
+    @classmethod
+    async def replay_invalidations(cls) -> None:
+        """
+        Метод очищает записи, очистка которых была отложена, пока Redis был недоступен
+        :return: None
+        """
+        keys, generations = list(cls.__deferred_keys), list(cls.__deferred_generations)
+        cls.__deferred_keys, cls.__deferred_generations = set(), set()
+
+        if keys or generations:
+            logger.info(f'Очистка отложенных записей кэша: {keys}, {generations}')
+            await cls.delete(*keys, generations=generations)
+
+    @classmethod
+    def __pipe_set(cls, pipe: Pipeline, key: str, data: bytes) -> str:
+        """
+        Метод добавляет в пайплайн запись json-документа и его ETag со временем жизни по классу ключа
+        :param pipe: пайплайн
+        :param key: ключ записи
+        :param data: документ
+        :return: ETag документа
+        """
+        key_class = cls.key_class(key)
+        ttl = CacheTTL.get(key_class)
+        etag = make_etag(data)
+        pipe.set(key, CacheCodec.encode(data, key_class=key_class), ex=ttl)
+        pipe.set(cls.ETAG_PREFIX + key, etag, ex=ttl)
+
+        return etag
+
+    @classmethod
+    def __pipe_set_page(
+            cls,
+            pipe: Pipeline,
+            key: str,
+            field: str,
+            data: bytes,
+            next_after: str | None
+    ) -> str:
+        """
+        Метод добавляет в пайплайн запись страницы списка и ее ETag (время жизни хэша со страницами продлевается)
+        :param pipe: пайплайн
+        :param key: ключ хэша со страницами списка
+        :param field: поле хэша со страницей
+        :param data: json-документ со страницей
+        :param next_after: id последней записи страницы, если есть следующая страница, иначе None
+        :return: ETag страницы
+        """
+        ttl = CacheTTL.get(CacheKeyClass.LIST)
+        etag = make_etag(data)
+        value = CacheCodec.encode(data, key_class=CacheKeyClass.LIST)
+        pipe.hset(
+            key,
+            mapping={field: value, cls.next_after_field(field): next_after or '', cls.etag_field(field): etag},
+        )
+
+        if ttl:
+            pipe.expire(key, ttl)
+
+        return etag
+
+    @classmethod
+    async def count_keys(cls) -> dict[str, int]:
+        """
+        Метод подсчитывает ключи в Redis по классам (итерация SCAN не блокирует Redis на время подсчета)
+        :return: словарь с классом ключа и кол-вом ключей
+        """
+        counts = dict.fromkeys(CacheKeyClass.ALL, 0)
+
+        async for key in redis_client.scan_iter(count=cls.SCAN_COUNT):
+            counts[cls.key_class(key.decode())] += 1
+
+        return counts
+
+    @classmethod
+    async def listen_invalidations(cls) -> None:
+        """
+        Метод (фоновая задача процесса API) получает из Redis очищенные ключи и удаляет их из L1-кэша.
+        L1-кэш используется только пока есть подписка: при потере соединения он очищается и отключается
+        :return: None
+        """
+        while True:
+            try:
+                async with redis_client.pubsub() as pubsub:
+                    await pubsub.subscribe(cls.INVALIDATION_CHANNEL)
+                    LocalCache.active = True
+                    logger.info('L1-кэш подключен к каналу инвалидации')
+
+                    async for message in pubsub.listen():
+                        if message['type'] == 'message':
+                            LocalCache.delete(*json.loads(message['data']))
+
+            except RedisError as exc:
+                logger.error(f'Потеряно соединение с каналом инвалидации кэша: {exc}')
+
+            finally:
+                LocalCache.active = False
+                LocalCache.clear()
+
+            await asyncio.sleep(cls.RECONNECT_DELAY)
+
+
+CacheCircuitBreaker.on_recovery(CacheStorage.replay_invalidations)
@@ -1,80 +1,185 @@
-from fastapi_redis import redis_client
 from loguru import logger
 
-from src.models.submenu import Submenu
+from src.repositories.cache.menu import MenuGenerationCacheRepository
+from src.repositories.cache.metrics import CacheMetrics
+from src.repositories.cache.storage import CacheStorage
 
 
 class SubmenusListCacheRepository:
     """
     Проверка и добавление записей о списке подменю в кэш
+    (ключ содержит поколение кэша меню)
     """
-    __submenus_list = 'menu_{menu_id}_submenus_list'
+    __submenus_list = '{prefix}submenus_list'
 
     @classmethod
-    async def get_list(cls, menu_id: str) -> list | None:
+    async def key(cls, menu_id: str, prefix: str | None = None) -> str:
         """
-        Метод проверяет в кэше записи о списке подменю
+        Метод возвращает ключ кэша списка подменю для текущего поколения кэша меню
         :param menu_id: id меню
-        :return: словарь с данными, если есть кэш, иначе None
+        :param prefix: префикс ключей поколения кэша меню (None - префикс текущего поколения)
+        :return: ключ
         """
-        return await redis_client.get(cls.__submenus_list.format(menu_id=menu_id))
+        prefix = prefix or await MenuGenerationCacheRepository.prefix(menu_id=menu_id)
+
+        return cls.__submenus_list.format(prefix=prefix)
 
     @classmethod
-    async def set_list(cls, menu_id: str, submenus_list: list[Submenu]) -> None:
+    @CacheMetrics.observe
+    async def get_list(
+            cls,
+            menu_id: str,
+            limit: int | None = None,
+            after: str | None = None
+    ) -> tuple[bytes, str | None] | None:
         """
-        Метод записывает в кэш данные о списке подменю
+        Метод проверяет в кэше записи о списке подменю (каждая страница списка кэшируется отдельно)
         :param menu_id: id меню
-        :param submenus_list: список с подменю
-        :return: None
+        :param limit: кол-во подменю на странице (None - полный список)
+        :param after: id подменю, после которого начинается страница
+        :return: json-документ со списком подменю и id для следующей страницы, если есть кэш, иначе None
         """
-        await redis_client.set(
-            cls.__submenus_list.format(menu_id=menu_id),
-            [submenu.as_dict() for submenu in submenus_list]
+        return await CacheStorage.get_page(
+            await cls.key(menu_id=menu_id), CacheStorage.page_field(limit=limit, after=after)
         )
-        logger.info('Список подменю кэширован')
 
     @classmethod
-    async def delete_list(cls, menu_id: str) -> None:
+    @CacheMetrics.observe
+    async def get_list_etag(cls, menu_id: str, limit: int | None = None, after: str | None = None) -> str | None:
         """
-        Метод очищает кэш со списком подменю
-        :param menu_id: id меню, к которому относится подменю
+        Метод проверяет в кэше ETag страницы списка подменю
+        :param menu_id: id меню
+        :param limit: кол-во подменю на странице (None - полный список)
+        :param after: id подменю, после которого начинается страница
+        :return: ETag, если есть кэш, иначе None
+        """
+        return await CacheStorage.get_etag(
+            await cls.key(menu_id=menu_id), CacheStorage.page_field(limit=limit, after=after)
+        )
+
+    @classmethod
+    @CacheMetrics.observe
+    async def set_list(
+            cls,
+            menu_id: str,
+            submenus_list: bytes,
+            next_after: str | None = None,
+            limit: int | None = None,
+            after: str | None = None
+    ) -> None:
+        """
+        Метод записывает в кэш данные о списке подменю
+        :param menu_id: id меню
+        :param submenus_list: json-документ со списком подменю
+        :param next_after: id последнего подменю, если есть следующая страница, иначе None
+        :param limit: кол-во подменю на странице (None - полный список)
+        :param after: id подменю, после которого начинается страница
         :return: None
         """
-        await redis_client.delete(cls.__submenus_list.format(menu_id=menu_id))
-        logger.info('Кэш списка подменю очищен')
+        await CacheStorage.set_page(
+            await cls.key(menu_id=menu_id),
+            CacheStorage.page_field(limit=limit, after=after),
+            submenus_list,
+            next_after,
+        )
+        logger.info('Список подменю кэширован')
 
 
 class SubmenuCacheRepository:
     """
     Проверка и добавление записей о подменю в кэш
+    (ключ содержит поколение кэша меню)
     """
-    __submenu_id = 'submenu_{submenu_id}'
+    __submenu_id = '{prefix}submenu_{submenu_id}'
 
     @classmethod
-    async def get(cls, submenu_id: str) -> dict | None:
+    async def key(cls, menu_id: str, submenu_id: str, prefix: str | None = None) -> str:
+        """
+        Метод возвращает ключ кэша подменю для текущего поколения кэша меню
+        :param menu_id: id меню, к которому относится подменю
+        :param submenu_id: id подменю
+        :param prefix: префикс ключей поколения кэша меню (None - префикс текущего поколения)
+        :return: ключ
         """
-        Метод проверяет в кэше запись о меню
+        prefix = prefix or await MenuGenerationCacheRepository.prefix(menu_id=menu_id)
+
+        return cls.__submenu_id.format(prefix=prefix, submenu_id=submenu_id)
+
+    @classmethod
+    @CacheMetrics.observe
+    async def get(cls, menu_id: str, submenu_id: str) -> bytes | None:
+        """
+        Метод проверяет в кэше запись о подменю
+        :param menu_id: id меню, к которому относится подменю
         :param submenu_id: id подменю
-        :return: словарь с данными, если есть кэш, иначе None
+        :return: json-документ с данными либо маркер CacheStorage.NOT_FOUND, если есть кэш, иначе None
         """
-        return await redis_client.get(cls.__submenu_id.format(submenu_id=submenu_id))
+        return await CacheStorage.get(await cls.key(menu_id=menu_id, submenu_id=submenu_id))
 
     @classmethod
-    async def set(cls, submenu: Submenu) -> None:
+    @CacheMetrics.observe
+    async def get_etag(cls, menu_id: str, submenu_id: str) -> str | None:
         """
-        Метод записывает в кэш данные о меню
-        :param submenu: объект подменю
+        Метод проверяет в кэше ETag записи о подменю
+        :param menu_id: id меню
+        :param submenu_id: id подменю
+        :return: ETag, если есть кэш, иначе None
+        """
+        return await CacheStorage.get_etag(await cls.key(menu_id=menu_id, submenu_id=submenu_id))
+
+    @classmethod
+    @CacheMetrics.observe
+    async def set(cls, menu_id: str, submenu_id: str, submenu: bytes) -> None:
+        """
+        Метод записывает в кэш данные о подменю
+        :param menu_id: id меню, к которому относится подменю
+        :param submenu_id: id подменю
+        :param submenu: json-документ с данными подменю
         :return: None
         """
-        await redis_client.set(cls.__submenu_id.format(submenu_id=submenu.id), submenu.as_dict())
+        await CacheStorage.set(await cls.key(menu_id=menu_id, submenu_id=submenu_id), submenu)
         logger.info('Данные о подменю кэшированы')
 
     @classmethod
-    async def delete(cls, submenu_id: str) -> None:
+    @CacheMetrics.observe
+    async def set_not_found(cls, menu_id: str, submenu_id: str) -> None:
         """
-        Метод очищает кэш с данными о подменю
+        Метод записывает в кэш маркер подменю, отсутствующего в БД в переданном меню
+        :param menu_id: id меню, к которому относится подменю
         :param submenu_id: id подменю
         :return: None
         """
-        await redis_client.delete(cls.__submenu_id.format(submenu_id=submenu_id))
-        logger.info('Кэш подменю очищен')
+        await CacheStorage.set_not_found(await cls.key(menu_id=menu_id, submenu_id=submenu_id))
+
+    @classmethod
+    @CacheMetrics.observe
+    async def get_many(cls, menu_id: str, submenus_ids: list[str]) -> list[bytes | None]:
+        """
+        Метод проверяет в кэше записи о нескольких подменю меню одной командой
+        :param menu_id: id меню, к которому относятся подменю
+        :param submenus_ids: список id подменю
+        :return: список json-документов с данными в порядке id (None, если кэша нет)
+        """
+        prefix = await MenuGenerationCacheRepository.prefix(menu_id=menu_id)
+
+        return await CacheStorage.get_many(
+            [cls.__submenu_id.format(prefix=prefix, submenu_id=submenu_id) for submenu_id in submenus_ids]
+        )
+
+    @classmethod
+    @CacheMetrics.observe
+    async def set_many(cls, menu_id: str, submenus: dict[str, bytes]) -> None:
+        """
+        Метод записывает в кэш данные о нескольких подменю меню одним пайплайном
+        :param menu_id: id меню, к которому относятся подменю
+        :param submenus: словарь с id подменю и json-документами с их данными
+        :return: None
+        """
+        prefix = await MenuGenerationCacheRepository.prefix(menu_id=menu_id)
+
+        await CacheStorage.set_many(
+            {
+                cls.__submenu_id.format(prefix=prefix, submenu_id=submenu_id): submenu
+                for submenu_id, submenu in submenus.items()
+            },
+        )
@@ -0,0 +1,61 @@
+import random
+
+from src.config import (
+    CACHE_NOT_FOUND_TTL,
+    CACHE_TTL_ALL_DATA,
+    CACHE_TTL_ITEM,
+    CACHE_TTL_JITTER,
+    CACHE_TTL_LIST,
+)
+from src.repositories.cache.key_class import CacheKeyClass
+
+
+class CacheTTL:
+    """
+    Политика времени жизни записей кэша по классам ключей. К времени жизни добавляется случайная надбавка,
+    чтобы записи, кэшированные одновременно (после очистки кэша), не устаревали одновременно
+    """
+
+    __TTL = {
+        CacheKeyClass.ALL_DATA: CACHE_TTL_ALL_DATA,
+        CacheKeyClass.LIST: CACHE_TTL_LIST,
+        CacheKeyClass.ITEM: CACHE_TTL_ITEM,
+    }
+
+    @classmethod
+    def get(cls, key_class: str) -> int | None:
+        """
+        Метод возвращает время жизни записи со случайной надбавкой
+        :param key_class: класс ключа
+        :return: время жизни в секундах либо None - без ограничения
+        """
+        ttl = cls.__TTL.get(key_class)
+
+        if not ttl:
+            return None
+
+        return ttl + random.randint(0, int(ttl * CACHE_TTL_JITTER))
+
+    @classmethod
+    def generation(cls) -> int | None:
+        """
+        Метод возвращает время жизни счетчика поколения кэша меню (продлевается при каждой смене поколения).
+        Номера поколений не повторяются и после устаревания счетчика (см. CacheStorage), а счетчик живет дольше
+        любой записи, поэтому записей нулевого поколения, кэшированных до первой смены поколения, к его устареванию
+        не остается
+        :return: время жизни в секундах либо None - без ограничения
+        """
+        ttl = cls.__TTL[CacheKeyClass.ITEM]
+
+        if not ttl:
+            return None
+
+        return 2 * (ttl + int(ttl * CACHE_TTL_JITTER))
+
+    @classmethod
+    def not_found(cls) -> int | None:
+        """
+        Метод возвращает время жизни маркера отсутствующей в БД записи (без надбавки - маркер живет недолго)
+        :return: время жизни в секундах либо None - отсутствие записей не кэшируется
+        """
+        return CACHE_NOT_FOUND_TTL or None
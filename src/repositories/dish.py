@@ -1,10 +1,47 @@
-from sqlalchemy import delete, select, update
+from sqlalchemy import RowMapping, Select, delete, insert, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.dish import Dish
-from src.schemas.dish import DishInOptionalSchema, DishInSchema
+from src.models.submenu import Submenu
+from src.schemas.dish import DishBatchInSchema, DishInOptionalSchema, DishInSchema
 from src.schemas.parser.dish import DishParserSchema
 
+# id меню блюда (коррелированный подзапрос для RETURNING)
+_DISH_MENU_ID = (
+    select(Submenu.menu_id)
+    .where(Submenu.id == Dish.submenu_id)
+    .scalar_subquery()
+    .label('menu_id')
+)
+
+
+def _dish_as_dict(row: RowMapping) -> dict:
+    """
+    Преобразование строки запроса с блюдом в словарь (аналогично Dish.as_dict())
+    :param row: строка запроса с данными блюда, ценой со скидкой и id меню
+    :return: словарь с данными
+    """
+    dish_dict = dict(row)
+    dish_dict['id'] = str(dish_dict['id'])
+    dish_dict['submenu_id'] = str(dish_dict['submenu_id'])
+    dish_dict['menu_id'] = str(dish_dict['menu_id'])
+    dish_dict['price'] = str(dish_dict['price'])
+
+    return dish_dict
+
+
+def _filter_by_menu(query: Select, menu_id: str | None) -> Select:
+    """
+    Ограничение выборки блюд блюдами переданного меню
+    :param query: запрос с выборкой блюд
+    :param menu_id: id меню (None - без ограничения)
+    :return: запрос
+    """
+    if menu_id:
+        query = query.join(Submenu, Dish.submenu_id == Submenu.id).where(Submenu.menu_id == menu_id)
+
+    return query
+
 
 class DishRepository:
     """
@@ -12,14 +49,28 @@ class DishRepository:
     """
 
     @classmethod
-    async def get_list(cls, submenu_id: str, session: AsyncSession) -> list[Dish]:
+    async def get_list(
+        cls,
+        submenu_id: str,
+        session: AsyncSession,
+        limit: int | None = None,
+        after: str | None = None,
+        menu_id: str | None = None,
+    ) -> list[Dish]:
         """
         Метод возвращает список с блюдами из БД
         :param submenu_id: id подменю, к которому относятся блюда
         :param session: объект асинхронной сессии для запросов к БД
-        :return: список с блюдами
+        :param limit: максимальное кол-во блюд (None - без ограничения)
+        :param after: id блюда, после которого начинается выборка (keyset-пагинация по id)
+        :param menu_id: id меню, к которому должно относиться подменю (None - без проверки)
+        :return: список с блюдами, отсортированный по id
         """
-        query = select(Dish).where(Dish.submenu_id == submenu_id)
+        query = select(Dish).where(Dish.submenu_id == submenu_id).order_by(Dish.id).limit(limit)
+        query = _filter_by_menu(query, menu_id=menu_id)
+
+        if after:
+            query = query.where(Dish.id > after)
         res = await session.execute(query)
         dishes_list = res.scalars().all()
 
@@ -28,13 +79,13 @@ class DishRepository:
     @classmethod
     async def create(
         cls, submenu_id: str, new_dish: DishInSchema | DishParserSchema, session: AsyncSession
-    ) -> Dish:
+    ) -> dict | None:
         """
         Метод создает и возвращает новое блюдо из БД
         :param submenu_id: id подменю, к которому относится блюдо
         :param new_dish: параметры для сохранения нового блюда
         :param session: объект асинхронной сессии для запросов к БД
-        :return: объект нового блюда
+        :return: словарь с данными нового блюда и id его меню либо None, если подменю не найдено
         """
         try:
             discount = new_dish.discount
@@ -42,60 +93,205 @@ class DishRepository:
         except AttributeError:
             discount = 0
 
-        dish = Dish(
-            title=new_dish.title,
-            description=new_dish.description,
-            price=new_dish.price,
-            discount=discount,
-            submenu_id=submenu_id,
+        # INSERT ... SELECT - запись добавляется только при наличии подменю (проверка и вставка в одном запросе),
+        # RETURNING в CTE - данные новой записи с ценой со скидкой и id меню возвращаются тем же запросом
+        # (в RETURNING самого INSERT подзапрос к подменю не коррелируется с новой записью)
+        inserted = (
+            insert(Dish)
+            .from_select(
+                ['title', 'description', 'price', 'discount', 'submenu_id'],
+                select(
+                    literal(new_dish.title),
+                    literal(new_dish.description),
+                    literal(new_dish.price),
+                    literal(discount),
+                    Submenu.id,
+                )
+                .where(Submenu.id == submenu_id),
+            )
+            .returning(
+                Dish.id,
+                Dish.title,
+                Dish.description,
+                Dish.discount_price.label('price'),
+                Dish.submenu_id,
+            )
+            .cte('inserted')
         )
-
-        session.add(dish)
+        query = select(inserted, Submenu.menu_id).join(Submenu, Submenu.id == inserted.c.submenu_id)
+        res = await session.execute(query)
+        row = res.mappings().one_or_none()
         await session.commit()
 
-        return dish
+        return _dish_as_dict(row) if row else None
 
     @classmethod
-    async def get(cls, dish_id: str, session: AsyncSession) -> Dish:
+    async def get(
+        cls, dish_id: str, session: AsyncSession, submenu_id: str | None = None, menu_id: str | None = None
+    ) -> Dish:
         """
         Метод возвращает блюдо из БД по переданному id
         :param dish_id: id блюда для поиска
         :param session: объект асинхронной сессии для запросов к БД
+        :param submenu_id: id подменю, к которому должно относиться блюдо (None - без проверки)
+        :param menu_id: id меню, к которому должно относиться блюдо (None - без проверки)
         :return: объект блюда либо None
         """
-        query = select(Dish).where(Dish.id == dish_id)
+        query = _filter_by_menu(select(Dish).where(Dish.id == dish_id), menu_id=menu_id)
+
+        if submenu_id:
+            query = query.where(Dish.submenu_id == submenu_id)
         submenu = await session.execute(query)
 
         return submenu.scalar_one_or_none()
 
+    @classmethod
+    async def get_many(cls, dishes_ids: list[str], session: AsyncSession) -> list[dict]:
+        """
+        Метод возвращает несколько блюд любых меню и подменю из БД одним запросом
+        :param dishes_ids: список id блюд для поиска
+        :param session: объект асинхронной сессии для запросов к БД
+        :return: список словарей с данными найденных блюд и id их меню
+        """
+        query = (
+            select(Dish, Submenu.menu_id)
+            .join(Submenu, Dish.submenu_id == Submenu.id)
+            .where(Dish.id.in_(dishes_ids))
+        )
+        res = await session.execute(query)
+
+        return [{**dish.as_dict(), 'menu_id': str(menu_id)} for dish, menu_id in res.all()]
+
     @classmethod
     async def update(
         cls, dish_id: str, data: DishInOptionalSchema, session: AsyncSession
-    ) -> None:
+    ) -> dict | None:
         """
         Метод обновляет блюдо в БД по переданному id
         :param dish_id: id блюда для обновления
         :param data: параметры для сохранения нового блюда
         :param session: объект асинхронной сессии для запросов к БД
-        :return: None
+        :return: словарь с обновленными данными блюда и id его меню либо None, если блюдо не найдено
         """
         # model_dump(exclude_unset=True) - распаковывает явно переданные поля в patch-запросе
+        # RETURNING - итоговое состояние записи и id меню возвращаются тем же запросом (populate_existing
+        # обновляет объект блюда, если он уже загружен в сессию)
         query = (
             update(Dish)
             .where(Dish.id == dish_id)
             .values(data.model_dump(exclude_unset=True))
+            .returning(Dish, _DISH_MENU_ID)
+            .execution_options(synchronize_session=False, populate_existing=True)
         )
-        await session.execute(query)
+        res = await session.execute(query)
+        row = res.one_or_none()
         await session.commit()
 
+        if not row:
+            return None
+
+        dish, menu_id = row
+
+        return {**dish.as_dict(), 'menu_id': str(menu_id)}
+
     @classmethod
-    async def delete(cls, dish_id: str, session: AsyncSession) -> None:
+    async def delete(cls, dish_id: str, session: AsyncSession) -> dict | None:
         """
         Метод удаляет блюдо из БД по переданному id
         :param dish_id: id блюда для поиска
         :param session: объект асинхронной сессии для запросов к БД
-        :return: None
+        :return: словарь с id удаленного блюда, его подменю и меню либо None, если блюдо не найдено
         """
-        query = delete(Dish).where(Dish.id == dish_id)
-        await session.execute(query)
+        query = (
+            delete(Dish)
+            .where(Dish.id == dish_id)
+            .returning(Dish.id, Dish.submenu_id, _DISH_MENU_ID)
+            .execution_options(synchronize_session=False)
+        )
+        res = await session.execute(query)
+        row = res.mappings().one_or_none()
         await session.commit()
+
+        if not row:
+            return None
+
+        return {
+            'dish_id': str(row['id']),
+            'submenu_id': str(row['submenu_id']),
+            'menu_id': str(row['menu_id']),
+        }
+
+    @classmethod
+    async def apply_batch(cls, submenu_id: str, batch: DishBatchInSchema, session: AsyncSession) -> dict | None:
+        """
+        Метод создает, обновляет и удаляет блюда подменю в одной транзакции (по одному запросу на операцию)
+        :param submenu_id: id подменю, к которому относятся блюда
+        :param batch: блюда для создания, обновления и удаления
+        :param session: объект асинхронной сессии для запросов к БД
+        :return: словарь с созданными, обновленными и удаленными блюдами и id меню подменю
+            либо None, если подменю или какое-либо из блюд не найдено (изменения не применяются)
+        """
+        query = select(Submenu.menu_id).where(Submenu.id == submenu_id)
+        menu_id = await session.scalar(query)
+
+        if not menu_id:
+            return None
+
+        updated_ids = [dish.id for dish in batch.update]
+        changed_ids = updated_ids + batch.delete
+
+        if changed_ids:
+            # Блокируем изменяемые блюда до конца транзакции и проверяем, что все они относятся к подменю
+            query = (
+                select(Dish.id)
+                .where(Dish.id.in_(changed_ids), Dish.submenu_id == submenu_id)
+                .with_for_update()
+            )
+            res = await session.scalars(query)
+
+            if len(res.all()) != len(changed_ids):
+                await session.rollback()
+                return None
+
+        created = []
+        updated = []
+
+        if batch.create:
+            # Многострочный INSERT ... RETURNING
+            res = await session.scalars(
+                insert(Dish).returning(Dish),
+                [{**dish.model_dump(), 'submenu_id': submenu_id} for dish in batch.create],
+            )
+            created = list(res.all())
+
+        if batch.update:
+            values = [
+                {'id': dish.id, **dish.model_dump(exclude_unset=True, exclude={'id'})} for dish in batch.update
+            ]
+            values = [dish for dish in values if len(dish) > 1]
+
+            if values:
+                # Bulk UPDATE по первичному ключу (executemany, принадлежность блюд подменю проверена выше)
+                await session.execute(update(Dish), values)
+
+            query = (
+                select(Dish)
+                .where(Dish.id.in_(updated_ids))
+                .order_by(Dish.id)
+                .execution_options(populate_existing=True)
+            )
+            res = await session.scalars(query)
+            updated = list(res.all())
+
+        if batch.delete:
+            query = delete(Dish).where(Dish.id.in_(batch.delete)).execution_options(synchronize_session=False)
+            await session.execute(query)
+
+        await session.commit()
+
+        return {
+            'menu_id': str(menu_id),
+            'created': created,
+            'updated': updated,
+            'deleted': [str(dish_id) for dish_id in batch.delete],
+        }
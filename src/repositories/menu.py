@@ -1,4 +1,4 @@
-from sqlalchemy import insert, select, update
+from sqlalchemy import RowMapping, delete, insert, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
@@ -7,6 +7,29 @@ from src.models.submenu import Submenu
 from src.schemas.base import BaseInOptionalSchema, BaseInSchema
 
 
+def _menu_as_dict(row: RowMapping) -> dict:
+    """
+    Преобразование строки запроса с меню в словарь (аналогично Menu.as_dict())
+    :param row: строка запроса с данными меню и кол-вом подменю и блюд
+    :return: словарь с данными
+    """
+    menu_dict = dict(row)
+    menu_dict['id'] = str(menu_dict['id'])
+
+    return menu_dict
+
+
+# Данные меню с кол-вом подменю и блюд, подсчитанным на стороне БД (коррелированные подзапросы по индексам
+# внешних ключей - стоимость пропорциональна кол-ву выбранных меню, а не размеру таблиц подменю и блюд)
+_MENU_WITH_COUNTS_COLUMNS = (
+    Menu.id,
+    Menu.title,
+    Menu.description,
+    Menu.submenus_count.label('submenus_count'),
+    Menu.dishes_count.label('dishes_count'),
+)
+
+
 class MenuRepository:
     """
     Получение списка меню, создания, обновление и удаления меню из БД
@@ -29,22 +52,51 @@ class MenuRepository:
         return list(menus_list)
 
     @classmethod
-    async def create(cls, new_menu: BaseInSchema, session: AsyncSession) -> str:
+    async def get_list_with_counts(
+        cls, session: AsyncSession, limit: int | None = None, after: str | None = None
+    ) -> list[dict]:
+        """
+        Метод возвращает список меню с кол-вом подменю и блюд, подсчитанным на стороне БД
+        (без загрузки связанных подменю и блюд)
+        :param session: объект асинхронной сессии для запросов к БД
+        :param limit: максимальное кол-во меню (None - без ограничения)
+        :param after: id меню, после которого начинается выборка (keyset-пагинация по id)
+        :return: список словарей с данными меню, отсортированный по id
         """
-        Метод создает и возвращает id нового меню из БД
+        query = select(*_MENU_WITH_COUNTS_COLUMNS).order_by(Menu.id).limit(limit)
+
+        if after:
+            query = query.where(Menu.id > after)
+
+        res = await session.execute(query)
+
+        return [_menu_as_dict(row) for row in res.mappings()]
+
+    @classmethod
+    async def create(cls, new_menu: BaseInSchema, session: AsyncSession) -> dict:
+        """
+        Метод создает и возвращает новое меню из БД
         :param new_menu: параметры для сохранения нового меню
         :param session: объект асинхронной сессии для запросов к БД
-        :return: id созданного меню
+        :return: словарь с данными созданного меню
         """
-        query = insert(Menu).values(
-            title=new_menu.title, description=new_menu.description
+        # RETURNING - данные новой записи возвращаются тем же запросом, у нового меню еще нет подменю и блюд
+        query = (
+            insert(Menu)
+            .values(title=new_menu.title, description=new_menu.description)
+            .returning(
+                Menu.id,
+                Menu.title,
+                Menu.description,
+                literal(0).label('submenus_count'),
+                literal(0).label('dishes_count'),
+            )
         )
-
         res = await session.execute(query)
+        menu = _menu_as_dict(res.mappings().one())
         await session.commit()
 
-        # Возвращаем id новой записи
-        return str(res.inserted_primary_key[0])
+        return menu
 
     @classmethod
     async def get(cls, menu_id: str, session: AsyncSession) -> Menu:
@@ -65,39 +117,80 @@ class MenuRepository:
 
         return menu
 
+    @classmethod
+    async def get_with_counts(cls, menu_id: str, session: AsyncSession) -> dict | None:
+        """
+        Метод возвращает данные по меню с кол-вом подменю и блюд, подсчитанным на стороне БД
+        (без загрузки связанных подменю и блюд)
+        :param menu_id: id меню для поиска в БД
+        :param session: объект асинхронной сессии для запросов к БД
+        :return: словарь с данными меню либо None
+        """
+        query = select(*_MENU_WITH_COUNTS_COLUMNS).where(Menu.id == menu_id)
+        res = await session.execute(query)
+        row = res.mappings().one_or_none()
+
+        return _menu_as_dict(row) if row else None
+
+    @classmethod
+    async def get_many_with_counts(cls, menus_ids: list[str], session: AsyncSession) -> list[dict]:
+        """
+        Метод возвращает данные по нескольким меню с кол-вом подменю и блюд одним запросом
+        :param menus_ids: список id меню для поиска в БД
+        :param session: объект асинхронной сессии для запросов к БД
+        :return: список словарей с данными найденных меню
+        """
+        query = select(*_MENU_WITH_COUNTS_COLUMNS).where(Menu.id.in_(menus_ids))
+        res = await session.execute(query)
+
+        return [_menu_as_dict(row) for row in res.mappings().all()]
+
     @classmethod
     async def update(
         cls, menu_id: str, data: BaseInOptionalSchema, session: AsyncSession
-    ) -> None:
+    ) -> dict | None:
         """
         Метод обновляет данные меню в БД по переданному id
         :param menu_id: id меню
         :param data: новые параметры для меню
         :param session: объект асинхронной сессии для запросов к БД
-        :return: None
+        :return: словарь с обновленными данными меню либо None, если меню не найдено
         """
         # model_dump(exclude_unset=True) - распаковывает явно переданные поля в patch-запросе
+        # RETURNING - итоговое состояние записи (вместе с кол-вом подменю и блюд) возвращается тем же запросом
         query = (
             update(Menu)
             .where(Menu.id == menu_id)
             .values(data.model_dump(exclude_unset=True))
+            .returning(*_MENU_WITH_COUNTS_COLUMNS)
+            .execution_options(synchronize_session=False)
         )
-        await session.execute(query)
+        res = await session.execute(query)
+        row = res.mappings().one_or_none()
         await session.commit()
 
+        return _menu_as_dict(row) if row else None
+
     @classmethod
-    async def delete(cls, delete_menu: Menu, session: AsyncSession) -> None:
+    async def delete(cls, menu_id: str, session: AsyncSession) -> dict | None:
         """
         Метод удаляет меню из БД по переданному id
-        :param delete_menu: объект меню для удаления
+        :param menu_id: id меню для удаления
         :param session: объект асинхронной сессии для запросов к БД
-        :return: None
+        :return: словарь с id удаленного меню либо None, если меню не найдено
         """
-        # Каскадное удаление связанных дочерних записей возможно только через session.delete()
-        # а не через delete().where()
-        await session.delete(delete_menu)
+        # Связанные подменю и блюда удаляются каскадно на стороне БД (ON DELETE CASCADE) в рамках одного запроса
+        query = (
+            delete(Menu)
+            .where(Menu.id == menu_id)
+            .returning(Menu.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted_id = await session.scalar(query)
         await session.commit()
 
+        return {'menu_id': str(deleted_id)} if deleted_id else None
+
 
 class MenuListRepository:
     """
@@ -107,14 +200,15 @@ class MenuListRepository:
     # TODO Переместить метод вывода списка сюда и проверить везде корректную работы
 
     @classmethod
-    async def delete_list(cls, session: AsyncSession) -> None:
+    async def delete_list(cls, session: AsyncSession) -> list[dict]:
         """
         Метод удаляет из БД все меню
         :param session: объект асинхронной сессии для запросов к БД
-        :return: None
+        :return: список словарей с id удаленных меню
         """
-        menus = await MenuRepository.get_list(session=session)
+        query = delete(Menu).returning(Menu.id).execution_options(synchronize_session=False)
+        res = await session.scalars(query)
+        deleted = [{'menu_id': str(menu_id)} for menu_id in res.all()]
+        await session.commit()
 
-        for menu in menus:
-            await session.delete(menu)
-            await session.commit()
+        return deleted
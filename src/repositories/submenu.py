@@ -1,11 +1,35 @@
-from sqlalchemy import insert, select, update
+from sqlalchemy import RowMapping, delete, insert, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
+from src.models.menu import Menu
 from src.models.submenu import Submenu
 from src.schemas.base import BaseInOptionalSchema, BaseInSchema
 
 
+def _submenu_as_dict(row: RowMapping) -> dict:
+    """
+    Преобразование строки запроса с подменю в словарь (аналогично Submenu.as_dict())
+    :param row: строка запроса с данными подменю и кол-вом блюд
+    :return: словарь с данными
+    """
+    submenu_dict = dict(row)
+    submenu_dict['id'] = str(submenu_dict['id'])
+    submenu_dict['menu_id'] = str(submenu_dict['menu_id'])
+
+    return submenu_dict
+
+
+# Данные подменю с кол-вом блюд, подсчитанным на стороне БД (коррелированный подзапрос по индексу внешнего ключа)
+_SUBMENU_WITH_COUNTS_COLUMNS = (
+    Submenu.id,
+    Submenu.title,
+    Submenu.description,
+    Submenu.menu_id,
+    Submenu.dishes_count.label('dishes_count'),
+)
+
+
 class SubmenuRepository:
     """
     Получение списка подменю, создания, обновление и удаления подменю из БД
@@ -30,27 +54,65 @@ class SubmenuRepository:
 
         return list(submenu_list)
 
+    @classmethod
+    async def get_list_with_counts(
+        cls, menu_id: str, session: AsyncSession, limit: int | None = None, after: str | None = None
+    ) -> list[dict]:
+        """
+        Метод возвращает список подменю с кол-вом блюд, подсчитанным на стороне БД (без загрузки блюд)
+        :param menu_id: id меню, к которому относится подменю
+        :param session: объект асинхронной сессии для запросов к БД
+        :param limit: максимальное кол-во подменю (None - без ограничения)
+        :param after: id подменю, после которого начинается выборка (keyset-пагинация по id)
+        :return: список словарей с данными подменю, отсортированный по id
+        """
+        query = (
+            select(*_SUBMENU_WITH_COUNTS_COLUMNS)
+            .where(Submenu.menu_id == menu_id)
+            .order_by(Submenu.id)
+            .limit(limit)
+        )
+
+        if after:
+            query = query.where(Submenu.id > after)
+
+        res = await session.execute(query)
+
+        return [_submenu_as_dict(row) for row in res.mappings()]
+
     @classmethod
     async def create(
         cls, menu_id: str, new_submenu: BaseInSchema, session: AsyncSession
-    ) -> str:
+    ) -> dict | None:
         """
-        Метод создает и возвращает id нового подменю из БД
+        Метод создает и возвращает новое подменю из БД
         :param menu_id: id меню, к которому относится подменю
         :param new_sybmenu: параметры для сохранения нового подменю
         :param session: объект асинхронной сессии для запросов к БД
-        :return: id нового подменю
+        :return: словарь с данными нового подменю либо None, если меню не найдено
         """
-        query = insert(Submenu).values(
-            title=new_submenu.title,
-            description=new_submenu.description,
-            menu_id=menu_id,
+        # INSERT ... SELECT - запись добавляется только при наличии меню (проверка и вставка в одном запросе),
+        # RETURNING - данные новой записи возвращаются тем же запросом, у нового подменю еще нет блюд
+        query = (
+            insert(Submenu)
+            .from_select(
+                ['title', 'description', 'menu_id'],
+                select(literal(new_submenu.title), literal(new_submenu.description), Menu.id)
+                .where(Menu.id == menu_id),
+            )
+            .returning(
+                Submenu.id,
+                Submenu.title,
+                Submenu.description,
+                Submenu.menu_id,
+                literal(0).label('dishes_count'),
+            )
         )
         res = await session.execute(query)
+        row = res.mappings().one_or_none()
         await session.commit()
 
-        # Возвращаем id новой записи
-        return str(res.inserted_primary_key[0])
+        return _submenu_as_dict(row) if row else None
 
     @classmethod
     async def get(cls, submenu_id: str, session: AsyncSession) -> Submenu:
@@ -70,35 +132,94 @@ class SubmenuRepository:
 
         return submenu
 
+    @classmethod
+    async def get_with_counts(
+        cls, submenu_id: str, session: AsyncSession, menu_id: str | None = None
+    ) -> dict | None:
+        """
+        Метод возвращает данные по подменю с кол-вом блюд, подсчитанным на стороне БД (без загрузки блюд)
+        :param submenu_id: id подменю для поиска в БД
+        :param session: объект асинхронной сессии для запросов к БД
+        :param menu_id: id меню, к которому должно относиться подменю (None - без проверки)
+        :return: словарь с данными подменю либо None
+        """
+        query = select(*_SUBMENU_WITH_COUNTS_COLUMNS).where(Submenu.id == submenu_id)
+
+        if menu_id:
+            query = query.where(Submenu.menu_id == menu_id)
+        res = await session.execute(query)
+        row = res.mappings().one_or_none()
+
+        return _submenu_as_dict(row) if row else None
+
+    @classmethod
+    async def get_many_with_counts(
+        cls, submenus_ids: list[str], session: AsyncSession, menu_id: str | None = None
+    ) -> list[dict]:
+        """
+        Метод возвращает данные по нескольким подменю с кол-вом блюд одним запросом
+        :param submenus_ids: список id подменю для поиска в БД
+        :param session: объект асинхронной сессии для запросов к БД
+        :param menu_id: id меню, к которому должны относиться подменю (None - без проверки)
+        :return: список словарей с данными найденных подменю
+        """
+        query = select(*_SUBMENU_WITH_COUNTS_COLUMNS).where(Submenu.id.in_(submenus_ids))
+
+        if menu_id:
+            query = query.where(Submenu.menu_id == menu_id)
+        res = await session.execute(query)
+
+        return [_submenu_as_dict(row) for row in res.mappings().all()]
+
     @classmethod
     async def update(
         cls, submenu_id: str, data: BaseInOptionalSchema, session: AsyncSession
-    ) -> None:
+    ) -> dict | None:
         """
         Метод обновляет данные подменю в БД по переданному id
         :param submenu_id: id подменю
         :param data: параметры для сохранения нового подменю
         :param session: объект асинхронной сессии для запросов к БД
-        :return: None
+        :return: словарь с обновленными данными подменю либо None, если подменю не найдено
         """
         # model_dump(exclude_unset=True) - распаковывает явно переданные поля в patch-запросе
+        # RETURNING - итоговое состояние записи (вместе с кол-вом блюд) возвращается тем же запросом
         query = (
             update(Submenu)
             .where(Submenu.id == submenu_id)
             .values(data.model_dump(exclude_unset=True))
+            .returning(*_SUBMENU_WITH_COUNTS_COLUMNS)
+            .execution_options(synchronize_session=False)
         )
-        await session.execute(query)
+        res = await session.execute(query)
+        row = res.mappings().one_or_none()
         await session.commit()
 
+        return _submenu_as_dict(row) if row else None
+
     @classmethod
-    async def delete(cls, delete_submenu: Submenu, session: AsyncSession) -> None:
+    async def delete(cls, submenu_id: str, session: AsyncSession) -> dict | None:
         """
         Метод удаляет подменю из БД по переданному id
-        :param delete_submenu: объект подменю для удаления
+        :param submenu_id: id подменю для удаления
         :param session: объект асинхронной сессии для запросов к БД
-        :return: None
+        :return: словарь с id удаленного подменю и его меню либо None, если подменю не найдено
         """
-        # Каскадное удаление связанных дочерних записей возможно только через session.delete(),
-        # а не через delete().where()
-        await session.delete(delete_submenu)
+        # Блюда подменю удаляются каскадно на стороне БД (ON DELETE CASCADE)
+        query = (
+            delete(Submenu)
+            .where(Submenu.id == submenu_id)
+            .returning(Submenu.id, Submenu.menu_id)
+            .execution_options(synchronize_session=False)
+        )
+        res = await session.execute(query)
+        row = res.mappings().one_or_none()
         await session.commit()
+
+        if not row:
+            return None
+
+        return {
+            'submenu_id': str(row['id']),
+            'menu_id': str(row['menu_id']),
+        }
@@ -9,3 +9,23 @@ class APIMenuRouter(APIRouter):
     def __init__(self, *args, **kwargs):
         self.prefix = '/api/v1/menus'
         super().__init__(*args, **kwargs, prefix=self.prefix)
+
+
+class APIStatsRouter(APIRouter):
+    """
+    Модель описывает базовый URL и версию API для вывода служебной статистики
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.prefix = '/api/v1/stats'
+        super().__init__(*args, **kwargs, prefix=self.prefix)
+
+
+class APIBatchRouter(APIRouter):
+    """
+    Модель описывает базовый URL и версию API для пакетного вывода меню, подменю и блюд по списку id
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.prefix = '/api/v1/batch'
+        super().__init__(*args, **kwargs, prefix=self.prefix)
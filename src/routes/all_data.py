@@ -1,10 +1,11 @@
-from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Header, Response
 
-from src.database import get_async_session
+from src.repositories.cache.edge import EdgeCache, EdgeRoute
 from src.routes.abc_route import APIMenuRouter
 from src.schemas.menu import MenuWithSubmenusOutSchema
 from src.services.all_data import AllDataService
+from src.utils.etag import ETAG_HEADER, etag_matches, make_etag, not_modified
+from src.utils.serialization import JSON_MEDIA_TYPE
 
 router = APIMenuRouter(tags=['all data'])
 
@@ -17,12 +18,23 @@ router = APIMenuRouter(tags=['all data'])
     },
 )
 async def get_all_data(
-    session: AsyncSession = Depends(get_async_session),
+    if_none_match: str | None = Header(None),
 ):
     """
-    Роут для вывода всех меню со всеми связанными подменю и со всеми связанными блюдами
+    Роут для вывода всех меню со всеми связанными подменю и со всеми связанными блюдами (меню отсортированы по id)
+    (при совпадении If-None-Match с ETag кэшированных данных - 304 без запроса к БД)
     """
+    edge_headers = EdgeCache.headers(EdgeRoute.ALL_DATA, EdgeCache.ALL_DATA)
+    etag = await AllDataService.get_all_data_etag()
 
-    menu_list = await AllDataService.get_all_data(session=session)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, headers=edge_headers)
 
-    return menu_list
+    # json-документ собирается в БД и кэшируется целиком, поэтому возвращаем его без повторной сериализации
+    menu_list = await AllDataService.get_all_data()
+
+    return Response(
+        content=menu_list,
+        media_type=JSON_MEDIA_TYPE,
+        headers={**edge_headers, ETAG_HEADER: etag or make_etag(menu_list)},
+    )
@@ -0,0 +1,106 @@
+from uuid import UUID
+
+from fastapi import Depends, Header, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_async_session
+from src.repositories.cache.edge import EdgeCache, EdgeRoute
+from src.routes.abc_route import APIBatchRouter
+from src.schemas.dish import DishOutSchema
+from src.schemas.menu import MenuOutSchema
+from src.schemas.submenu import SubmenuOutSchema
+from src.services.dish import DishService
+from src.services.menu import MenuService
+from src.services.submenu import SubmenuService
+from src.utils.etag import ETAG_HEADER, etag_matches, make_etag, not_modified
+from src.utils.pagination import MAX_PAGE_LIMIT
+from src.utils.serialization import JSON_MEDIA_TYPE
+
+router = APIBatchRouter(tags=['batch'])
+
+
+@router.get(
+    '/menus',
+    response_model=list[MenuOutSchema],
+    responses={
+        200: {'model': list[MenuOutSchema]}
+    },
+)
+async def get_menus_by_ids(
+    ids: list[UUID] = Query(max_length=MAX_PAGE_LIMIT),
+    if_none_match: str | None = Header(None),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Роут для вывода нескольких меню по списку id (ненайденные меню пропускаются)
+    """
+    menus = await MenuService.get_many(menus_ids=[str(menu_id) for menu_id in ids], session=session)
+
+    # Документ собирается из кэша записей, поэтому ETag вычисляется по нему (304 экономит только передачу тела).
+    # Суррогатный ключ списка очищается при изменении любой записи, поэтому ключи записей не перечисляются
+    edge_headers = EdgeCache.headers(EdgeRoute.MENUS, EdgeCache.MENUS)
+    etag = make_etag(menus)
+
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, headers=edge_headers)
+
+    return Response(content=menus, media_type=JSON_MEDIA_TYPE, headers={**edge_headers, ETAG_HEADER: etag})
+
+
+@router.get(
+    '/submenus',
+    response_model=list[SubmenuOutSchema],
+    responses={
+        200: {'model': list[SubmenuOutSchema]}
+    },
+)
+async def get_submenus_by_ids(
+    menu_id: UUID,
+    ids: list[UUID] = Query(max_length=MAX_PAGE_LIMIT),
+    if_none_match: str | None = Header(None),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Роут для вывода нескольких подменю меню по списку id (ненайденные в меню подменю пропускаются)
+    """
+    submenus = await SubmenuService.get_many(
+        menu_id=str(menu_id), submenus_ids=[str(submenu_id) for submenu_id in ids], session=session
+    )
+
+    edge_headers = EdgeCache.headers(
+        EdgeRoute.SUBMENUS, EdgeCache.menu_tree(menu_id=str(menu_id)), EdgeCache.submenus(menu_id=str(menu_id))
+    )
+    etag = make_etag(submenus)
+
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, headers=edge_headers)
+
+    return Response(content=submenus, media_type=JSON_MEDIA_TYPE, headers={**edge_headers, ETAG_HEADER: etag})
+
+
+@router.get(
+    '/dishes',
+    response_model=list[DishOutSchema],
+    responses={
+        200: {'model': list[DishOutSchema]}
+    },
+)
+async def get_dishes_by_ids(
+    ids: list[UUID] = Query(max_length=MAX_PAGE_LIMIT),
+    if_none_match: str | None = Header(None),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Роут для вывода нескольких блюд любых меню и подменю по списку id (ненайденные блюда пропускаются)
+    """
+    dishes = await DishService.get_many(dishes_ids=[str(dish_id) for dish_id in ids], session=session)
+
+    # Блюда могут относиться к разным меню, поэтому используется суррогатный ключ всех данных: он очищается
+    # при изменении любого меню, подменю и блюда
+    edge_headers = EdgeCache.headers(EdgeRoute.DISHES, EdgeCache.ALL_DATA)
+    etag = make_etag(dishes)
+
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, headers=edge_headers)
+
+    return Response(content=dishes, media_type=JSON_MEDIA_TYPE, headers={**edge_headers, ETAG_HEADER: etag})
@@ -2,15 +2,30 @@ from http import HTTPStatus
 from typing import Union
 from uuid import UUID
 
-from fastapi import BackgroundTasks, Depends
+from fastapi import BackgroundTasks, Depends, Header, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_async_session
+from src.repositories.cache.edge import EdgeCache, EdgeRoute
 from src.routes.abc_route import APIMenuRouter
-from src.schemas.dish import DishInOptionalSchema, DishInSchema, DishOutSchema
+from src.schemas.dish import (
+    DishBatchInSchema,
+    DishBatchOutSchema,
+    DishInOptionalSchema,
+    DishInSchema,
+    DishOutSchema,
+)
 from src.schemas.response import ResponseForDeleteSchema, ResponseSchema
 from src.services.dish import DishService
+from src.utils.etag import ETAG_HEADER, etag_matches, make_etag, not_modified
 from src.utils.exceptions import CustomApiException
+from src.utils.pagination import (
+    MAX_PAGE_LIMIT,
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+)
+from src.utils.serialization import JSON_MEDIA_TYPE
 
 router = APIMenuRouter(tags=['dish'])
 
@@ -23,15 +38,45 @@ router = APIMenuRouter(tags=['dish'])
     },
 )
 async def get_dishes_list(
+    menu_id: UUID,
     submenu_id: UUID,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: str | None = None,
+    if_none_match: str | None = Header(None),
     session: AsyncSession = Depends(get_async_session),
 ):
     """
-    Роут для вывода списка с блюдами
+    Роут для вывода списка с блюдами, отсортированного по id (при передаче limit - постранично, курсор
+    следующей страницы возвращается в заголовке X-Next-Cursor; при совпадении If-None-Match с ETag кэшированной
+    страницы - 304)
     """
-    dishes_list = await DishService.get_dishes_list(submenu_id=str(submenu_id), session=session)
+    try:
+        after = decode_cursor(cursor) if cursor else None
+
+    except ValueError:
+        raise CustomApiException(status_code=HTTPStatus.BAD_REQUEST, detail='invalid cursor')
+
+    edge_headers = EdgeCache.headers(
+        EdgeRoute.DISHES, EdgeCache.menu_tree(menu_id=str(menu_id)), EdgeCache.dishes(submenu_id=str(submenu_id))
+    )
+    etag = await DishService.get_dishes_list_etag(
+        menu_id=str(menu_id), submenu_id=str(submenu_id), limit=limit, after=after
+    )
+
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, headers=edge_headers)
+
+    dishes_list, next_after = await DishService.get_dishes_list(
+        menu_id=str(menu_id), submenu_id=str(submenu_id), session=session, limit=limit, after=after
+    )
+
+    response = Response(content=dishes_list, media_type=JSON_MEDIA_TYPE, headers=edge_headers)
+    response.headers[ETAG_HEADER] = etag or make_etag(dishes_list)
 
-    return dishes_list
+    if next_after:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(next_after)
+
+    return response
 
 
 @router.post(
@@ -66,6 +111,38 @@ async def create_dish(
     return dish
 
 
+@router.post(
+    '/{menu_id}/submenus/{submenu_id}/dishes/batch',
+    response_model=Union[DishBatchOutSchema, ResponseSchema],
+    responses={
+        200: {'model': DishBatchOutSchema},
+        404: {'model': ResponseSchema},
+    },
+)
+async def batch_dishes(
+    submenu_id: UUID,
+    batch: DishBatchInSchema,
+    background_tasks: BackgroundTasks,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Роут для пакетного создания, обновления и удаления блюд подменю в одной транзакции
+    """
+    res = await DishService.apply_batch(
+        submenu_id=str(submenu_id),
+        batch=batch,
+        background_tasks=background_tasks,
+        session=session
+    )
+
+    if not res:
+        raise CustomApiException(
+            status_code=HTTPStatus.NOT_FOUND, detail='submenu or dish not found'
+        )
+
+    return res
+
+
 @router.get(
     '/{menu_id}/submenus/{submenu_id}/dishes/{dish_id}',
     response_model=Union[DishOutSchema, ResponseSchema],
@@ -75,18 +152,33 @@ async def create_dish(
     },
 )
 async def get_dish(
+    menu_id: UUID,
+    submenu_id: UUID,
     dish_id: UUID,
+    if_none_match: str | None = Header(None),
     session: AsyncSession = Depends(get_async_session),
 ):
     """
-    Роут для вывода блюда по id
+    Роут для вывода блюда по id (при совпадении If-None-Match с ETag кэшированного блюда - 304 без запроса к БД)
     """
-    dish = await DishService.get(dish_id=str(dish_id), session=session)
+    edge_headers = EdgeCache.headers(
+        EdgeRoute.DISH, EdgeCache.menu_tree(menu_id=str(menu_id)), EdgeCache.dish(dish_id=str(dish_id))
+    )
+    etag = await DishService.get_etag(menu_id=str(menu_id), submenu_id=str(submenu_id), dish_id=str(dish_id))
+
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, headers=edge_headers)
+
+    dish = await DishService.get(
+        menu_id=str(menu_id), submenu_id=str(submenu_id), dish_id=str(dish_id), session=session
+    )
 
     if not dish:
         raise CustomApiException(status_code=HTTPStatus.NOT_FOUND, detail='dish not found')
 
-    return dish
+    return Response(
+        content=dish, media_type=JSON_MEDIA_TYPE, headers={**edge_headers, ETAG_HEADER: etag or make_etag(dish)}
+    )
 
 
 @router.patch(
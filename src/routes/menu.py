@@ -2,16 +2,25 @@ from http import HTTPStatus
 from typing import Union
 from uuid import UUID
 
-from fastapi import BackgroundTasks, Depends
+from fastapi import BackgroundTasks, Depends, Header, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_async_session
+from src.repositories.cache.edge import EdgeCache, EdgeRoute
 from src.routes.abc_route import APIMenuRouter
 from src.schemas.base import BaseInOptionalSchema, BaseInSchema
 from src.schemas.menu import MenuOutSchema
 from src.schemas.response import ResponseForDeleteSchema, ResponseSchema
 from src.services.menu import MenuService
+from src.utils.etag import ETAG_HEADER, etag_matches, make_etag, not_modified
 from src.utils.exceptions import CustomApiException
+from src.utils.pagination import (
+    MAX_PAGE_LIMIT,
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+)
+from src.utils.serialization import JSON_MEDIA_TYPE
 
 router = APIMenuRouter(tags=['menu'])
 
@@ -24,14 +33,35 @@ router = APIMenuRouter(tags=['menu'])
     },
 )
 async def get_menu_list(
-    session: AsyncSession = Depends(get_async_session),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: str | None = None,
+    if_none_match: str | None = Header(None),
 ):
     """
-    Роут для вывода списка меню
+    Роут для вывода списка меню, отсортированного по id (при передаче limit - постранично, курсор следующей страницы
+    возвращается в заголовке X-Next-Cursor; при совпадении If-None-Match с ETag кэшированной страницы - 304)
     """
-    menu_list = await MenuService.get_menus_list(session=session)
+    try:
+        after = decode_cursor(cursor) if cursor else None
+
+    except ValueError:
+        raise CustomApiException(status_code=HTTPStatus.BAD_REQUEST, detail='invalid cursor')
+
+    edge_headers = EdgeCache.headers(EdgeRoute.MENUS, EdgeCache.MENUS)
+    etag = await MenuService.get_menus_list_etag(limit=limit, after=after)
+
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, headers=edge_headers)
+
+    menu_list, next_after = await MenuService.get_menus_list(limit=limit, after=after)
 
-    return menu_list
+    response = Response(content=menu_list, media_type=JSON_MEDIA_TYPE, headers=edge_headers)
+    response.headers[ETAG_HEADER] = etag or make_etag(menu_list)
+
+    if next_after:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(next_after)
+
+    return response
 
 
 @router.post(
@@ -65,17 +95,28 @@ async def create_menu(
 )
 async def get_menu(
     menu_id: UUID,
+    if_none_match: str | None = Header(None),
     session: AsyncSession = Depends(get_async_session),
 ):
     """
-    Роут для вывода меню по id
+    Роут для вывода меню по id (при совпадении If-None-Match с ETag кэшированного меню - 304 без запроса к БД)
     """
+    # ETag читается до документа: если запись обновится между чтениями, новый документ получит прежний ETag
+    # и будет запрошен повторно, но устаревший документ не получит ETag новой версии
+    edge_headers = EdgeCache.headers(EdgeRoute.MENU, EdgeCache.menu(menu_id=str(menu_id)))
+    etag = await MenuService.get_etag(menu_id=str(menu_id))
+
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, headers=edge_headers)
+
     menu = await MenuService.get(menu_id=str(menu_id), session=session)
 
     if not menu:
         raise CustomApiException(status_code=HTTPStatus.NOT_FOUND, detail='menu not found')
 
-    return menu
+    return Response(
+        content=menu, media_type=JSON_MEDIA_TYPE, headers={**edge_headers, ETAG_HEADER: etag or make_etag(menu)}
+    )
 
 
 @router.patch(
@@ -0,0 +1,92 @@
+from src.routes.abc_route import APIStatsRouter
+from src.schemas.stats import (
+    CacheBreakerStatsSchema,
+    CacheCodecStatsSchema,
+    CacheOperationStatsSchema,
+    DbPoolStatsSchema,
+)
+from src.services.stats import StatsService
+
+router = APIStatsRouter(tags=['stats'])
+
+
+@router.get(
+    '/db_pool',
+    response_model=DbPoolStatsSchema,
+    responses={
+        200: {'model': DbPoolStatsSchema}
+    },
+)
+async def get_db_pool_stats():
+    """
+    Роут для вывода статистики пула соединений с БД
+    """
+    stats = await StatsService.get_db_pool_stats()
+
+    return stats
+
+
+@router.get(
+    '/cache_codec',
+    response_model=dict[str, CacheCodecStatsSchema],
+    responses={
+        200: {'model': dict[str, CacheCodecStatsSchema]}
+    },
+)
+async def get_cache_codec_stats():
+    """
+    Роут для вывода статистики кодирования значений кэша (размеры до и после сжатия, время сжатия и распаковки)
+    """
+    stats = await StatsService.get_cache_codec_stats()
+
+    return stats
+
+
+@router.get(
+    '/cache_keys',
+    response_model=dict[str, int],
+    responses={
+        200: {'model': dict[str, int]}
+    },
+)
+async def get_cache_keys_stats():
+    """
+    Роут для вывода кол-ва ключей кэша по классам (данные, страницы списков, записи, служебные ключи)
+    """
+    stats = await StatsService.get_cache_keys_stats()
+
+    return stats
+
+
+@router.get(
+    '/cache',
+    response_model=list[CacheOperationStatsSchema],
+    responses={
+        200: {'model': list[CacheOperationStatsSchema]}
+    },
+)
+async def get_cache_stats():
+    """
+    Роут для вывода статистики операций репозиториев кэша (вызовы, попадания и промахи, объем документов,
+    гистограмма времени выполнения)
+    """
+    stats = await StatsService.get_cache_stats()
+
+    return stats
+
+
+@router.get(
+    '/cache_breaker',
+    response_model=CacheBreakerStatsSchema,
+    responses={
+        200: {'model': CacheBreakerStatsSchema}
+    },
+)
+async def get_cache_breaker_stats():
+    """
+    Роут для вывода состояния автоматического выключателя кэша (состояние, ошибки Redis подряд, кол-во размыканий
+    и операций, выполненных без Redis)
+    """
+    stats = await StatsService.get_cache_breaker_stats()
+
+    return stats
@@ -2,16 +2,25 @@ from http import HTTPStatus
 from typing import Union
 from uuid import UUID
 
-from fastapi import BackgroundTasks, Depends
+from fastapi import BackgroundTasks, Depends, Header, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_async_session
+from src.repositories.cache.edge import EdgeCache, EdgeRoute
 from src.routes.abc_route import APIMenuRouter
 from src.schemas.base import BaseInOptionalSchema, BaseInSchema
 from src.schemas.response import ResponseForDeleteSchema, ResponseSchema
 from src.schemas.submenu import SubmenuOutSchema
 from src.services.submenu import SubmenuService
+from src.utils.etag import ETAG_HEADER, etag_matches, make_etag, not_modified
 from src.utils.exceptions import CustomApiException
+from src.utils.pagination import (
+    MAX_PAGE_LIMIT,
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+)
+from src.utils.serialization import JSON_MEDIA_TYPE
 
 router = APIMenuRouter(tags=['submenu'])
 
@@ -25,14 +34,40 @@ router = APIMenuRouter(tags=['submenu'])
 )
 async def get_submenus_list(
     menu_id: UUID,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: str | None = None,
+    if_none_match: str | None = Header(None),
     session: AsyncSession = Depends(get_async_session),
 ):
     """
-    Роут для вывода списка подменю
+    Роут для вывода списка подменю, отсортированного по id (при передаче limit - постранично, курсор следующей страницы
+    возвращается в заголовке X-Next-Cursor; при совпадении If-None-Match с ETag кэшированной страницы - 304)
     """
-    submenu_list = await SubmenuService.get_submenus_list(menu_id=str(menu_id), session=session)
+    try:
+        after = decode_cursor(cursor) if cursor else None
+
+    except ValueError:
+        raise CustomApiException(status_code=HTTPStatus.BAD_REQUEST, detail='invalid cursor')
+
+    edge_headers = EdgeCache.headers(
+        EdgeRoute.SUBMENUS, EdgeCache.menu_tree(menu_id=str(menu_id)), EdgeCache.submenus(menu_id=str(menu_id))
+    )
+    etag = await SubmenuService.get_submenus_list_etag(menu_id=str(menu_id), limit=limit, after=after)
+
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, headers=edge_headers)
+
+    submenu_list, next_after = await SubmenuService.get_submenus_list(
+        menu_id=str(menu_id), session=session, limit=limit, after=after
+    )
+
+    response = Response(content=submenu_list, media_type=JSON_MEDIA_TYPE, headers=edge_headers)
+    response.headers[ETAG_HEADER] = etag or make_etag(submenu_list)
 
-    return submenu_list
+    if next_after:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(next_after)
+
+    return response
 
 
 @router.post(
@@ -76,20 +111,32 @@ async def create_submenu(
     },
 )
 async def get_submenu(
+    menu_id: UUID,
     submenu_id: UUID,
+    if_none_match: str | None = Header(None),
     session: AsyncSession = Depends(get_async_session),
 ):
     """
-    Роут для вывода подменю по id
+    Роут для вывода подменю по id (при совпадении If-None-Match с ETag кэшированного подменю - 304 без запроса к БД)
     """
-    submenu = await SubmenuService.get(submenu_id=str(submenu_id), session=session)
+    edge_headers = EdgeCache.headers(
+        EdgeRoute.SUBMENU, EdgeCache.menu_tree(menu_id=str(menu_id)), EdgeCache.submenu(submenu_id=str(submenu_id))
+    )
+    etag = await SubmenuService.get_etag(menu_id=str(menu_id), submenu_id=str(submenu_id))
+
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, headers=edge_headers)
+
+    submenu = await SubmenuService.get(menu_id=str(menu_id), submenu_id=str(submenu_id), session=session)
 
     if not submenu:
         raise CustomApiException(
             status_code=HTTPStatus.NOT_FOUND, detail='submenu not found'
         )
 
-    return submenu
+    return Response(
+        content=submenu, media_type=JSON_MEDIA_TYPE, headers={**edge_headers, ETAG_HEADER: etag or make_etag(submenu)}
+    )
 
 
 @router.patch(
@@ -1,6 +1,7 @@
 from typing import Any
+from uuid import UUID
 
-from pydantic import field_validator, model_validator
+from pydantic import BaseModel, field_validator, model_validator
 
 from src.models.dish import Dish
 from src.schemas.base import BaseInSchema, BaseOutSchema
@@ -43,3 +44,43 @@ class DishOutSchema(BaseOutSchema):
             data.price = data.discount_price
 
         return data
+
+
+class DishBatchUpdateSchema(DishInOptionalSchema):
+    """
+    Схема для обновления блюда в пакетной операции (поля не обязательные, кроме id)
+    """
+
+    id: UUID
+
+
+class DishBatchInSchema(BaseModel):
+    """
+    Схема для пакетного создания, обновления и удаления блюд подменю
+    """
+
+    create: list[DishInSchema] = []
+    update: list[DishBatchUpdateSchema] = []
+    delete: list[UUID] = []
+
+    @model_validator(mode='after')
+    def check_unique_ids(self) -> 'DishBatchInSchema':
+        """
+        Проверка, что каждое блюдо затрагивается в пакете не более одного раза
+        """
+        ids = [dish.id for dish in self.update] + self.delete
+
+        if len(ids) != len(set(ids)):
+            raise ValueError('Блюдо не может обновляться или удаляться в пакете несколько раз')
+
+        return self
+
+
+class DishBatchOutSchema(BaseModel):
+    """
+    Схема для вывода результата пакетной операции с блюдами
+    """
+
+    created: list[DishOutSchema]
+    updated: list[DishOutSchema]
+    deleted: list[UUID]
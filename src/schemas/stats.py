@@ -0,0 +1,59 @@
+from pydantic import BaseModel
+
+
+class DbPoolStatsSchema(BaseModel):
+    """
+    Схема для вывода статистики пула соединений с БД
+    """
+
+    pool_size: int
+    max_overflow: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_time_total: float
+    wait_time_max: float
+
+
+class CacheCodecStatsSchema(BaseModel):
+    """
+    Схема для вывода статистики кодирования значений кэша одного класса ключей
+    """
+
+    encoded: int
+    decoded: int
+    raw_bytes: int
+    encoded_bytes: int
+    encode_time_total: float
+    decode_time_total: float
+
+
+class CacheOperationStatsSchema(BaseModel):
+    """
+    Схема для вывода статистики операции репозитория кэша
+    """
+
+    repository: str
+    operation: str
+    calls: int
+    hits: int
+    misses: int
+    not_found: int
+    errors: int
+    bytes: int
+    time_total: float
+    time_max: float
+    latency_buckets: dict[str, int]
+
+
+class CacheBreakerStatsSchema(BaseModel):
+    """
+    Схема для вывода состояния автоматического выключателя кэша
+    """
+
+    state: str
+    failures: int
+    opened: int
+    rejected: int
@@ -1,11 +1,16 @@
+import json
+
 from loguru import logger
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import async_session_maker
-from src.models.menu import Menu
+from src.repositories.all_data import AllDataRepository
 from src.repositories.cache.all_data import AllDataCacheRepository
-from src.repositories.menu import MenuListRepository, MenuRepository
+from src.repositories.cache.edge import EdgeCache
+from src.repositories.cache.single_flight import SingleFlight
+from src.repositories.cache.storage import CacheStorage
+from src.repositories.menu import MenuListRepository
 from src.services.cache.menu import CascadeDeleteCacheMenuService
+from src.utils.serialization import join_json_list
 
 
 class AllDataService:
@@ -14,25 +19,94 @@ class AllDataService:
     """
 
     @classmethod
-    async def get_all_data(cls, session: AsyncSession) -> list[Menu] | None:
+    async def get_all_data_etag(cls) -> str | None:
+        """
+        Метод возвращает ETag кэшированных данных обо всех меню (без запроса к БД)
+        :return: ETag, если данные есть в кэше, иначе None
+        """
+        return await AllDataCacheRepository.get_etag()
+
+    @classmethod
+    async def get_all_data(cls) -> bytes:
         """
         Метод кэширует и возвращает данные об имеющихся меню со всеми связанными данными по подменю и блюдами
-        :param session: объект асинхронной сессии
-        :return: список с меню
+        (при одновременных промахах кэша данные запрашиваются из БД один раз, при наличии устаревшего кэша
+        он отдается сразу, а актуальные данные запрашиваются в фоне)
+        :return: готовый json-документ со списком меню
         """
 
         cache = await AllDataCacheRepository.get_data()
 
         if cache:
-            logger.debug(f'Данные из кэша: {cache}')
+            logger.debug('Данные из кэша')
             return cache
 
-        logger.debug('Запрос данных из БД')
-        menus_list = await MenuRepository.get_list(session=session)
+        stale = await AllDataCacheRepository.get_stale_data()
+
+        if stale:
+            logger.debug('Устаревшие данные из кэша')
+            SingleFlight.refresh(
+                key=AllDataCacheRepository.key(),
+                get_cached=AllDataCacheRepository.get_data,
+                load=cls.__refresh_all_data,
+            )
+            return stale
+
+        return await SingleFlight.run(
+            key=AllDataCacheRepository.key(),
+            get_cached=AllDataCacheRepository.get_data,
+            load=cls.__load_all_data,
+        )
+
+    @classmethod
+    async def __load_all_data(cls) -> bytes:
+        """
+        Метод собирает и кэширует данные обо всех меню, подменю и блюдах из фрагментов с одним меню:
+        фрагменты читаются из кэша одной командой MGET, из БД запрашиваются только отсутствующие в кэше
+        (в собственной сессии - сессия первого из ожидающих пересборку запросов может быть закрыта раньше)
+        :return: готовый json-документ со списком меню
+        """
+        async with async_session_maker() as session:
+            menus_order = await AllDataCacheRepository.get_menus_order()
+            menus_ids = json.loads(menus_order) if menus_order else None
+
+            if menus_ids is None:
+                logger.debug('Запрос списка меню из БД')
+                menus_ids = await AllDataRepository.get_menus_ids(session=session)
+
+            cached = await AllDataCacheRepository.get_fragments(menus_ids=menus_ids)
+            missed = [menu_id for menu_id, fragment in zip(menus_ids, cached) if fragment is None]
+            fragments = {}
+
+            if missed:
+                logger.debug(f'Запрос данных из БД: меню {len(missed)} из {len(menus_ids)}')
+                menus = await AllDataRepository.get_menus_json(session=session, menus_ids=missed)
+                fragments = {menu_id: menu.encode() for menu_id, menu in menus.items()}
+
+        # Меню, удаленное после чтения списка id, пропускается (и не попадает в кэшированный список)
+        documents = {
+            menu_id: fragment or fragments[menu_id]
+            for menu_id, fragment in zip(menus_ids, cached)
+            if fragment is not None or menu_id in fragments
+        }
+        data = join_json_list(list(documents.values()))
+
+        await AllDataCacheRepository.set_data(data=data, menus_ids=list(documents), fragments=fragments)
+
+        return data
+
+    @classmethod
+    async def __refresh_all_data(cls) -> bytes:
+        """
+        Метод пересобирает кэш со всеми данными в фоне
+        :return: готовый json-документ со списком меню
+        """
+        data = await cls.__load_all_data()
 
-        await AllDataCacheRepository.set_data(menus_list=menus_list)
+        # Пока данные пересобирались, CDN мог сохранить устаревшие данные
+        await EdgeCache.purge(EdgeCache.ALL_DATA)
 
-        return menus_list
+        return data
 
     @classmethod
     async def delete_all_data(cls) -> None:
@@ -44,17 +118,20 @@ class AllDataService:
 
         async with async_session_maker() as session:
 
-            # Получаем все меню из БД
-            menus = await MenuRepository.get_list(session=session)
+            # Удаление всех меню (подменю и блюда удаляются каскадно в БД)
+            deleted = await MenuListRepository.delete_list(session=session)
 
-            # Удалить кэш со всеми данными
-            await AllDataCacheRepository.delete_data()
+            # Удалить кэш со всеми данными и каскадно для каждого меню, вложенного подменю и блюда
+            # (ключи всех меню очищаются и поколения кэша меню меняются одной пакетной командой)
+            keys = [AllDataCacheRepository.key(), AllDataCacheRepository.menus_key()]
+            generations, surrogate_keys = [], [EdgeCache.ALL_DATA]
 
-            # Удалить кэш каскадно для каждого меню, вложенного подменю и блюда
-            for menu in menus:
-                await CascadeDeleteCacheMenuService.delete_menu(menu=menu)
+            for deleted_menu in deleted:
+                keys.extend(CascadeDeleteCacheMenuService.keys(**deleted_menu))
+                generations.extend(CascadeDeleteCacheMenuService.generations(**deleted_menu))
+                surrogate_keys.extend(CascadeDeleteCacheMenuService.surrogate_keys(**deleted_menu))
 
-            # Удаление всех меню
-            await MenuListRepository.delete_list(session=session)
+            await CacheStorage.delete(*keys, generations=generations)
+            await EdgeCache.purge(*surrogate_keys)
 
             logger.info('БД и кэш очищены')
@@ -1,10 +1,10 @@
-from src.models.dish import Dish
-from src.models.menu import Menu
-from src.models.submenu import Submenu
 from src.repositories.cache.all_data import AllDataCacheRepository
 from src.repositories.cache.dish import DishCacheRepository, DishesListCacheRepository
-from src.services.cache.menu import DeleteCacheMenuService
-from src.services.cache.submenu import DeleteCacheSubmenuService
+from src.repositories.cache.edge import EdgeCache
+from src.repositories.cache.storage import CacheStorage
+from src.schemas.dish import DishOutSchema
+from src.services.cache.menu import CascadeDeleteCacheMenuService, DeleteCacheMenuService
+from src.utils.serialization import dump_json
 
 
 class DeleteCacheDishService:
@@ -13,15 +13,58 @@ class DeleteCacheDishService:
     """
 
     @classmethod
-    async def delete_dish(cls, dish: Dish) -> None:
+    async def keys(cls, dish_id: str, submenu_id: str, menu_id: str) -> list[str]:
+        """
+        Метод возвращает ключи кэша текущего поколения, которые очищаются при изменении блюда
+        :param dish_id: id блюда
+        :param submenu_id: id подменю, в котором находится блюдо
+        :param menu_id: id меню, в котором находится блюдо
+        :return: список ключей
+        """
+        return [
+            await DishesListCacheRepository.key(menu_id=menu_id, submenu_id=submenu_id),
+            await DishCacheRepository.key(menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id),
+            AllDataCacheRepository.key(),
+            AllDataCacheRepository.fragment_key(menu_id=menu_id),
+        ]
+
+    @classmethod
+    def surrogate_keys(cls, dish_id: str, submenu_id: str) -> list[str]:
+        """
+        Метод возвращает суррогатные ключи кэша CDN, которые очищаются при изменении блюда
+        :param dish_id: id блюда
+        :param submenu_id: id подменю, в котором находится блюдо
+        :return: список суррогатных ключей
+        """
+        return [EdgeCache.dishes(submenu_id=submenu_id), EdgeCache.dish(dish_id=dish_id), EdgeCache.ALL_DATA]
+
+    @classmethod
+    async def delete_dish(cls, dish_id: str, submenu_id: str, menu_id: str) -> None:
         """
         Метод очищает кэш списка блюд и конкретного блюда
-        :param menu: удаляемое блюдо
+        :param dish_id: id удаляемого блюда
+        :param submenu_id: id подменю, в котором находится блюдо
+        :param menu_id: id меню, в котором находится блюдо
         :return: None
         """
-        await DishesListCacheRepository.delete_list(submenu_id=dish.submenu_id)
-        await DishCacheRepository.delete(dish_id=dish.id)
-        await AllDataCacheRepository.delete_data()
+        await CacheStorage.delete(*await cls.keys(dish_id=dish_id, submenu_id=submenu_id, menu_id=menu_id))
+        await EdgeCache.purge(*cls.surrogate_keys(dish_id=dish_id, submenu_id=submenu_id))
+
+    @classmethod
+    async def update_dish(cls, menu_id: str, dish: dict) -> None:
+        """
+        Метод перезаписывает кэш обновленного блюда и очищает кэш списка блюд и всех данных
+        :param menu_id: id меню, в котором находится блюдо
+        :param dish: словарь с обновленными данными блюда
+        :return: None
+        """
+        key = await DishCacheRepository.key(menu_id=menu_id, submenu_id=dish['submenu_id'], dish_id=dish['id'])
+
+        await CacheStorage.write_through(
+            {key: dump_json(DishOutSchema, dish)},
+            *await cls.keys(dish_id=dish['id'], submenu_id=dish['submenu_id'], menu_id=menu_id),
+        )
+        await EdgeCache.purge(*cls.surrogate_keys(dish_id=dish['id'], submenu_id=dish['submenu_id']))
 
 
 class CascadeDeleteCacheDishService(DeleteCacheDishService):
@@ -30,16 +73,26 @@ class CascadeDeleteCacheDishService(DeleteCacheDishService):
     """
 
     @classmethod
-    async def delete_dish(cls, dish: Dish, menu: Menu | None = None, submenu: Submenu | None = None) -> None:
+    async def delete_dishes(cls, menu_id: str) -> None:
         """
-        Метод для каскадного удаления кэша связанных записей меню и подменю при удалении блюда
-        :param dish: удаляемое блюдо
-        :param submenu: подменю, в котором находится блюдо
-        :param menu: меню, в котором находится блюдо
-        :return:
+        Метод однократно очищает кэш всех записей меню, затронутых созданием, удалением или пакетным
+        изменением блюд (ключи меню очищаются и поколение кэша меню меняется одной пакетной командой)
+        :param menu_id: id меню, в котором находятся блюда
+        :return: None
         """
-        await super().delete_dish(dish=dish)
+        await CacheStorage.delete(
+            *DeleteCacheMenuService.keys(menu_id=menu_id),
+            generations=CascadeDeleteCacheMenuService.generations(menu_id=menu_id),
+        )
+        await EdgeCache.purge(*CascadeDeleteCacheMenuService.surrogate_keys(menu_id=menu_id))
 
-        if menu and submenu:
-            await DeleteCacheSubmenuService.delete_submenu(submenu=submenu)
-            await DeleteCacheMenuService.delete_menu(menu=menu)
+    @classmethod
+    async def delete_dish(cls, dish_id: str, submenu_id: str, menu_id: str) -> None:
+        """
+        Метод для каскадного удаления кэша связанных записей меню и подменю при удалении блюда
+        :param dish_id: id удаляемого блюда
+        :param submenu_id: id подменю, в котором находится блюдо
+        :param menu_id: id меню, в котором находится блюдо
+        :return: None
+        """
+        await cls.delete_dishes(menu_id=menu_id)
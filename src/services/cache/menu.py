@@ -1,11 +1,13 @@
-from src.models.menu import Menu
 from src.repositories.cache.all_data import AllDataCacheRepository
-from src.repositories.cache.dish import DishCacheRepository, DishesListCacheRepository
-from src.repositories.cache.menu import MenuCacheRepository, MenusListCacheRepository
-from src.repositories.cache.submenu import (
-    SubmenuCacheRepository,
-    SubmenusListCacheRepository,
+from src.repositories.cache.edge import EdgeCache
+from src.repositories.cache.menu import (
+    MenuCacheRepository,
+    MenuGenerationCacheRepository,
+    MenusListCacheRepository,
 )
+from src.repositories.cache.storage import CacheStorage
+from src.schemas.menu import MenuOutSchema
+from src.utils.serialization import dump_json
 
 
 class DeleteCacheMenuService:
@@ -14,15 +16,52 @@ class DeleteCacheMenuService:
     """
 
     @classmethod
-    async def delete_menu(cls, menu: Menu) -> None:
+    def keys(cls, menu_id: str) -> list[str]:
         """
-        Метод очищает кэш списка меню и конкретного меню
-        :param menu: удаляемое меню
+        Метод возвращает ключи кэша, которые очищаются при изменении меню, его подменю и блюд
+        (порядок меню во всех данных при этом не меняется и очищается только при создании и удалении меню)
+        :param menu_id: id меню
+        :return: список ключей
+        """
+        return [
+            MenusListCacheRepository.key(),
+            MenuCacheRepository.key(menu_id=menu_id),
+            AllDataCacheRepository.key(),
+            AllDataCacheRepository.fragment_key(menu_id=menu_id),
+        ]
+
+    @classmethod
+    def surrogate_keys(cls, menu_id: str) -> list[str]:
+        """
+        Метод возвращает суррогатные ключи кэша CDN, которые очищаются при изменении меню
+        :param menu_id: id меню
+        :return: список суррогатных ключей
+        """
+        return [EdgeCache.MENUS, EdgeCache.menu(menu_id=menu_id), EdgeCache.ALL_DATA]
+
+    @classmethod
+    async def delete_menu(cls, menu_id: str) -> None:
+        """
+        Метод очищает кэш списка меню, конкретного меню и порядок меню во всех данных
+        (используется при создании и удалении меню)
+        :param menu_id: id удаляемого меню
+        :return: None
+        """
+        await CacheStorage.delete(*cls.keys(menu_id=menu_id), AllDataCacheRepository.menus_key())
+        await EdgeCache.purge(*cls.surrogate_keys(menu_id=menu_id))
+
+    @classmethod
+    async def update_menu(cls, menu: dict) -> None:
+        """
+        Метод перезаписывает кэш обновленного меню и очищает кэш списка меню и всех данных
+        :param menu: словарь с обновленными данными меню
         :return: None
         """
-        await MenusListCacheRepository.delete_list()
-        await MenuCacheRepository.delete(menu_id=menu.id)
-        await AllDataCacheRepository.delete_data()
+        await CacheStorage.write_through(
+            {MenuCacheRepository.key(menu_id=menu['id']): dump_json(MenuOutSchema, menu)},
+            *cls.keys(menu_id=menu['id']),
+        )
+        await EdgeCache.purge(*cls.surrogate_keys(menu_id=menu['id']))
 
 
 class CascadeDeleteCacheMenuService(DeleteCacheMenuService):
@@ -31,22 +70,36 @@ class CascadeDeleteCacheMenuService(DeleteCacheMenuService):
     """
 
     @classmethod
-    async def delete_menu(cls, menu: Menu) -> None:
+    def generations(cls, menu_id: str) -> list[str]:
         """
-        Метод каскадно очищает кэш для всех подменю и блюд, относящихся к удаляемому меню
-        :param menu: удаляемое меню
-        :return: None
+        Метод возвращает ключи счетчиков поколений кэша, которые увеличиваются при каскадной очистке
+        (записи о подменю и блюдах меню очищаются сменой поколения, без перечисления их ключей)
+        :param menu_id: id меню
+        :return: список ключей счетчиков
         """
-        await super().delete_menu(menu=menu)
-
-        # Очистка кэша списка подменю и всех подменю, которые относятся к удаляемому меню
-        await SubmenusListCacheRepository.delete_list(menu_id=menu.id)
+        return [MenuGenerationCacheRepository.key(menu_id=menu_id)]
 
-        for submenu in menu.submenus:
-            await SubmenuCacheRepository.delete(submenu_id=submenu.id)
-
-            # Очистка кэша списка блюд и всех блюд, которые относятся к удаляемому подменю
-            await DishesListCacheRepository.delete_list(submenu_id=submenu.id)
+    @classmethod
+    def surrogate_keys(cls, menu_id: str) -> list[str]:
+        """
+        Метод возвращает суррогатные ключи кэша CDN, которые очищаются при каскадной очистке
+        (ключ поддерева меню соответствует смене поколения кэша меню)
+        :param menu_id: id меню
+        :return: список суррогатных ключей
+        """
+        return [*super().surrogate_keys(menu_id=menu_id), EdgeCache.menu_tree(menu_id=menu_id)]
 
-            for dish in submenu.dishes:
-                await DishCacheRepository.delete(dish_id=dish.id)
+    @classmethod
+    async def delete_menu(cls, menu_id: str) -> None:
+        """
+        Метод каскадно очищает кэш для всех подменю и блюд, относящихся к удаляемому меню
+        (ключи меню очищаются и поколение кэша меню меняется одной пакетной командой)
+        :param menu_id: id удаляемого меню
+        :return: None
+        """
+        await CacheStorage.delete(
+            *cls.keys(menu_id=menu_id),
+            AllDataCacheRepository.menus_key(),
+            generations=cls.generations(menu_id=menu_id),
+        )
+        await EdgeCache.purge(*cls.surrogate_keys(menu_id=menu_id))
@@ -0,0 +1,122 @@
+import json
+
+from loguru import logger
+
+from src.config import CACHE_PREWARM_CHUNK
+from src.database import async_session_maker
+from src.repositories.all_data import AllDataRepository
+from src.repositories.cache.all_data import AllDataCacheRepository
+from src.repositories.cache.dish import DishCacheRepository, DishesListCacheRepository
+from src.repositories.cache.edge import EdgeCache
+from src.repositories.cache.menu import (
+    MenuCacheRepository,
+    MenuGenerationCacheRepository,
+    MenusListCacheRepository,
+)
+from src.repositories.cache.storage import CacheStorage
+from src.repositories.cache.submenu import SubmenuCacheRepository, SubmenusListCacheRepository
+from src.schemas.dish import DishOutSchema
+from src.schemas.menu import MenuOutSchema
+from src.schemas.submenu import SubmenuOutSchema
+from src.utils.serialization import dump_json, join_json_list
+
+
+class PrewarmCacheService:
+    """
+    Класс используется для заполнения кэша всеми меню, подменю и блюдами после синхронизации БД с exel-файлом,
+    чтобы первые запросы после синхронизации не обращались к БД
+    """
+
+    @classmethod
+    async def prewarm(cls) -> None:
+        """
+        Метод читает из БД все данные одним запросом, формирует json-документы записей и полных списков
+        и записывает их в кэш частями по CACHE_PREWARM_CHUNK записей, затем очищает кэш CDN.
+        Если часть не записана (Redis недоступен либо не ответил вовремя), заполнение прерывается с ошибкой в логе:
+        незаписанные записи были очищены при синхронизации и пересобираются из БД при первом запросе
+        :return: None
+        """
+        async with async_session_maker() as session:
+            fragments = {
+                menu_id: menu.encode()
+                for menu_id, menu in (await AllDataRepository.get_menus_json(session=session)).items()
+            }
+
+        menus = [json.loads(fragment) for fragment in fragments.values()]
+        prefixes = await MenuGenerationCacheRepository.prefixes([menu['id'] for menu in menus])
+
+        items = {
+            AllDataCacheRepository.key(): join_json_list(list(fragments.values())),
+            AllDataCacheRepository.menus_key(): json.dumps(list(fragments)).encode(),
+            **{AllDataCacheRepository.fragment_key(menu_id=menu_id): menu for menu_id, menu in fragments.items()},
+        }
+        pages = {}
+        menus_documents = []
+
+        for menu in menus:
+            menu_id, prefix = menu['id'], prefixes[menu['id']]
+            menu_document = dump_json(MenuOutSchema, menu)
+            menus_documents.append(menu_document)
+            items[MenuCacheRepository.key(menu_id=menu_id)] = menu_document
+            submenus_documents = []
+
+            for submenu in sorted(menu['submenus'], key=lambda submenu: submenu['id']):
+                submenu_id = submenu['id']
+                submenu_document = dump_json(SubmenuOutSchema, submenu)
+                submenus_documents.append(submenu_document)
+                items[await SubmenuCacheRepository.key(menu_id, submenu_id, prefix=prefix)] = submenu_document
+                dishes_documents = []
+
+                # Цена блюда во фрагменте уже со скидкой и округлена так же, как в ответе на запрос блюда
+                for dish in sorted(submenu['dishes'], key=lambda dish: dish['id']):
+                    dish_document = dump_json(DishOutSchema, dish)
+                    dishes_documents.append(dish_document)
+                    items[await DishCacheRepository.key(menu_id, submenu_id, dish['id'], prefix=prefix)] = dish_document
+
+                list_key = await DishesListCacheRepository.key(menu_id, submenu_id, prefix=prefix)
+                pages[list_key] = join_json_list(dishes_documents)
+
+            list_key = await SubmenusListCacheRepository.key(menu_id, prefix=prefix)
+            pages[list_key] = join_json_list(submenus_documents)
+
+        pages[MenusListCacheRepository.key()] = join_json_list(menus_documents)
+
+        filled = await cls.__fill(items=items, pages=pages)
+        await EdgeCache.purge(
+            EdgeCache.ALL_DATA,
+            EdgeCache.MENUS,
+            *(EdgeCache.menu(menu_id=menu['id']) for menu in menus),
+            *(EdgeCache.menu_tree(menu_id=menu['id']) for menu in menus),
+        )
+
+        if filled:
+            logger.debug(f'Кэш заполнен после синхронизации: {len(items)} записей, {len(pages)} списков')
+
+    @classmethod
+    async def __fill(cls, items: dict[str, bytes], pages: dict[str, bytes]) -> bool:
+        """
+        Метод записывает в кэш записи и полные списки частями по CACHE_PREWARM_CHUNK ключей
+        :param items: словарь с ключами и json-документами записей
+        :param pages: словарь с ключами хэшей списков и json-документами полных списков
+        :return: True - записаны все части, иначе False
+        """
+        chunks = [
+            *(({key: items[key] for key in keys}, {}) for keys in cls.__chunks(list(items))),
+            *(({}, {key: pages[key] for key in keys}) for keys in cls.__chunks(list(pages))),
+        ]
+
+        for i, (chunk_items, chunk_pages) in enumerate(chunks):
+            if not await CacheStorage.fill(items=chunk_items, pages=chunk_pages):
+                logger.error(f'Кэш не заполнен после синхронизации: записано частей {i} из {len(chunks)}')
+                return False
+
+        return True
+
+    @classmethod
+    def __chunks(cls, keys: list[str]) -> list[list[str]]:
+        """
+        Метод разбивает ключи на части по CACHE_PREWARM_CHUNK ключей
+        :param keys: ключи
+        :return: список частей
+        """
+        return [keys[i:i + CACHE_PREWARM_CHUNK] for i in range(0, len(keys), CACHE_PREWARM_CHUNK)]
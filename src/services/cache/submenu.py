@@ -1,12 +1,13 @@
-from src.models.menu import Menu
-from src.models.submenu import Submenu
 from src.repositories.cache.all_data import AllDataCacheRepository
-from src.repositories.cache.dish import DishCacheRepository, DishesListCacheRepository
+from src.repositories.cache.edge import EdgeCache
+from src.repositories.cache.storage import CacheStorage
 from src.repositories.cache.submenu import (
     SubmenuCacheRepository,
     SubmenusListCacheRepository,
 )
-from src.services.cache.menu import DeleteCacheMenuService
+from src.schemas.submenu import SubmenuOutSchema
+from src.services.cache.menu import CascadeDeleteCacheMenuService, DeleteCacheMenuService
+from src.utils.serialization import dump_json
 
 
 class DeleteCacheSubmenuService:
@@ -15,15 +16,53 @@ class DeleteCacheSubmenuService:
     """
 
     @classmethod
-    async def delete_submenu(cls, submenu: Submenu) -> None:
+    async def keys(cls, submenu_id: str, menu_id: str) -> list[str]:
+        """
+        Метод возвращает ключи кэша текущего поколения, которые очищаются при изменении подменю
+        :param submenu_id: id подменю
+        :param menu_id: id меню, к которому относится подменю
+        :return: список ключей
+        """
+        return [
+            await SubmenusListCacheRepository.key(menu_id=menu_id),
+            await SubmenuCacheRepository.key(menu_id=menu_id, submenu_id=submenu_id),
+            AllDataCacheRepository.key(),
+            AllDataCacheRepository.fragment_key(menu_id=menu_id),
+        ]
+
+    @classmethod
+    def surrogate_keys(cls, submenu_id: str, menu_id: str) -> list[str]:
+        """
+        Метод возвращает суррогатные ключи кэша CDN, которые очищаются при изменении подменю
+        :param submenu_id: id подменю
+        :param menu_id: id меню, к которому относится подменю
+        :return: список суррогатных ключей
+        """
+        return [EdgeCache.submenus(menu_id=menu_id), EdgeCache.submenu(submenu_id=submenu_id), EdgeCache.ALL_DATA]
+
+    @classmethod
+    async def delete_submenu(cls, submenu_id: str, menu_id: str) -> None:
         """
         Метод очищает кэш списка подменю и конкретного подменю
-        :param submenu: удаляемое подменю
+        :param submenu_id: id удаляемого подменю
+        :param menu_id: id меню, к которому относится подменю
+        :return: None
+        """
+        await CacheStorage.delete(*await cls.keys(submenu_id=submenu_id, menu_id=menu_id))
+        await EdgeCache.purge(*cls.surrogate_keys(submenu_id=submenu_id, menu_id=menu_id))
+
+    @classmethod
+    async def update_submenu(cls, submenu: dict) -> None:
+        """
+        Метод перезаписывает кэш обновленного подменю и очищает кэш списка подменю и всех данных
+        :param submenu: словарь с обновленными данными подменю
         :return: None
         """
-        await SubmenusListCacheRepository.delete_list(menu_id=submenu.menu_id)
-        await SubmenuCacheRepository.delete(submenu_id=submenu.id)
-        await AllDataCacheRepository.delete_data()
+        key = await SubmenuCacheRepository.key(menu_id=submenu['menu_id'], submenu_id=submenu['id'])
+        keys = await cls.keys(submenu_id=submenu['id'], menu_id=submenu['menu_id'])
+
+        await CacheStorage.write_through({key: dump_json(SubmenuOutSchema, submenu)}, *keys)
+        await EdgeCache.purge(*cls.surrogate_keys(submenu_id=submenu['id'], menu_id=submenu['menu_id']))
 
 
 class CascadeDeleteCacheSubmenuService(DeleteCacheSubmenuService):
@@ -32,19 +71,35 @@ class CascadeDeleteCacheSubmenuService(DeleteCacheSubmenuService):
     """
 
     @classmethod
-    async def delete_submenu(cls, submenu: Submenu, menu: Menu | None = None) -> None:
+    async def delete_list(cls, menu_id: str, submenu_id: str) -> None:
         """
-        Метод для каскадного удаления кэша связанных записей меню и блюд при удалении подменю
-        :param menu: меню, к которому относится удаляемое подменю
-        :param submenu: удаляемое подменю
+        Метод очищает кэш списка подменю и меню, к которому относится подменю (используется при создании подменю),
+        и ключ нового подменю (на случай маркера отсутствующей записи)
+        :param menu_id: id меню, к которому относится подменю
+        :param submenu_id: id созданного подменю
         :return: None
         """
-        await super().delete_submenu(submenu=submenu)
-
-        if menu:
-            await DeleteCacheMenuService.delete_menu(menu=menu)
-
-        await DishesListCacheRepository.delete_list(submenu_id=submenu.id)
+        await CacheStorage.delete(
+            *DeleteCacheMenuService.keys(menu_id=menu_id),
+            await SubmenusListCacheRepository.key(menu_id=menu_id),
+            await SubmenuCacheRepository.key(menu_id=menu_id, submenu_id=submenu_id),
+        )
+        await EdgeCache.purge(
+            *DeleteCacheMenuService.surrogate_keys(menu_id=menu_id),
+            *cls.surrogate_keys(submenu_id=submenu_id, menu_id=menu_id),
+        )
 
-        for dish in submenu.dishes:
-            await DishCacheRepository.delete(dish_id=dish.id)
+    @classmethod
+    async def delete_submenu(cls, submenu_id: str, menu_id: str) -> None:
+        """
+        Метод для каскадного удаления кэша связанных записей меню и блюд при удалении подменю
+        (ключи меню очищаются и поколение кэша меню меняется одной пакетной командой)
+        :param submenu_id: id удаляемого подменю
+        :param menu_id: id меню, к которому относится удаляемое подменю
+        :return: None
+        """
+        await CacheStorage.delete(
+            *DeleteCacheMenuService.keys(menu_id=menu_id),
+            generations=CascadeDeleteCacheMenuService.generations(menu_id=menu_id),
+        )
+        await EdgeCache.purge(*CascadeDeleteCacheMenuService.surrogate_keys(menu_id=menu_id))
@@ -2,17 +2,17 @@ from fastapi import BackgroundTasks
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models.dish import Dish
 from src.repositories.cache.dish import DishCacheRepository, DishesListCacheRepository
+from src.repositories.cache.storage import CacheStorage
 from src.repositories.dish import DishRepository
-from src.repositories.menu import MenuRepository
-from src.repositories.submenu import SubmenuRepository
 from src.schemas.base import BaseInOptionalSchema
-from src.schemas.dish import DishInSchema
+from src.schemas.dish import DishBatchInSchema, DishInSchema, DishOutSchema
 from src.services.cache.dish import (
     CascadeDeleteCacheDishService,
     DeleteCacheDishService,
 )
+from src.utils.pagination import split_page
+from src.utils.serialization import dump_json, dump_json_list, join_json_list
 
 
 class DishService:
@@ -21,24 +21,69 @@ class DishService:
     """
 
     @classmethod
-    async def get_dishes_list(cls, submenu_id: str, session: AsyncSession) -> list[Dish] | None:
+    async def get_dishes_list_etag(
+            cls,
+            menu_id: str,
+            submenu_id: str,
+            limit: int | None = None,
+            after: str | None = None
+    ) -> str | None:
         """
-        Метод кэширует и возвращает данные об имеющихся блюдах
+        Метод возвращает ETag кэшированной страницы списка блюд (без запроса к БД)
+        :param menu_id: id меню
+        :param submenu_id: id подменю
+        :param limit: кол-во блюд на странице (None - полный список)
+        :param after: id блюда, после которого начинается страница
+        :return: ETag, если страница есть в кэше, иначе None
+        """
+        return await DishesListCacheRepository.get_list_etag(
+            menu_id=menu_id, submenu_id=submenu_id, limit=limit, after=after
+        )
+
+    @classmethod
+    async def get_dishes_list(
+            cls,
+            menu_id: str,
+            submenu_id: str,
+            session: AsyncSession,
+            limit: int | None = None,
+            after: str | None = None
+    ) -> tuple[bytes, str | None]:
+        """
+        Метод кэширует и возвращает данные об имеющихся блюдах (полный список либо страницу списка)
+        :param menu_id: id меню, к которому относится подменю
         :param submenu_id: id подменю
         :param session: объект асинхронной сессии
-        :return: список с блюдами
+        :param limit: кол-во блюд на странице (None - полный список)
+        :param after: id блюда, после которого начинается страница
+        :return: json-документ со списком блюд и id последнего блюда, если есть следующая страница, иначе None
         """
-        cache = await DishesListCacheRepository.get_list(submenu_id=submenu_id)
+        cache = await DishesListCacheRepository.get_list(
+            menu_id=menu_id, submenu_id=submenu_id, limit=limit, after=after
+        )
 
         if cache:
             logger.debug(f'Данные из кэша: {cache}')
             return cache
 
         logger.debug('Запрос данных из БД')
-        dishes_list = await DishRepository.get_list(submenu_id=submenu_id, session=session)
-        await DishesListCacheRepository.set_list(submenu_id=submenu_id, dishes_list=dishes_list)
+        # Запрашиваем на одну запись больше, чтобы определить наличие следующей страницы
+        dishes_list = await DishRepository.get_list(
+            submenu_id=submenu_id, session=session, limit=limit + 1 if limit else None, after=after, menu_id=menu_id
+        )
+        dishes_list, next_after = split_page(rows=[dish.as_dict() for dish in dishes_list], limit=limit)
+        dishes_list = dump_json_list(DishOutSchema, dishes_list)
+
+        await DishesListCacheRepository.set_list(
+            menu_id=menu_id,
+            submenu_id=submenu_id,
+            dishes_list=dishes_list,
+            next_after=next_after,
+            limit=limit,
+            after=after,
+        )
 
-        return dishes_list
+        return dishes_list, next_after
 
     @classmethod
     async def create(
@@ -47,50 +92,64 @@ class DishService:
             new_dish: DishInSchema,
             background_tasks: BackgroundTasks,
             session: AsyncSession
-    ) -> Dish | bool:
+    ) -> dict | bool:
         """
         Метод создает и возвращает новое блюдо и очищает кэш со списком меню, подменю и блюд
-        :param menu_id: id меню, к которому относится блюдо (не передается ч/з swagger)
         :param submenu_id: id подменю, к которому относится блюдо
         :param new_dish: валидные данные для создания нового блюда
         :param session: объект асинхронной сессии
-        :return: объект нового блюда
+        :return: словарь с данными нового блюда либо False, если подменю не найдено
         """
-        submenu = await SubmenuRepository.get(submenu_id=submenu_id, session=session)
+        # Проверка наличия подменю и создание блюда выполняются одним запросом
+        dish = await DishRepository.create(submenu_id=submenu_id, new_dish=new_dish, session=session)
 
-        if submenu:
-            dish = await DishRepository.create(submenu_id=submenu_id, new_dish=new_dish, session=session)
-            menu = await MenuRepository.get(menu_id=submenu.menu_id, session=session)
-
-            # Обязательно передаем объекты меню и подменю, а не id,
-            # т.к. из них выбираются id связанных записей для корректной очистки кэша!
-            background_tasks.add_task(
-                CascadeDeleteCacheDishService.delete_dish, dish=dish, menu=menu, submenu=submenu
-            )
+        if dish:
+            background_tasks.add_task(CascadeDeleteCacheDishService.delete_dishes, menu_id=dish['menu_id'])
 
             return dish
 
         return False
 
     @classmethod
-    async def get(cls, dish_id: str, session: AsyncSession) -> Dish | dict | None:
+    async def get_etag(cls, menu_id: str, submenu_id: str, dish_id: str) -> str | None:
+        """
+        Метод возвращает ETag кэшированного блюда (без запроса к БД)
+        :param menu_id: id меню
+        :param submenu_id: id подменю
+        :param dish_id: id блюда
+        :return: ETag, если блюдо есть в кэше, иначе None
+        """
+        return await DishCacheRepository.get_etag(menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id)
+
+    @classmethod
+    async def get(cls, menu_id: str, submenu_id: str, dish_id: str, session: AsyncSession) -> bytes | None:
         """
         Метод кэширует данные и возвращает блюдо по переданному id
+        :param menu_id: id меню, к которому относится блюдо
+        :param submenu_id: id подменю, к которому относится блюдо
         :param dish_id: id блюда для поиска
         :param session: объект асинхронной сессии для запросов к БД
-        :return: объект блюда либо None
+        :return: json-документ с данными блюда либо None, если блюдо не найдено в переданных меню и подменю
         """
-        cache = await DishCacheRepository.get(dish_id=dish_id)
+        cache = await DishCacheRepository.get(menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id)
+
+        if cache == CacheStorage.NOT_FOUND:
+            logger.debug(f'Блюдо отсутствует в БД (из кэша): {dish_id}')
+            return None
 
         if cache:
             logger.debug(f'Данные из кэша: {cache}')
             return cache
 
         logger.debug('Запрос данных из БД')
-        dish = await DishRepository.get(dish_id=dish_id, session=session)
+        dish = await DishRepository.get(dish_id=dish_id, session=session, submenu_id=submenu_id, menu_id=menu_id)
 
-        if dish:
-            await DishCacheRepository.set(dish=dish)
+        if not dish:
+            await DishCacheRepository.set_not_found(menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id)
+            return None
+
+        dish = dump_json(DishOutSchema, dish.as_dict())
+        await DishCacheRepository.set(menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id, dish=dish)
 
         return dish
 
@@ -101,19 +160,20 @@ class DishService:
             data: BaseInOptionalSchema,
             background_tasks: BackgroundTasks,
             session: AsyncSession
-    ) -> Dish | bool:
+    ) -> dict | bool:
         """
-        Метод обновляет блюдо по переданному id, очищает кэш со списком меню, подменю и блюд
+        Метод обновляет блюдо по переданному id, перезаписывает кэш блюда и очищает кэш со списком блюд
         :param dish_id: id блюда для обновления
         :param data: данные для обновления блюда
         :param session: объект асинхронной сессии для запросов к БД
-        :return: обновленное блюдо либо None
+        :return: словарь с данными обновленного блюда либо False
         """
-        await DishRepository.update(dish_id=dish_id, data=data, session=session)
-        updated_dish = await DishRepository.get(dish_id=dish_id, session=session)
+        updated_dish = await DishRepository.update(dish_id=dish_id, data=data, session=session)
 
         if updated_dish:
-            background_tasks.add_task(DeleteCacheDishService.delete_dish, dish=updated_dish)
+            background_tasks.add_task(
+                DeleteCacheDishService.update_dish, menu_id=updated_dish.pop('menu_id'), dish=updated_dish
+            )
 
             logger.info('Блюдо обновлено')
             return updated_dish
@@ -131,22 +191,67 @@ class DishService:
         :param session: объект асинхронной сессии для запросов к БД
         :return: True - успешное удаление, иначе False
         """
-        delete_dish = await DishRepository.get(dish_id=dish_id, session=session)
+        deleted = await DishRepository.delete(dish_id=dish_id, session=session)
 
-        if delete_dish:
-            submenu = await SubmenuRepository.get(submenu_id=delete_dish.submenu_id, session=session)
-            menu = await MenuRepository.get(menu_id=submenu.menu_id, session=session)
-
-            # Обязательно передаем объекты меню и подменю, а не id,
-            # т.к. из них выбираются id связанных записей для корректной очистки кэша!
-            background_tasks.add_task(
-                CascadeDeleteCacheDishService.delete_dish, dish=delete_dish, menu=menu, submenu=submenu
-            )
-
-            await DishRepository.delete(dish_id=dish_id, session=session)
+        if deleted:
+            # id связанных подменю и меню возвращаются из БД вместе с удалением для корректной очистки кэша
+            background_tasks.add_task(CascadeDeleteCacheDishService.delete_dish, **deleted)
 
             logger.info('Блюдо удалено')
             return True
 
         logger.error('Блюдо не найдено!')
         return False
+
+    @classmethod
+    async def apply_batch(
+            cls,
+            submenu_id: str,
+            batch: DishBatchInSchema,
+            background_tasks: BackgroundTasks,
+            session: AsyncSession
+    ) -> dict | bool:
+        """
+        Метод применяет пакет операций с блюдами подменю в одной транзакции и однократно очищает кэш
+        :param submenu_id: id подменю, к которому относятся блюда
+        :param batch: блюда для создания, обновления и удаления
+        :param session: объект асинхронной сессии для запросов к БД
+        :return: словарь с созданными, обновленными и удаленными блюдами либо False, если подменю
+            или какое-либо из блюд не найдено
+        """
+        res = await DishRepository.apply_batch(submenu_id=submenu_id, batch=batch, session=session)
+
+        if not res:
+            logger.error('Подменю или блюдо не найдено!')
+            return False
+
+        background_tasks.add_task(CascadeDeleteCacheDishService.delete_dishes, menu_id=res.pop('menu_id'))
+        logger.info('Пакет операций с блюдами применен')
+
+        return res
+
+    @classmethod
+    async def get_many(cls, dishes_ids: list[str], session: AsyncSession) -> bytes:
+        """
+        Метод возвращает блюда любых меню и подменю по списку id (например, блюда корзины): расположение блюд
+        и записи о них читаются из кэша командами MGET, отсутствующие в кэше блюда запрашиваются из БД одним
+        запросом и записываются в кэш вместе с расположением одним пайплайном
+        :param dishes_ids: список id блюд
+        :param session: объект асинхронной сессии для запросов к БД
+        :return: json-документ со списком найденных блюд в порядке переданных id
+        """
+        dishes_ids = list(dict.fromkeys(dishes_ids))
+        locations = await DishCacheRepository.get_locations(dishes_ids=dishes_ids)
+        cache = await DishCacheRepository.get_many(locations=locations)
+        dishes = {dish_id: dish for dish_id, dish in zip(locations, cache) if dish}
+        missed_ids = [dish_id for dish_id in dishes_ids if dish_id not in dishes]
+
+        if missed_ids:
+            logger.debug(f'Запрос данных из БД: {missed_ids}')
+            missed = await DishRepository.get_many(dishes_ids=missed_ids, session=session)
+            locations.update({dish['id']: (dish['menu_id'], dish['submenu_id']) for dish in missed})
+            missed = {dish['id']: dump_json(DishOutSchema, dish) for dish in missed}
+            await DishCacheRepository.set_many(dishes=missed, locations=locations)
+            dishes.update(missed)
+
+        return join_json_list([dishes[dish_id] for dish_id in dishes_ids if dish_id in dishes])
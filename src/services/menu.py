@@ -1,16 +1,23 @@
+from functools import partial
+
 from fastapi import BackgroundTasks
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models.menu import Menu
-from src.repositories.cache.all_data import AllDataCacheRepository
+from src.database import async_session_maker
+from src.repositories.cache.edge import EdgeCache
 from src.repositories.cache.menu import MenuCacheRepository, MenusListCacheRepository
+from src.repositories.cache.single_flight import SingleFlight
+from src.repositories.cache.storage import CacheStorage
 from src.repositories.menu import MenuRepository
 from src.schemas.base import BaseInOptionalSchema, BaseInSchema
+from src.schemas.menu import MenuOutSchema
 from src.services.cache.menu import (
     CascadeDeleteCacheMenuService,
     DeleteCacheMenuService,
 )
+from src.utils.pagination import split_page
+from src.utils.serialization import dump_json, dump_json_list, join_json_list
 
 
 class MenuService:
@@ -19,22 +26,86 @@ class MenuService:
     """
 
     @classmethod
-    async def get_menus_list(cls, session: AsyncSession) -> list[Menu] | None:
+    async def get_menus_list_etag(cls, limit: int | None = None, after: str | None = None) -> str | None:
         """
-        Метод кэширует и возвращает данные об имеющихся меню
-        :param session: объект асинхронной сессии
-        :return: список с меню
+        Метод возвращает ETag кэшированной страницы списка меню (без запроса к БД)
+        :param limit: кол-во меню на странице (None - полный список)
+        :param after: id меню, после которого начинается страница
+        :return: ETag, если страница есть в кэше, иначе None
+        """
+        return await MenusListCacheRepository.get_list_etag(limit=limit, after=after)
+
+    @classmethod
+    async def get_menus_list(cls, limit: int | None = None, after: str | None = None) -> tuple[bytes, str | None]:
+        """
+        Метод кэширует и возвращает данные об имеющихся меню (полный список либо страницу списка).
+        При одновременных промахах кэша страница запрашивается из БД один раз, при наличии устаревшего кэша
+        он отдается сразу, а актуальная страница запрашивается в фоне
+        :param limit: кол-во меню на странице (None - полный список)
+        :param after: id меню, после которого начинается страница
+        :return: json-документ со списком меню и id последнего меню, если есть следующая страница, иначе None
         """
-        cache = await MenusListCacheRepository.get_list()
+        cache = await MenusListCacheRepository.get_list(limit=limit, after=after)
 
         if cache:
             logger.debug(f'Данные из кэша: {cache}')
             return cache
 
+        key = f'{MenusListCacheRepository.key()}:{CacheStorage.page_field(limit=limit, after=after)}'
+        get_cached = partial(MenusListCacheRepository.get_list, limit=limit, after=after)
+        stale = await MenusListCacheRepository.get_stale_list(limit=limit, after=after)
+
+        if stale:
+            logger.debug(f'Устаревшие данные из кэша: {stale}')
+            SingleFlight.refresh(
+                key=key, get_cached=get_cached, load=partial(cls.__refresh_menus_list, limit=limit, after=after)
+            )
+            return stale
+
+        return await SingleFlight.run(
+            key=key,
+            get_cached=get_cached,
+            load=partial(cls.__load_menus_list, limit=limit, after=after),
+        )
+
+    @classmethod
+    async def __load_menus_list(cls, limit: int | None, after: str | None) -> tuple[bytes, str | None]:
+        """
+        Метод запрашивает из БД и кэширует страницу списка меню. Запрос выполняется в собственной сессии:
+        пересборку ожидают несколько запросов, а сессия первого из них закрывается по его завершении или отмене
+        :param limit: кол-во меню на странице (None - полный список)
+        :param after: id меню, после которого начинается страница
+        :return: json-документ со списком меню и id последнего меню, если есть следующая страница, иначе None
+        """
         logger.debug('Запрос данных из БД')
-        menus_list = await MenuRepository.get_list(session=session)
 
-        await MenusListCacheRepository.set_list(menus_list=menus_list)
+        async with async_session_maker() as session:
+            # Запрашиваем на одну запись больше, чтобы определить наличие следующей страницы
+            menus_list = await MenuRepository.get_list_with_counts(
+                session=session, limit=limit + 1 if limit else None, after=after
+            )
+
+        menus_list, next_after = split_page(rows=menus_list, limit=limit)
+        menus_list = dump_json_list(MenuOutSchema, menus_list)
+
+        await MenusListCacheRepository.set_list(
+            menus_list=menus_list, next_after=next_after, limit=limit, after=after
+        )
+
+        return menus_list, next_after
+
+    @classmethod
+    async def __refresh_menus_list(cls, limit: int | None, after: str | None) -> tuple[bytes, str | None]:
+        """
+        Метод пересобирает кэш страницы списка меню в фоне
+        :param limit: кол-во меню на странице (None - полный список)
+        :param after: id меню, после которого начинается страница
+        :return: json-документ со списком меню и id последнего меню, если есть следующая страница, иначе None
+        """
+        menus_list = await cls.__load_menus_list(limit=limit, after=after)
+
+        # Пока список пересобирался, CDN мог сохранить устаревший список
+        await EdgeCache.purge(EdgeCache.MENUS)
 
         return menus_list
 
@@ -44,40 +115,56 @@ class MenuService:
             new_menu: BaseInSchema,
             background_tasks: BackgroundTasks,
             session: AsyncSession
-    ) -> Menu | None:
+    ) -> dict:
         """
         Метод создает и возвращает новое меню, очищает кэш со списком меню
         :param new_menu: валидные данные для создания нового меню
         :param session: объект асинхронной сессии
-        :return: объект нового меню
+        :return: словарь с данными нового меню
         """
-        menu_id = await MenuRepository.create(new_menu=new_menu, session=session)
-        menu = await MenuRepository.get(menu_id=menu_id, session=session)
+        menu = await MenuRepository.create(new_menu=new_menu, session=session)
 
-        background_tasks.add_task(MenusListCacheRepository.delete_list)
-        background_tasks.add_task(AllDataCacheRepository.delete_data)
+        # Ключ нового меню очищается вместе со списками (на случай маркера отсутствующей записи)
+        background_tasks.add_task(DeleteCacheMenuService.delete_menu, menu_id=menu['id'])
 
         return menu
 
     @classmethod
-    async def get(cls, menu_id: str, session: AsyncSession) -> Menu | dict | None:
+    async def get_etag(cls, menu_id: str) -> str | None:
+        """
+        Метод возвращает ETag кэшированного меню (без запроса к БД)
+        :param menu_id: id меню
+        :return: ETag, если меню есть в кэше, иначе None
+        """
+        return await MenuCacheRepository.get_etag(menu_id=menu_id)
+
+    @classmethod
+    async def get(cls, menu_id: str, session: AsyncSession) -> bytes | None:
         """
         Метод кэширует данные и возвращает меню по переданному id
         :param menu_id: id меню для поиска
         :param session: объект асинхронной сессии для запросов к БД
-        :return: объект меню либо None
+        :return: json-документ с данными меню либо None
         """
         cache = await MenuCacheRepository.get(menu_id=menu_id)
 
+        if cache == CacheStorage.NOT_FOUND:
+            logger.debug(f'Меню отсутствует в БД (из кэша): {menu_id}')
+            return None
+
         if cache:
             logger.debug(f'Данные из кэша: {cache}')
             return cache
 
         logger.debug('Запрос данных из БД')
-        menu = await MenuRepository.get(menu_id=menu_id, session=session)
+        menu = await MenuRepository.get_with_counts(menu_id=menu_id, session=session)
+
+        if not menu:
+            await MenuCacheRepository.set_not_found(menu_id=menu_id)
+            return None
 
-        if menu:
-            await MenuCacheRepository.set(menu=menu)
+        menu = dump_json(MenuOutSchema, menu)
+        await MenuCacheRepository.set(menu_id=menu_id, menu=menu)
 
         return menu
 
@@ -88,19 +175,18 @@ class MenuService:
             data: BaseInOptionalSchema,
             background_tasks: BackgroundTasks,
             session: AsyncSession
-    ) -> Menu | bool:
+    ) -> dict | bool:
         """
-        Метод обновляет меню по переданному id, очищает кэш списка меню
+        Метод обновляет меню по переданному id, перезаписывает кэш меню и очищает кэш списка меню
         :param menu_id: id меню для обновления
         :param data: данные для обновления меню
         :param session: объект асинхронной сессии для запросов к БД
-        :return: обновленное меню либо None
+        :return: словарь с обновленными данными меню либо False
         """
-        await MenuRepository.update(menu_id=menu_id, data=data, session=session)
-        update_menu = await MenuRepository.get(menu_id=menu_id, session=session)
+        update_menu = await MenuRepository.update(menu_id=menu_id, data=data, session=session)
 
         if update_menu:
-            background_tasks.add_task(DeleteCacheMenuService.delete_menu, menu=update_menu)
+            background_tasks.add_task(DeleteCacheMenuService.update_menu, menu=update_menu)
 
             logger.info('Меню обновлено')
             return update_menu
@@ -117,13 +203,11 @@ class MenuService:
         :param session: объект асинхронной сессии для запросов к БД
         :return: True - успешное удаление, иначе False
         """
-        delete_menu = await MenuRepository.get(menu_id=menu_id, session=session)
+        deleted = await MenuRepository.delete(menu_id=menu_id, session=session)
 
-        if delete_menu:
+        if deleted:
             # Каскадное удаление кэша для всех связанных записей
-            background_tasks.add_task(CascadeDeleteCacheMenuService.delete_menu, menu=delete_menu)
-
-            await MenuRepository.delete(delete_menu=delete_menu, session=session)
+            background_tasks.add_task(CascadeDeleteCacheMenuService.delete_menu, **deleted)
             logger.info('Меню удалено')
 
             return True
@@ -131,3 +215,26 @@ class MenuService:
         logger.error('Меню не найдено!')
 
         return False
+
+    @classmethod
+    async def get_many(cls, menus_ids: list[str], session: AsyncSession) -> bytes:
+        """
+        Метод возвращает меню по списку id: кэш читается одной командой MGET, отсутствующие в кэше меню
+        запрашиваются из БД одним запросом и записываются в кэш одним пайплайном
+        :param menus_ids: список id меню
+        :param session: объект асинхронной сессии для запросов к БД
+        :return: json-документ со списком найденных меню в порядке переданных id
+        """
+        menus_ids = list(dict.fromkeys(menus_ids))
+        cache = await MenuCacheRepository.get_many(menus_ids=menus_ids)
+        menus = {menu_id: menu for menu_id, menu in zip(menus_ids, cache) if menu}
+        missed_ids = [menu_id for menu_id in menus_ids if menu_id not in menus]
+
+        if missed_ids:
+            logger.debug(f'Запрос данных из БД: {missed_ids}')
+            missed = await MenuRepository.get_many_with_counts(menus_ids=missed_ids, session=session)
+            missed = {menu['id']: dump_json(MenuOutSchema, menu) for menu in missed}
+            await MenuCacheRepository.set_many(menus=missed)
+            menus.update(missed)
+
+        return join_json_list([menus[menu_id] for menu_id in menus_ids if menu_id in menus])
@@ -0,0 +1,51 @@
+from src.database import get_pool_stats
+from src.repositories.cache.breaker import CacheCircuitBreaker
+from src.repositories.cache.codec import CacheCodec
+from src.repositories.cache.metrics import CacheMetrics
+from src.repositories.cache.storage import CacheStorage
+
+
+class StatsService:
+    """
+    Сервис для вывода служебной статистики API
+    """
+
+    @classmethod
+    async def get_db_pool_stats(cls) -> dict:
+        """
+        Метод возвращает статистику пула соединений с БД
+        :return: словарь со статистикой
+        """
+        return get_pool_stats()
+
+    @classmethod
+    async def get_cache_codec_stats(cls) -> dict:
+        """
+        Метод возвращает статистику кодирования значений кэша по классам ключей
+        :return: словарь со статистикой
+        """
+        return CacheCodec.stats()
+
+    @classmethod
+    async def get_cache_keys_stats(cls) -> dict:
+        """
+        Метод возвращает кол-во ключей кэша по классам
+        :return: словарь со статистикой
+        """
+        return await CacheStorage.count_keys()
+
+    @classmethod
+    async def get_cache_stats(cls) -> list[dict]:
+        """
+        Метод возвращает статистику операций репозиториев кэша
+        :return: список словарей со статистикой
+        """
+        return CacheMetrics.stats()
+
+    @classmethod
+    async def get_cache_breaker_stats(cls) -> dict:
+        """
+        Метод возвращает состояние автоматического выключателя кэша
+        :return: словарь со статистикой
+        """
+        return CacheCircuitBreaker.stats()
@@ -2,19 +2,20 @@ from fastapi import BackgroundTasks
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models.submenu import Submenu
+from src.repositories.cache.storage import CacheStorage
 from src.repositories.cache.submenu import (
     SubmenuCacheRepository,
     SubmenusListCacheRepository,
 )
-from src.repositories.menu import MenuRepository
 from src.repositories.submenu import SubmenuRepository
 from src.schemas.base import BaseInOptionalSchema, BaseInSchema
-from src.services.cache.menu import DeleteCacheMenuService
+from src.schemas.submenu import SubmenuOutSchema
 from src.services.cache.submenu import (
     CascadeDeleteCacheSubmenuService,
     DeleteCacheSubmenuService,
 )
+from src.utils.pagination import split_page
+from src.utils.serialization import dump_json, dump_json_list, join_json_list
 
 
 class SubmenuService:
@@ -23,25 +24,56 @@ class SubmenuService:
     """
 
     @classmethod
-    async def get_submenus_list(cls, menu_id: str, session: AsyncSession) -> list[Submenu] | None:
+    async def get_submenus_list_etag(
+            cls,
+            menu_id: str,
+            limit: int | None = None,
+            after: str | None = None
+    ) -> str | None:
+        """
+        Метод возвращает ETag кэшированной страницы списка подменю (без запроса к БД)
+        :param menu_id: id меню
+        :param limit: кол-во подменю на странице (None - полный список)
+        :param after: id подменю, после которого начинается страница
+        :return: ETag, если страница есть в кэше, иначе None
+        """
+        return await SubmenusListCacheRepository.get_list_etag(menu_id=menu_id, limit=limit, after=after)
+
+    @classmethod
+    async def get_submenus_list(
+            cls,
+            menu_id: str,
+            session: AsyncSession,
+            limit: int | None = None,
+            after: str | None = None
+    ) -> tuple[bytes, str | None]:
         """
-        Метод кэширует и возвращает данные об имеющихся меню
+        Метод кэширует и возвращает данные об имеющихся меню (полный список либо страницу списка)
         :param menu_id: id меню
         :param session: объект асинхронной сессии
-        :return: список с меню
+        :param limit: кол-во подменю на странице (None - полный список)
+        :param after: id подменю, после которого начинается страница
+        :return: json-документ со списком подменю и id последнего подменю, если есть следующая страница, иначе None
         """
-        cache = await SubmenusListCacheRepository.get_list(menu_id=menu_id)
+        cache = await SubmenusListCacheRepository.get_list(menu_id=menu_id, limit=limit, after=after)
 
         if cache:
             logger.debug(f'Данные из кэша: {cache}')
             return cache
 
         logger.debug('Запрос данных из БД')
-        submenus_list = await SubmenuRepository.get_list(menu_id=menu_id, session=session)
+        # Запрашиваем на одну запись больше, чтобы определить наличие следующей страницы
+        submenus_list = await SubmenuRepository.get_list_with_counts(
+            menu_id=menu_id, session=session, limit=limit + 1 if limit else None, after=after
+        )
+        submenus_list, next_after = split_page(rows=submenus_list, limit=limit)
+        submenus_list = dump_json_list(SubmenuOutSchema, submenus_list)
 
-        await SubmenusListCacheRepository.set_list(menu_id=menu_id, submenus_list=submenus_list)
+        await SubmenusListCacheRepository.set_list(
+            menu_id=menu_id, submenus_list=submenus_list, next_after=next_after, limit=limit, after=after
+        )
 
-        return submenus_list
+        return submenus_list, next_after
 
     @classmethod
     async def create(
@@ -50,49 +82,63 @@ class SubmenuService:
             new_submenu: BaseInSchema,
             background_tasks: BackgroundTasks,
             session: AsyncSession
-    ) -> Submenu | None | bool:
+    ) -> dict | bool:
         """
         Метод создает и возвращает новое меню и очищает кэш со списком меню
         :param new_menu: валидные данные для создания нового подменю
         :param session: объект асинхронной сессии
-        :return: объект нового подменю
+        :return: словарь с данными нового подменю либо False, если меню не найдено
         """
-        menu = await MenuRepository.get(menu_id=menu_id, session=session)
+        # Проверка наличия меню и создание подменю выполняются одним запросом
+        submenu = await SubmenuRepository.create(menu_id=menu_id, new_submenu=new_submenu, session=session)
 
-        if menu:
-            # Делаем два запроса, чтобы при первом создании подменю не было ошибки при выводе связанных данных
-            # (которых еще нет) из дочерних таблиц
-            submenu_id = await SubmenuRepository.create(
-                menu_id=menu_id, new_submenu=new_submenu, session=session
+        if submenu:
+            background_tasks.add_task(
+                CascadeDeleteCacheSubmenuService.delete_list, menu_id=menu_id, submenu_id=submenu['id']
             )
-            submenu = await SubmenuRepository.get(submenu_id=submenu_id, session=session)
-
-            background_tasks.add_task(DeleteCacheMenuService.delete_menu, menu=menu)
-            background_tasks.add_task(SubmenusListCacheRepository.delete_list, menu_id=menu.id)
 
             return submenu
 
         return False
 
     @classmethod
-    async def get(cls, submenu_id: str, session: AsyncSession) -> Submenu | dict | None:
+    async def get_etag(cls, menu_id: str, submenu_id: str) -> str | None:
+        """
+        Метод возвращает ETag кэшированного подменю (без запроса к БД)
+        :param menu_id: id меню
+        :param submenu_id: id подменю
+        :return: ETag, если подменю есть в кэше, иначе None
+        """
+        return await SubmenuCacheRepository.get_etag(menu_id=menu_id, submenu_id=submenu_id)
+
+    @classmethod
+    async def get(cls, menu_id: str, submenu_id: str, session: AsyncSession) -> bytes | None:
         """
         Метод кэширует данные и возвращает подменю по переданному id
+        :param menu_id: id меню, к которому относится подменю
         :param submenu_id: id подменю для поиска
         :param session: объект асинхронной сессии для запросов к БД
-        :return: объект подменю либо None
+        :return: json-документ с данными подменю либо None, если подменю не найдено в переданном меню
         """
-        cache = await SubmenuCacheRepository.get(submenu_id=submenu_id)
+        cache = await SubmenuCacheRepository.get(menu_id=menu_id, submenu_id=submenu_id)
+
+        if cache == CacheStorage.NOT_FOUND:
+            logger.debug(f'Подменю отсутствует в БД (из кэша): {submenu_id}')
+            return None
 
         if cache:
             logger.debug(f'Данные из кэша: {cache}')
             return cache
 
         logger.debug('Запрос данных из БД')
-        submenu = await SubmenuRepository.get(submenu_id=submenu_id, session=session)
+        submenu = await SubmenuRepository.get_with_counts(submenu_id=submenu_id, session=session, menu_id=menu_id)
 
-        if submenu:
-            await SubmenuCacheRepository.set(submenu=submenu)
+        if not submenu:
+            await SubmenuCacheRepository.set_not_found(menu_id=menu_id, submenu_id=submenu_id)
+            return None
+
+        submenu = dump_json(SubmenuOutSchema, submenu)
+        await SubmenuCacheRepository.set(menu_id=menu_id, submenu_id=submenu_id, submenu=submenu)
 
         return submenu
 
@@ -103,19 +149,18 @@ class SubmenuService:
             data: BaseInOptionalSchema,
             background_tasks: BackgroundTasks,
             session: AsyncSession
-    ) -> Submenu | bool:
+    ) -> dict | bool:
         """
-        Метод обновляет подменю по переданному id, очищает кэш списка подменю
+        Метод обновляет подменю по переданному id, перезаписывает кэш подменю и очищает кэш списка подменю
         :param submenu_id: id подменю для обновления
         :param data: данные для обновления подменю
         :param session: объект асинхронной сессии для запросов к БД
-        :return: обновленное подменю либо None
+        :return: словарь с обновленными данными подменю либо False
         """
-        await SubmenuRepository.update(submenu_id=submenu_id, data=data, session=session)
-        updated_submenu = await SubmenuRepository.get(submenu_id=submenu_id, session=session)
+        updated_submenu = await SubmenuRepository.update(submenu_id=submenu_id, data=data, session=session)
 
         if updated_submenu:
-            background_tasks.add_task(DeleteCacheSubmenuService.delete_submenu, submenu=updated_submenu)
+            background_tasks.add_task(DeleteCacheSubmenuService.update_submenu, submenu=updated_submenu)
             logger.info('Подменю обновлено')
 
             return updated_submenu
@@ -132,16 +177,10 @@ class SubmenuService:
         :param session: объект асинхронной сессии для запросов к БД
         :return: True - успешное удаление, иначе False
         """
-        delete_submenu = await SubmenuRepository.get(submenu_id=submenu_id, session=session)
-
-        if delete_submenu:
-            menu = await MenuRepository.get(menu_id=delete_submenu.menu_id, session=session)
-
-            background_tasks.add_task(
-                CascadeDeleteCacheSubmenuService.delete_submenu, menu=menu, submenu=delete_submenu
-            )
+        deleted = await SubmenuRepository.delete(submenu_id=submenu_id, session=session)
 
-            await SubmenuRepository.delete(delete_submenu=delete_submenu, session=session)
+        if deleted:
+            background_tasks.add_task(CascadeDeleteCacheSubmenuService.delete_submenu, **deleted)
             logger.info('Подменю удалено')
 
             return True
@@ -149,3 +188,29 @@ class SubmenuService:
         logger.error('Подменю не найдено!')
 
         return False
+
+    @classmethod
+    async def get_many(cls, menu_id: str, submenus_ids: list[str], session: AsyncSession) -> bytes:
+        """
+        Метод возвращает подменю меню по списку id: кэш читается одной командой MGET, отсутствующие в кэше подменю
+        запрашиваются из БД одним запросом и записываются в кэш одним пайплайном
+        :param menu_id: id меню, к которому относятся подменю
+        :param submenus_ids: список id подменю
+        :param session: объект асинхронной сессии для запросов к БД
+        :return: json-документ со списком найденных в меню подменю в порядке переданных id
+        """
+        submenus_ids = list(dict.fromkeys(submenus_ids))
+        cache = await SubmenuCacheRepository.get_many(menu_id=menu_id, submenus_ids=submenus_ids)
+        submenus = {submenu_id: submenu for submenu_id, submenu in zip(submenus_ids, cache) if submenu}
+        missed_ids = [submenu_id for submenu_id in submenus_ids if submenu_id not in submenus]
+
+        if missed_ids:
+            logger.debug(f'Запрос данных из БД: {missed_ids}')
+            missed = await SubmenuRepository.get_many_with_counts(
+                submenus_ids=missed_ids, session=session, menu_id=menu_id
+            )
+            missed = {submenu['id']: dump_json(SubmenuOutSchema, submenu) for submenu in missed}
+            await SubmenuCacheRepository.set_many(menu_id=menu_id, submenus=missed)
+            submenus.update(missed)
+
+        return join_json_list([submenus[submenu_id] for submenu_id in submenus_ids if submenu_id in submenus])
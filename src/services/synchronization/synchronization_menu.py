@@ -13,6 +13,7 @@ from src.repositories.synchronization.last_change_time import LastChangeFileRepo
 from src.schemas.base import BaseInSchema
 from src.schemas.parser.dish import DishParserSchema
 from src.services.all_data import AllDataService
+from src.services.cache.prewarm import PrewarmCacheService
 from src.services.synchronization.check import CheckDataService
 from src.utils.parser.write_parsed_data import write_data_to_json
 
@@ -53,7 +54,7 @@ class DataSynchronizationService:
         if submenus and len(submenus) > 0:
             for submenu in submenus:
                 submenu_data = BaseInSchema(**submenu)
-                submenu_id = await SubmenuRepository.create(
+                new_submenu = await SubmenuRepository.create(
                     menu_id=menu_id,
                     new_submenu=submenu_data,
                     session=session
@@ -62,7 +63,7 @@ class DataSynchronizationService:
                 dishes = submenu.get('dishes', None)
 
                 if dishes and len(dishes) > 0:
-                    await cls._dish(submenu_id=submenu_id, dishes=dishes, session=session)
+                    await cls._dish(submenu_id=new_submenu['id'], dishes=dishes, session=session)
 
     @classmethod
     async def _menu(cls, menus: list[dict], session: AsyncSession):
@@ -75,12 +76,12 @@ class DataSynchronizationService:
 
         for menu in menus:
             menu_data = BaseInSchema(**menu)
-            menu_id = await MenuRepository.create(new_menu=menu_data, session=session)
+            new_menu = await MenuRepository.create(new_menu=menu_data, session=session)
 
             submenus = menu.get('submenus', None)
 
             if submenus and len(submenus) > 0:
-                await cls._submenu(menu_id=menu_id, submenus=submenus, session=session)
+                await cls._submenu(menu_id=new_menu['id'], submenus=submenus, session=session)
 
     @classmethod
     async def synchronization_db(cls) -> None:
@@ -109,6 +110,8 @@ class DataSynchronizationService:
             else:
                 logger.warning('Файл синхронизации пуст. БД очищена')
 
+            await PrewarmCacheService.prewarm()
+
             await LastChangeFileRepository.set(timestamp_data=data['time_change_file'])
 
 
@@ -1,8 +1,10 @@
 from fastapi import FastAPI
 
 from src.routes.all_data import router as all_data_router
+from src.routes.batch import router as batch_router
 from src.routes.dish import router as dish_router
 from src.routes.menu import router as menu_router
+from src.routes.stats import router as stats_router
 from src.routes.submenu import router as submenu_router
 
 
@@ -15,5 +17,7 @@ def register_routers(app: FastAPI) -> FastAPI:
     app.include_router(menu_router)
     app.include_router(submenu_router)
     app.include_router(dish_router)
+    app.include_router(batch_router)
+    app.include_router(stats_router)
 
     return app
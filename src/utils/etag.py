@@ -0,0 +1,43 @@
+from hashlib import blake2b
+from http import HTTPStatus
+
+from fastapi import Response
+
+# Заголовок ответа с ETag тела ответа
+ETAG_HEADER = 'ETag'
+
+
+def make_etag(data: bytes) -> str:
+    """
+    Функция формирует сильный ETag по содержимому json-документа
+    :param data: json-документ (тело ответа)
+    :return: ETag в кавычках
+    """
+    return f'"{blake2b(data, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str | None) -> bool:
+    """
+    Функция проверяет, совпадает ли ETag с одним из ETag заголовка запроса If-None-Match
+    (для If-None-Match используется слабое сравнение: префикс W/ не учитывается)
+    :param if_none_match: значение заголовка If-None-Match
+    :param etag: ETag текущей версии ответа
+    :return: True - у клиента актуальная версия ответа, иначе False
+    """
+    if not if_none_match or not etag:
+        return False
+
+    if if_none_match.strip() == '*':
+        return True
+
+    return any(tag.strip().removeprefix('W/') == etag for tag in if_none_match.split(','))
+
+
+def not_modified(etag: str, headers: dict[str, str] | None = None) -> Response:
+    """
+    Функция возвращает ответ 304 Not Modified без тела
+    :param etag: ETag актуальной версии ответа
+    :param headers: заголовки кэширования, которые были бы отправлены с ответом 200
+    :return: ответ
+    """
+    return Response(status_code=HTTPStatus.NOT_MODIFIED, headers={**(headers or {}), ETAG_HEADER: etag})
@@ -0,0 +1,47 @@
+import base64
+import binascii
+from uuid import UUID
+
+# Заголовок ответа с курсором для запроса следующей страницы списка
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+# Максимальное кол-во записей на странице
+MAX_PAGE_LIMIT = 1000
+
+
+def encode_cursor(last_id: str) -> str:
+    """
+    Функция формирует непрозрачный курсор для запроса следующей страницы
+    :param last_id: id последней записи на текущей странице
+    :return: курсор
+    """
+    return base64.urlsafe_b64encode(UUID(last_id).bytes).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> str:
+    """
+    Функция извлекает из курсора id последней записи предыдущей страницы
+    :param cursor: курсор, полученный с предыдущей страницей
+    :return: id записи
+    :raise ValueError: невалидный курсор
+    """
+    try:
+        return str(UUID(bytes=base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))))
+
+    except (binascii.Error, ValueError):
+        raise ValueError(f'Невалидный курсор: {cursor}')
+
+
+def split_page(rows: list[dict], limit: int | None) -> tuple[list[dict], str | None]:
+    """
+    Функция отделяет страницу от записей, запрошенных с запасом в одну запись (limit + 1)
+    :param rows: записи, отсортированные по id
+    :param limit: кол-во записей на странице (None - полный список)
+    :return: записи страницы и id последней записи, если есть следующая страница, иначе None
+    """
+    if limit is None or len(rows) <= limit:
+        return rows, None
+
+    page = rows[:limit]
+
+    return page, page[-1]['id']
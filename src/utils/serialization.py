@@ -0,0 +1,50 @@
+from functools import lru_cache
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+
+# Тип содержимого ответов, возвращаемых готовым json-документом
+JSON_MEDIA_TYPE = 'application/json'
+
+
+@lru_cache
+def _adapter(schema: Any) -> TypeAdapter:
+    """
+    Функция возвращает (и переиспользует) адаптер pydantic для валидации и сериализации по схеме
+    :param schema: схема либо тип списка схем
+    :return: адаптер
+    """
+    return TypeAdapter(schema)
+
+
+def dump_json(schema: type[BaseModel], obj: Any) -> bytes:
+    """
+    Функция валидирует запись по схеме вывода и возвращает готовое тело ответа
+    :param schema: схема вывода
+    :param obj: словарь с данными либо объект ORM-модели
+    :return: json-документ
+    """
+    adapter = _adapter(schema)
+
+    return adapter.dump_json(adapter.validate_python(obj))
+
+
+def dump_json_list(schema: type[BaseModel], items: list[Any]) -> bytes:
+    """
+    Функция валидирует список записей по схеме вывода и возвращает готовое тело ответа
+    :param schema: схема вывода
+    :param items: список словарей с данными либо объектов ORM-модели
+    :return: json-документ со списком
+    """
+    adapter = _adapter(list[schema])
+
+    return adapter.dump_json(adapter.validate_python(items))
+
+
+def join_json_list(documents: list[bytes]) -> bytes:
+    """
+    Функция собирает json-список из готовых json-документов записей без их повторной сериализации
+    :param documents: json-документы записей
+    :return: json-документ со списком
+    """
+    return b'[' + b','.join(documents) + b']'
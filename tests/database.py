@@ -11,6 +11,7 @@ from src.config import (
     DB_USER_TEST,
 )
 from src.database import Base, get_async_session
+from src.database import async_session_maker as app_session_maker
 from src.main import app
 
 DATABASE_URL_TEST = (
@@ -23,6 +24,10 @@ async_session_maker = async_sessionmaker(
     engine_test, class_=AsyncSession, expire_on_commit=False
 )
 
+# Сессии, которые сервисы открывают сами (пересборка кэша, общая для нескольких запросов), тоже работают
+# с тестовой БД
+app_session_maker.configure(bind=engine_test)
+
 # Связываем с объектом методанных тестовый движок, чтобы таблицы создавались именно в тестовой БД
 Base.metadata.bind = engine_test
 
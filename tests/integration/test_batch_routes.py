@@ -0,0 +1,87 @@
+import uuid
+from http import HTTPStatus
+
+import pytest
+from httpx import AsyncClient
+
+from src.main import app
+from src.models.dish import Dish
+from src.models.menu import Menu
+from src.models.submenu import Submenu
+from src.schemas.dish import DishOutSchema
+from src.schemas.menu import MenuOutSchema
+from src.schemas.submenu import SubmenuOutSchema
+
+
+@pytest.mark.integration
+class TestBatchRoutes:
+    """
+    Тестирование роутов для пакетного вывода меню, подменю и блюд по списку id
+    """
+
+    async def test_get_menus_by_ids(
+            self,
+            menu: Menu,
+            client: AsyncClient
+    ) -> None:
+        """
+        Проверка роута для вывода нескольких меню по списку id (ненайденные id пропускаются)
+        """
+        url = app.url_path_for('get_menus_by_ids')
+        resp = await client.get(url, params={'ids': [str(menu.id), str(uuid.uuid4())]})
+        resp_json = resp.json()
+
+        assert resp
+        assert resp.status_code == HTTPStatus.OK
+        assert len(resp_json) == 1
+        assert MenuOutSchema.model_validate(resp_json[0]).id == menu.id
+
+    async def test_get_submenus_by_ids(
+            self,
+            submenu: Submenu,
+            client: AsyncClient
+    ) -> None:
+        """
+        Проверка роута для вывода нескольких подменю по списку id
+        """
+        url = app.url_path_for('get_submenus_by_ids')
+        resp = await client.get(url, params={'menu_id': str(submenu.menu_id), 'ids': [str(submenu.id)]})
+        resp_json = resp.json()
+
+        assert resp
+        assert resp.status_code == HTTPStatus.OK
+        assert SubmenuOutSchema.model_validate(resp_json[0]).id == submenu.id
+
+    async def test_get_dishes_by_ids(
+            self,
+            dish: Dish,
+            client: AsyncClient
+    ) -> None:
+        """
+        Проверка роута для вывода нескольких блюд по списку id без указания меню и подменю
+        (ненайденные id пропускаются, повторный запрос читается из кэша)
+        """
+        url = app.url_path_for('get_dishes_by_ids')
+
+        for _ in range(2):
+            resp = await client.get(url, params={'ids': [str(dish.id), str(dish.id), str(uuid.uuid4())]})
+            resp_json = resp.json()
+
+            assert resp
+            assert resp.status_code == HTTPStatus.OK
+            assert len(resp_json) == 1
+            assert DishOutSchema.model_validate(resp_json[0]).id == dish.id
+
+    @pytest.mark.fail
+    async def test_get_dishes_by_ids_validation_error(
+            self,
+            client: AsyncClient
+    ) -> None:
+        """
+        Проверка ответа при невалидном id в списке
+        """
+        url = app.url_path_for('get_dishes_by_ids')
+        resp = await client.get(url, params={'ids': ['invalid']})
+
+        assert resp
+        assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
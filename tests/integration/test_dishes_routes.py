@@ -9,7 +9,7 @@ from src.main import app
 from src.models.dish import Dish
 from src.models.menu import Menu
 from src.models.submenu import Submenu
-from src.schemas.dish import DishInSchema, DishOutSchema
+from src.schemas.dish import DishBatchOutSchema, DishInSchema, DishOutSchema
 from src.schemas.response import ResponseForDeleteSchema, ResponseSchema
 
 
@@ -170,6 +170,45 @@ class TestDishesRoutes:
         assert resp
         assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
 
+    async def test_batch_dishes(
+            self,
+            menu: Menu,
+            submenu: Submenu,
+            dish: Dish,
+            dish_schema: DishInSchema,
+            client: AsyncClient
+    ) -> None:
+        """
+        Проверка роута для пакетного создания и обновления блюд
+        """
+        url = app.url_path_for('batch_dishes', menu_id=menu.id, submenu_id=submenu.id)
+        resp = await client.post(url, json={
+            'create': [dish_schema.model_dump()],
+            'update': [{'id': str(dish.id), 'price': 120}],
+        })
+
+        assert resp
+        assert resp.status_code == HTTPStatus.OK
+        assert DishBatchOutSchema.model_validate(resp.json())
+        assert len(resp.json()['created']) == 1
+
+    @pytest.mark.fail
+    async def test_batch_dishes_not_found(
+            self,
+            menu: Menu,
+            submenu: Submenu,
+            client: AsyncClient
+    ) -> None:
+        """
+        Проверка вывода сообщения, что блюдо из пакета не найдено
+        """
+        url = app.url_path_for('batch_dishes', menu_id=menu.id, submenu_id=submenu.id)
+        resp = await client.post(url, json={'delete': [str(uuid.uuid4())]})
+
+        assert resp
+        assert resp.status_code == HTTPStatus.NOT_FOUND
+        assert ResponseSchema.model_validate(resp.json())
+
     async def test_delete_dish(
             self,
             menu: Menu,
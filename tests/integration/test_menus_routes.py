@@ -7,9 +7,13 @@ from httpx import AsyncClient
 
 from src.main import app
 from src.models.menu import Menu
+from src.repositories.cache import edge
+from src.repositories.cache.edge import EdgeCache, LocalEdgePurger
 from src.schemas.base import BaseInSchema
 from src.schemas.menu import MenuOutSchema
 from src.schemas.response import ResponseForDeleteSchema, ResponseSchema
+from src.utils.etag import ETAG_HEADER
+from src.utils.pagination import NEXT_CURSOR_HEADER
 
 
 @pytest.mark.integration
@@ -63,20 +67,69 @@ class TestMenusRoutes:
         assert resp.status_code == HTTPStatus.OK
         assert MenuOutSchema.model_validate(resp.json())
 
+    async def test_get_menu_not_modified(
+            self,
+            menu: Menu,
+            client: AsyncClient
+    ) -> None:
+        """
+        Проверка, что при совпадении If-None-Match с ETag меню возвращается 304 без тела,
+        а после обновления меню - новая версия с другим ETag
+        """
+        url = app.url_path_for('get_menu', menu_id=menu.id)
+        etag = (await client.get(url)).headers[ETAG_HEADER]
+        resp = await client.get(url, headers={'If-None-Match': etag})
+
+        assert resp.status_code == HTTPStatus.NOT_MODIFIED
+        assert resp.headers[ETAG_HEADER] == etag
+        assert not resp.content
+
+        await client.patch(app.url_path_for('update_menu', menu_id=menu.id), json={'title': 'updated title'})
+        resp = await client.get(url, headers={'If-None-Match': etag})
+
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.headers[ETAG_HEADER] != etag
+
+    async def test_menu_edge_cache(
+            self,
+            menu: Menu,
+            client: AsyncClient
+    ) -> None:
+        """
+        Проверка, что меню отдается с суррогатным ключом, а при обновлении меню этот ключ очищается на CDN
+        """
+        EdgeCache.configure('local')
+        LocalEdgePurger.reset()
+
+        try:
+            resp = await client.get(app.url_path_for('get_menu', menu_id=menu.id))
+
+            assert resp.headers[EdgeCache.SURROGATE_KEY_HEADER] == EdgeCache.menu(menu_id=str(menu.id))
+            assert EdgeCache.CACHE_CONTROL_HEADER in resp.headers
+
+            await client.patch(app.url_path_for('update_menu', menu_id=menu.id), json={'title': 'edge title'})
+
+            assert EdgeCache.menu(menu_id=str(menu.id)) in LocalEdgePurger.purged
+
+        finally:
+            EdgeCache.configure(edge.EDGE_PURGER)
+
     @pytest.mark.fail
     async def test_get_menu_not_found(
             self,
             client: AsyncClient
     ) -> None:
         """
-        Проверка вывода сообщения, что меню не найдено
+        Проверка вывода сообщения, что меню не найдено (повторный запрос читается из маркера в кэше)
         """
         url = app.url_path_for('get_menu', menu_id=uuid.uuid4())
-        resp = await client.get(url)
 
-        assert resp
-        assert resp.status_code == HTTPStatus.NOT_FOUND
-        assert ResponseSchema.model_validate(resp.json())
+        for _ in range(2):
+            resp = await client.get(url)
+
+            assert resp
+            assert resp.status_code == HTTPStatus.NOT_FOUND
+            assert ResponseSchema.model_validate(resp.json())
 
     @pytest.mark.usefixtures('menu')
     async def test_get_list_menu(
@@ -95,6 +148,44 @@ class TestMenusRoutes:
         assert MenuOutSchema.model_validate(resp_json[0])
         assert isinstance(resp_json, list)
 
+    @pytest.mark.usefixtures('menu')
+    async def test_get_list_menu_page(
+            self,
+            client: AsyncClient
+    ) -> None:
+        """
+        Проверка роута для постраничного вывода списка меню
+        """
+        url = app.url_path_for('get_menu_list')
+        resp = await client.get(url, params={'limit': 1})
+        resp_json = resp.json()
+
+        assert resp.status_code == HTTPStatus.OK
+        assert len(resp_json) == 1
+        assert MenuOutSchema.model_validate(resp_json[0])
+
+        cursor = resp.headers.get(NEXT_CURSOR_HEADER)
+
+        if cursor:
+            next_resp = await client.get(url, params={'limit': 1, 'cursor': cursor})
+
+            assert next_resp.status_code == HTTPStatus.OK
+            assert next_resp.json()[0]['id'] != resp_json[0]['id']
+
+    @pytest.mark.fail
+    async def test_get_list_menu_invalid_cursor(
+            self,
+            client: AsyncClient
+    ) -> None:
+        """
+        Проверка вывода сообщения о некорректном курсоре
+        """
+        url = app.url_path_for('get_menu_list')
+        resp = await client.get(url, params={'limit': 1, 'cursor': 'invalid'})
+
+        assert resp.status_code == HTTPStatus.BAD_REQUEST
+        assert ResponseSchema.model_validate(resp.json())
+
     async def test_update_menu(
             self,
             menu: Menu,
@@ -0,0 +1,99 @@
+from http import HTTPStatus
+
+import pytest
+from httpx import AsyncClient
+
+from src.main import app
+from src.models.menu import Menu
+from src.schemas.stats import (
+    CacheBreakerStatsSchema,
+    CacheCodecStatsSchema,
+    CacheOperationStatsSchema,
+    DbPoolStatsSchema,
+)
+
+
+@pytest.mark.integration
+class TestStatsRoutes:
+    """
+    Тестирование роутов для вывода служебной статистики
+    """
+
+    async def test_get_db_pool_stats(
+            self,
+            client: AsyncClient
+    ) -> None:
+        """
+        Проверка роута для вывода статистики пула соединений с БД
+        """
+        url = app.url_path_for('get_db_pool_stats')
+        resp = await client.get(url)
+
+        assert resp
+        assert resp.status_code == HTTPStatus.OK
+        assert DbPoolStatsSchema.model_validate(resp.json())
+
+    async def test_get_cache_codec_stats(
+            self,
+            menu: Menu,
+            client: AsyncClient
+    ) -> None:
+        """
+        Проверка роута для вывода статистики кодирования значений кэша
+        """
+        await client.get(app.url_path_for('get_menu', menu_id=menu.id))
+
+        url = app.url_path_for('get_cache_codec_stats')
+        resp = await client.get(url)
+
+        assert resp
+        assert resp.status_code == HTTPStatus.OK
+        assert all(CacheCodecStatsSchema.model_validate(stats) for stats in resp.json().values())
+
+    async def test_get_cache_keys_stats(
+            self,
+            menu: Menu,
+            client: AsyncClient
+    ) -> None:
+        """
+        Проверка роута для вывода кол-ва ключей кэша по классам
+        """
+        await client.get(app.url_path_for('get_menu', menu_id=menu.id))
+
+        url = app.url_path_for('get_cache_keys_stats')
+        resp = await client.get(url)
+
+        assert resp
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.json()['item'] >= 1
+
+    async def test_get_cache_stats(
+            self,
+            menu: Menu,
+            client: AsyncClient
+    ) -> None:
+        """
+        Проверка роута для вывода статистики операций репозиториев кэша
+        """
+        await client.get(app.url_path_for('get_menu', menu_id=menu.id))
+
+        url = app.url_path_for('get_cache_stats')
+        resp = await client.get(url)
+        stats = [CacheOperationStatsSchema.model_validate(operation) for operation in resp.json()]
+
+        assert resp
+        assert resp.status_code == HTTPStatus.OK
+        assert any(
+            operation.repository == 'MenuCacheRepository' and operation.operation == 'get' for operation in stats
+        )
+
+    async def test_get_cache_breaker_stats(self, client: AsyncClient) -> None:
+        """
+        Проверка роута для вывода состояния автоматического выключателя кэша
+        """
+        url = app.url_path_for('get_cache_breaker_stats')
+        resp = await client.get(url)
+
+        assert resp
+        assert resp.status_code == HTTPStatus.OK
+        assert CacheBreakerStatsSchema.model_validate(resp.json()).state == 'closed'
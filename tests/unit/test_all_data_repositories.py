@@ -0,0 +1,64 @@
+import json
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.dish import Dish
+from src.models.menu import Menu
+from src.models.submenu import Submenu
+from src.repositories.all_data import AllDataRepository
+from src.schemas.dish import DishOutSchema
+from src.schemas.menu import MenuWithSubmenusOutSchema
+
+
+@pytest.mark.unit
+class TestAllDataRepositories:
+    """
+    Тестирование метода для вывода всех меню со связанными подменю и блюдами
+    """
+
+    async def test_get_menus_json(
+            self,
+            menu: Menu,
+            submenu: Submenu,
+            dish: Dish,
+            session: AsyncSession,
+    ) -> None:
+        """
+        Проверка json-документов меню со всеми данными, собранных на стороне БД
+        """
+        menus = await AllDataRepository.get_menus_json(session=session)
+        menu_res = json.loads(menus[str(menu.id)])
+
+        assert list(menus) == await AllDataRepository.get_menus_ids(session=session)
+        assert MenuWithSubmenusOutSchema.model_validate(menu_res)
+        assert menu_res['submenus_count'] == 1
+        assert menu_res['dishes_count'] == 1
+        assert menu_res['submenus'][0]['id'] == str(submenu.id)
+        assert menu_res['submenus'][0]['dishes'][0]['id'] == str(dish.id)
+        assert menu_res['submenus'][0]['dishes'][0]['price'] == '100.00'
+
+    async def test_get_menus_json_filter(self, menu: Menu, session: AsyncSession) -> None:
+        """
+        Проверка, что из БД запрашиваются только переданные меню
+        """
+        assert list(await AllDataRepository.get_menus_json(session=session, menus_ids=[str(menu.id)])) == [
+            str(menu.id)
+        ]
+        assert await AllDataRepository.get_menus_json(session=session, menus_ids=[]) == {}
+
+    async def test_discount_price_rounding(self, submenu: Submenu, session: AsyncSession) -> None:
+        """
+        Проверка, что цена со скидкой на границе округления (1.25 со скидкой 50% = 0.625) совпадает
+        во всех данных и в ответе на запрос блюда
+        """
+        dish = Dish(submenu_id=submenu.id, title='Rounding dish', description='Rounding dish', price=1.25, discount=50)
+        session.add(dish)
+        await session.commit()
+
+        menus = await AllDataRepository.get_menus_json(session=session, menus_ids=[str(submenu.menu_id)])
+        dishes = json.loads(menus[str(submenu.menu_id)])['submenus'][0]['dishes']
+        dish_res = next(item for item in dishes if item['id'] == str(dish.id))
+
+        assert dish_res['price'] == '0.63'
+        assert DishOutSchema.model_validate(dish).price == '0.63'
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+from aioredis.exceptions import ConnectionError
+
+from src.repositories.cache import breaker
+from src.repositories.cache.breaker import CacheCircuitBreaker
+
+
+class FakeRedisRepository:
+    """
+    Репозиторий для проверки автоматического выключателя кэша
+    """
+
+    calls: int = 0
+    fail: bool = True
+
+    @classmethod
+    @CacheCircuitBreaker.protect(fallback=lambda cls, key: 'fallback')
+    async def get(cls, key: str) -> str:
+        """
+        Чтение записи (ошибка Redis, пока установлен флаг fail)
+        """
+        cls.calls += 1
+
+        if cls.fail:
+            raise ConnectionError('Redis недоступен')
+
+        return key
+
+    @classmethod
+    @CacheCircuitBreaker.protect(fallback=lambda cls, delay: 'fallback', timeout=lambda cls, delay: 1)
+    async def get_bulk(cls, delay: float) -> str:
+        """
+        Чтение объемной записи (с собственным таймаутом)
+        """
+        await asyncio.sleep(delay)
+
+        return 'bulk'
+
+
+@pytest.mark.unit
+class TestCacheCircuitBreaker:
+    """
+    Тестирование автоматического выключателя кэша
+    """
+
+    @pytest.fixture(autouse=True)
+    def reset(self, monkeypatch: pytest.MonkeyPatch):
+        """
+        Замыкание выключателя и сброс репозитория до и после теста
+        """
+        monkeypatch.setattr(breaker, 'CACHE_BREAKER_FAILURES', 3)
+        monkeypatch.setattr(FakeRedisRepository, 'calls', 0)
+        monkeypatch.setattr(FakeRedisRepository, 'fail', True)
+        CacheCircuitBreaker.reset()
+
+        yield
+
+        CacheCircuitBreaker.reset()
+
+    async def test_opens_after_failures(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Проверка, что после CACHE_BREAKER_FAILURES ошибок подряд Redis не используется, а операции
+        возвращают значение по умолчанию
+        """
+        monkeypatch.setattr(breaker, 'CACHE_BREAKER_COOLDOWN', 60)
+
+        for _ in range(3):
+            assert await FakeRedisRepository.get('key') == 'fallback'
+
+        assert not CacheCircuitBreaker.available()
+
+        assert await FakeRedisRepository.get('key') == 'fallback'
+        assert FakeRedisRepository.calls == 3
+        assert CacheCircuitBreaker.stats()['rejected'] == 1
+
+    async def test_closes_after_probe(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Проверка, что по истечении CACHE_BREAKER_COOLDOWN успешная пробная операция замыкает выключатель,
+        а неуспешная снова его размыкает
+        """
+        monkeypatch.setattr(breaker, 'CACHE_BREAKER_COOLDOWN', 0)
+
+        for _ in range(3):
+            await FakeRedisRepository.get('key')
+
+        assert await FakeRedisRepository.get('key') == 'fallback'
+        assert CacheCircuitBreaker.stats()['state'] == CacheCircuitBreaker.OPEN
+
+        FakeRedisRepository.fail = False
+
+        assert await FakeRedisRepository.get('key') == 'key'
+        assert CacheCircuitBreaker.available()
+
+    async def test_bulk_timeout(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Проверка, что операция с собственным таймаутом не прерывается общим таймаутом и не считается ошибкой
+        """
+        monkeypatch.setattr(breaker, 'CACHE_BREAKER_TIMEOUT', 0.01)
+
+        assert await FakeRedisRepository.get_bulk(0.05) == 'bulk'
+        assert CacheCircuitBreaker.stats()['failures'] == 0
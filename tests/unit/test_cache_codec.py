@@ -0,0 +1,44 @@
+import pytest
+
+from src.repositories.cache import codec
+from src.repositories.cache.codec import CacheCodec
+from src.repositories.cache.key_class import CacheKeyClass
+
+
+@pytest.mark.unit
+class TestCacheCodec:
+    """
+    Тестирование кодирования значений кэша
+    """
+
+    def test_compress_large_value(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Проверка, что значение больше порога сжимается и распаковывается в исходный документ
+        """
+        monkeypatch.setattr(codec, 'CACHE_COMPRESSION_MIN_SIZE', 100)
+        data = b'[' + b','.join(b'{"id":"1","title":"menu"}' for _ in range(100)) + b']'
+
+        encoded = CacheCodec.encode(data, key_class=CacheKeyClass.ALL_DATA)
+
+        assert len(encoded) < len(data)
+        assert CacheCodec.decode(encoded, key_class=CacheKeyClass.ALL_DATA) == data
+
+    def test_skip_small_value(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Проверка, что значение меньше порога и значение класса без сжатия записываются как есть
+        """
+        monkeypatch.setattr(codec, 'CACHE_COMPRESSION_MIN_SIZE', 100)
+        data = b'{"id":"1","title":"menu"}'
+
+        assert CacheCodec.encode(data, key_class=CacheKeyClass.ALL_DATA) == data
+        assert CacheCodec.encode(data * 10, key_class=CacheKeyClass.ITEM) == data * 10
+        assert CacheCodec.decode(data, key_class=CacheKeyClass.ITEM) == data
+
+    def test_stats(self) -> None:
+        """
+        Проверка учета размеров закодированных значений
+        """
+        before = CacheCodec.stats().get(CacheKeyClass.ITEM, {}).get('raw_bytes', 0)
+        CacheCodec.encode(b'{}', key_class=CacheKeyClass.ITEM)
+
+        assert CacheCodec.stats()[CacheKeyClass.ITEM]['raw_bytes'] == before + 2
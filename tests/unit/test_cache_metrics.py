@@ -0,0 +1,138 @@
+import pytest
+from aioredis.exceptions import ConnectionError
+
+from src.repositories.cache.breaker import CacheCircuitBreaker
+from src.repositories.cache.metrics import CacheMetrics
+
+
+class FakeCacheRepository:
+    """
+    Репозиторий кэша для проверки сбора статистики
+    """
+
+    @classmethod
+    @CacheMetrics.observe
+    async def get(cls, value: bytes | None) -> bytes | None:
+        """
+        Чтение записи
+        """
+        return value
+
+    @classmethod
+    @CacheMetrics.observe
+    async def get_many(cls, values: list[bytes | None]) -> list[bytes | None]:
+        """
+        Чтение нескольких записей
+        """
+        return values
+
+    @classmethod
+    @CacheMetrics.observe
+    async def get_etag(cls, value: str | None) -> str | None:
+        """
+        Проверка ETag записи
+        """
+        return value
+
+    @classmethod
+    @CacheMetrics.observe
+    async def get_unavailable(cls) -> bytes | None:
+        """
+        Чтение записи при недоступном Redis (выключатель возвращает значение по умолчанию)
+        """
+        return await cls.__redis_get()
+
+    @classmethod
+    @CacheCircuitBreaker.protect()
+    async def __redis_get(cls) -> bytes | None:
+        """
+        Операция с Redis, завершающаяся ошибкой
+        """
+        raise ConnectionError('Redis недоступен')
+
+    @classmethod
+    @CacheMetrics.observe
+    async def set(cls, value: bytes) -> None:
+        """
+        Запись
+        """
+        return None
+
+
+@pytest.mark.unit
+class TestCacheMetrics:
+    """
+    Тестирование статистики операций репозиториев кэша
+    """
+
+    @pytest.fixture(autouse=True)
+    def reset(self):
+        """
+        Сброс статистики до и после теста
+        """
+        CacheMetrics.reset()
+
+        yield
+
+        CacheMetrics.reset()
+
+    async def test_hits_and_misses(self) -> None:
+        """
+        Проверка подсчета попаданий, промахов и объема прочитанных документов
+        """
+        await FakeCacheRepository.get(b'{}')
+        await FakeCacheRepository.get(None)
+        await FakeCacheRepository.get_many([b'{}', None, b'[]'])
+
+        stats = {operation['operation']: operation for operation in CacheMetrics.stats()}
+
+        assert (stats['get']['calls'], stats['get']['hits'], stats['get']['misses']) == (2, 1, 1)
+        assert (stats['get_many']['hits'], stats['get_many']['misses'], stats['get_many']['bytes']) == (2, 1, 4)
+        assert sum(stats['get']['latency_buckets'].values()) == 2
+
+    async def test_write_bytes(self) -> None:
+        """
+        Проверка подсчета объема записанных документов
+        """
+        await FakeCacheRepository.set(value=b'{"id":"1"}')
+
+        stats = CacheMetrics.stats()
+
+        assert stats[0]['repository'] == 'FakeCacheRepository'
+        assert stats[0]['bytes'] == 10
+
+    async def test_etag_without_hits(self) -> None:
+        """
+        Проверка, что проверка ETag не учитывается в попаданиях и промахах
+        """
+        await FakeCacheRepository.get_etag('"etag"')
+        await FakeCacheRepository.get_etag(None)
+
+        stats = CacheMetrics.stats()
+
+        assert (stats[0]['calls'], stats[0]['hits'], stats[0]['misses']) == (2, 0, 0)
+
+    async def test_not_found_marker(self) -> None:
+        """
+        Проверка, что маркер отсутствующей в БД записи не учитывается как попадание
+        """
+        await FakeCacheRepository.get(b'')
+        await FakeCacheRepository.get(b'{}')
+
+        stats = CacheMetrics.stats()
+
+        assert (stats[0]['hits'], stats[0]['misses'], stats[0]['not_found']) == (1, 0, 1)
+
+    async def test_fallback_is_error(self) -> None:
+        """
+        Проверка, что значение по умолчанию при недоступном Redis учитывается как ошибка, а не промах
+        """
+        try:
+            assert await FakeCacheRepository.get_unavailable() is None
+
+        finally:
+            CacheCircuitBreaker.reset()
+
+        stats = CacheMetrics.stats()
+
+        assert (stats[0]['hits'], stats[0]['misses'], stats[0]['errors']) == (0, 0, 1)
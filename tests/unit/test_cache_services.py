@@ -0,0 +1,78 @@
+import uuid
+
+import pytest
+
+from src.repositories.cache.local import LocalCache
+from src.repositories.cache.menu import MenuGenerationCacheRepository
+from src.repositories.cache.storage import CacheStorage
+from src.services.cache.dish import DeleteCacheDishService
+from src.services.cache.menu import CascadeDeleteCacheMenuService, DeleteCacheMenuService
+
+
+@pytest.mark.unit
+class TestCacheServices:
+    """
+    Тестирование сбора ключей кэша для очистки
+    """
+
+    @pytest.fixture(autouse=True)
+    def generation(self):
+        """
+        Поколение кэша меню в L1-кэше (в тестах подписка на инвалидацию не запускается)
+        """
+        LocalCache.active = True
+        LocalCache.set(MenuGenerationCacheRepository.key(menu_id='3'), 5, size=1)
+
+        yield
+
+        LocalCache.active = False
+        LocalCache.clear()
+
+    def test_cascade_menu_keys(self) -> None:
+        """
+        Проверка, что при удалении меню очищаются ключи меню и меняется поколение кэша его подменю и блюд
+        """
+        keys = CascadeDeleteCacheMenuService.keys(menu_id='1')
+        generations = CascadeDeleteCacheMenuService.generations(menu_id='1')
+
+        assert {'menu_1', 'menus_list', 'all_data', 'menu_1_all_data'} == set(keys)
+        assert generations == ['menu_1_generation']
+
+    async def test_update_menu_keeps_order(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Проверка, что при обновлении меню очищается только его фрагмент всех данных, а порядок меню сохраняется
+        """
+        cleared = []
+
+        async def write_through(items: dict, *keys: str, pages: dict | None = None) -> None:
+            cleared.extend(keys)
+
+        monkeypatch.setattr(CacheStorage, 'write_through', write_through)
+        menu_id = str(uuid.uuid4())
+
+        await DeleteCacheMenuService.update_menu(
+            menu={'id': menu_id, 'title': 'title', 'description': 'description', 'submenus_count': 0, 'dishes_count': 0},
+        )
+
+        assert f'menu_{menu_id}_all_data' in cleared
+        assert 'all_data' in cleared
+        assert 'all_data_menus' not in cleared
+
+    async def test_dish_keys(self) -> None:
+        """
+        Проверка, что ключи кэша блюда содержат текущее поколение кэша меню
+        """
+        keys = await DeleteCacheDishService.keys(dish_id='1', submenu_id='2', menu_id='3')
+
+        assert {
+            'menu_3:v5:submenu_2_dish_1',
+            'menu_3:v5:submenu_2_dishes_list',
+            'all_data',
+            'menu_3_all_data',
+        } == set(keys)
+
+        # После смены поколения ключи записей прежнего поколения больше не используются
+        LocalCache.set(MenuGenerationCacheRepository.key(menu_id='3'), 6, size=1)
+        keys = await DeleteCacheDishService.keys(dish_id='1', submenu_id='2', menu_id='3')
+
+        assert 'menu_3:v6:submenu_2_dish_1' in keys
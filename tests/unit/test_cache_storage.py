@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+from fastapi_redis import redis_client
+
+from src.repositories.cache import storage
+from src.repositories.cache.storage import CacheStorage
+from src.utils.etag import make_etag
+
+
+@pytest.mark.unit
+class TestCacheStorage:
+    """
+    Тестирование низкоуровневых операций с кэшем
+    """
+
+    async def test_delete_marks_stale(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Проверка, что при включенном CACHE_STALE_TTL очищенная запись со всеми данными сохраняется как устаревшая
+        """
+        monkeypatch.setattr(storage, 'CACHE_STALE_TTL', 10)
+
+        await CacheStorage.set('all_data', b'[]')
+        await CacheStorage.delete('all_data')
+
+        assert await CacheStorage.get('all_data') is None
+        assert await CacheStorage.get_stale('all_data') == b'[]'
+
+    async def test_delete_without_stale(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Проверка, что при выключенном CACHE_STALE_TTL устаревшая запись не отдается
+        """
+        monkeypatch.setattr(storage, 'CACHE_STALE_TTL', 0)
+
+        await CacheStorage.set('all_data', b'[]')
+        await CacheStorage.delete('all_data')
+
+        assert await CacheStorage.get('all_data') is None
+        assert await CacheStorage.get_stale('all_data') is None
+
+    async def test_write_through(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Проверка, что обновленная запись перезаписывается в кэше, а зависящие от нее записи очищаются
+        """
+        monkeypatch.setattr(storage, 'CACHE_STALE_TTL', 0)
+
+        await CacheStorage.set('menu_1', b'{"id":"1","title":"old"}')
+        await CacheStorage.set('all_data', b'[]')
+        await CacheStorage.write_through({'menu_1': b'{"id":"1","title":"new"}'}, 'menu_1', 'all_data')
+
+        assert await CacheStorage.get('menu_1') == b'{"id":"1","title":"new"}'
+        assert await CacheStorage.get('all_data') is None
+
+    async def test_write_through_pages(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Проверка, что при перезаписи полного списка остальные страницы списка очищаются
+        """
+        monkeypatch.setattr(storage, 'CACHE_STALE_TTL', 0)
+        page_field = CacheStorage.page_field(limit=1, after=None)
+
+        await CacheStorage.set_page('menus_list', page_field, b'[{"id":"1"}]', next_after='1')
+        await CacheStorage.write_through({}, pages={'menus_list': b'[{"id":"1"},{"id":"2"}]'})
+
+        assert await CacheStorage.get_page('menus_list', page_field) is None
+        assert await CacheStorage.get_page('menus_list', CacheStorage.FULL_PAGE) == (
+            b'[{"id":"1"},{"id":"2"}]',
+            None,
+        )
+        assert await CacheStorage.get_etag('menus_list', CacheStorage.FULL_PAGE) == make_etag(
+            b'[{"id":"1"},{"id":"2"}]'
+        )
+
+    async def test_fill(self) -> None:
+        """
+        Проверка, что при заполнении кэша записи и полные списки записываются вместе с ETag
+        """
+        assert await CacheStorage.fill(items={'menu_1': b'{"id":"1"}'}, pages={'menus_list': b'[{"id":"1"}]'})
+
+        assert await CacheStorage.get('menu_1') == b'{"id":"1"}'
+        assert await CacheStorage.get_page('menus_list', CacheStorage.FULL_PAGE) == (b'[{"id":"1"}]', None)
+        assert await CacheStorage.get_etag('menu_1') == make_etag(b'{"id":"1"}')
+
+    async def test_not_found_marker(self) -> None:
+        """
+        Проверка, что маркер отсутствующей в БД записи читается из кэша и очищается вместе с ключом записи
+        """
+        await CacheStorage.set_not_found('menu_1')
+
+        assert await CacheStorage.get('menu_1') == CacheStorage.NOT_FOUND
+
+        await CacheStorage.delete('menu_1')
+
+        assert await CacheStorage.get('menu_1') is None
+
+    async def test_etag(self) -> None:
+        """
+        Проверка, что ETag вычисляется при записи в кэш и очищается вместе с записью
+        """
+        await CacheStorage.set('menu_1', b'{"id":"1"}')
+
+        assert await CacheStorage.get_etag('menu_1') == make_etag(b'{"id":"1"}')
+
+        await CacheStorage.delete('menu_1')
+
+        assert await CacheStorage.get_etag('menu_1') is None
+
+    async def test_generation_not_repeated(self) -> None:
+        """
+        Проверка, что номер поколения растет и не повторяется после устаревания счетчика
+        """
+        await CacheStorage.delete(generations=['menu_1_generation'])
+        first = await CacheStorage.get_generation('menu_1_generation')
+
+        await CacheStorage.delete(generations=['menu_1_generation'])
+
+        assert await CacheStorage.get_generation('menu_1_generation') > first > 0
+
+        # Устаревание счетчика
+        await redis_client.delete('menu_1_generation')
+        await asyncio.sleep(0.01)
+        await CacheStorage.delete(generations=['menu_1_generation'])
+
+        assert await CacheStorage.get_generation('menu_1_generation') > first
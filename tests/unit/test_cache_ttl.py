@@ -0,0 +1,44 @@
+import pytest
+
+from src.repositories.cache import ttl
+from src.repositories.cache.key_class import CacheKeyClass
+from src.repositories.cache.storage import CacheStorage
+from src.repositories.cache.ttl import CacheTTL
+
+
+@pytest.mark.unit
+class TestCacheTTL:
+    """
+    Тестирование политики времени жизни записей кэша
+    """
+
+    def test_jitter(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Проверка, что время жизни записи не меньше настроенного и не больше настроенного с надбавкой
+        """
+        monkeypatch.setattr(ttl, 'CACHE_TTL_JITTER', 0.1)
+        base = ttl.CACHE_TTL_ITEM
+        values = {CacheTTL.get(CacheKeyClass.ITEM) for _ in range(100)}
+
+        assert all(base <= value <= base * 1.1 for value in values)
+        assert len(values) > 1
+
+    def test_generation_outlives_items(self) -> None:
+        """
+        Проверка, что счетчик поколения живет дольше записей с номером поколения в ключе
+        """
+        assert CacheTTL.generation() > ttl.CACHE_TTL_ITEM * (1 + ttl.CACHE_TTL_JITTER)
+
+    def test_key_class(self) -> None:
+        """
+        Проверка определения класса ключа
+        """
+        assert CacheStorage.key_class('all_data') == CacheKeyClass.ALL_DATA
+        assert CacheStorage.key_class('all_data_menus') == CacheKeyClass.ALL_DATA
+        assert CacheStorage.key_class('menu_1_all_data') == CacheKeyClass.ALL_DATA
+        assert CacheStorage.key_class('menus_list') == CacheKeyClass.LIST
+        assert CacheStorage.key_class('menu_1:v2:submenu_3_dishes_list') == CacheKeyClass.LIST
+        assert CacheStorage.key_class('menu_1:v2:submenu_3_dish_4') == CacheKeyClass.ITEM
+        assert CacheStorage.key_class('menu_1_generation') == CacheKeyClass.GENERATION
+        assert CacheStorage.key_class('stale:all_data') == CacheKeyClass.STALE
+        assert CacheStorage.key_class('lock:menus_list:all') == CacheKeyClass.LOCK
@@ -1,4 +1,4 @@
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import pytest
 from sqlalchemy import select
@@ -7,7 +7,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.models.dish import Dish
 from src.models.submenu import Submenu
 from src.repositories.dish import DishRepository
-from src.schemas.dish import DishInOptionalSchema, DishInSchema
+from src.schemas.dish import (
+    DishBatchInSchema,
+    DishBatchUpdateSchema,
+    DishInOptionalSchema,
+    DishInSchema,
+)
 
 
 @pytest.mark.unit
@@ -28,7 +33,15 @@ class TestDishesRepositories:
         created_dish = await DishRepository.create(submenu_id=submenu.id, new_dish=dish_schema, session=session)
 
         assert created_dish
-        assert isinstance(created_dish.id, UUID)
+        assert UUID(created_dish['id'])
+        assert created_dish['menu_id'] == str(submenu.menu_id)
+        assert created_dish['price'] == '100.00'
+
+    async def test_create_dish_without_submenu(self, dish_schema: DishInSchema, session: AsyncSession) -> None:
+        """
+        Проверка, что блюдо не создается в отсутствующем подменю
+        """
+        assert await DishRepository.create(submenu_id=str(uuid4()), new_dish=dish_schema, session=session) is None
 
     async def test_get_dish(
             self,
@@ -44,6 +57,22 @@ class TestDishesRepositories:
         assert isinstance(dish_res.id, UUID)
         assert dish_res.id == dish.id
 
+    async def test_get_many_dishes(
+            self,
+            dish: Dish,
+            session: AsyncSession,
+    ) -> None:
+        """
+        Проверка метода для получения нескольких блюд по id вместе с id их меню и подменю
+        """
+        dishes = await DishRepository.get_many(dishes_ids=[dish.id, uuid4()], session=session)
+        submenu = await session.get(Submenu, dish.submenu_id)
+
+        assert len(dishes) == 1
+        assert dishes[0]['id'] == str(dish.id)
+        assert dishes[0]['submenu_id'] == str(dish.submenu_id)
+        assert dishes[0]['menu_id'] == str(submenu.menu_id)
+
     async def test_get_list_dishes(
             self,
             submenu: Submenu,
@@ -59,6 +88,7 @@ class TestDishesRepositories:
 
     async def test_update_dish(
             self,
+            submenu: Submenu,
             dish: Dish,
             dish_update_schema: DishInOptionalSchema,
             session: AsyncSession,
@@ -66,7 +96,10 @@ class TestDishesRepositories:
         """
         Проверка метода для обновления меню
         """
-        await DishRepository.update(dish_id=dish.id, data=dish_update_schema, session=session)
+        updated = await DishRepository.update(dish_id=dish.id, data=dish_update_schema, session=session)
+
+        assert updated['title'] == dish_update_schema.title
+        assert updated['menu_id'] == str(submenu.menu_id)
 
         query = select(Dish).where(Dish.id == dish.id)
         res = await session.execute(query)
@@ -74,6 +107,45 @@ class TestDishesRepositories:
 
         assert updated_dish.title == dish_update_schema.title
 
+    async def test_apply_batch(
+            self,
+            submenu: Submenu,
+            dish: Dish,
+            dish_schema: DishInSchema,
+            session: AsyncSession,
+    ) -> None:
+        """
+        Проверка метода для пакетного создания и обновления блюд
+        """
+        batch = DishBatchInSchema(
+            create=[dish_schema, dish_schema],
+            update=[DishBatchUpdateSchema(id=dish.id, title='Batch test dish')],
+        )
+        res = await DishRepository.apply_batch(submenu_id=submenu.id, batch=batch, session=session)
+
+        assert res['menu_id'] == str(submenu.menu_id)
+        assert len(res['created']) == 2
+        assert all(isinstance(created.id, UUID) for created in res['created'])
+        assert res['updated'][0].title == 'Batch test dish'
+        assert res['deleted'] == []
+
+    async def test_apply_batch_dish_not_found(
+            self,
+            submenu: Submenu,
+            dish_schema: DishInSchema,
+            session: AsyncSession,
+    ) -> None:
+        """
+        Проверка, что пакет не применяется, если какое-либо из блюд не найдено
+        """
+        batch = DishBatchInSchema(create=[dish_schema], delete=[uuid4()])
+        dishes_count = len(await DishRepository.get_list(submenu_id=submenu.id, session=session))
+
+        res = await DishRepository.apply_batch(submenu_id=submenu.id, batch=batch, session=session)
+
+        assert res is None
+        assert len(await DishRepository.get_list(submenu_id=submenu.id, session=session)) == dishes_count
+
     async def test_delete_dish(
             self,
             dish: Dish,
@@ -82,7 +154,9 @@ class TestDishesRepositories:
         """
         Проверка метода для удаления блюда по id
         """
-        await DishRepository.delete(dish_id=dish.id, session=session)
+        deleted = await DishRepository.delete(dish_id=dish.id, session=session)
+
+        assert deleted['dish_id'] == str(dish.id)
 
         query = select(Dish).where(Dish.id == dish.id)
         res = await session.execute(query)
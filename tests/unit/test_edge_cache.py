@@ -0,0 +1,84 @@
+import pytest
+
+from src.repositories.cache import edge
+from src.repositories.cache.edge import EdgeCache, EdgeRoute, LocalEdgePurger
+
+
+class FailingEdgePurger:
+    """
+    Очистка кэша CDN, завершающаяся ошибкой
+    """
+
+    @classmethod
+    async def purge(cls, keys: list[str]) -> None:
+        """
+        Очистка кэша CDN
+        """
+        raise OSError('CDN недоступен')
+
+
+@pytest.mark.unit
+class TestEdgeCache:
+    """
+    Тестирование заголовков кэширования ответов на CDN и очистки кэша CDN
+    """
+
+    @pytest.fixture(autouse=True)
+    def purger(self):
+        """
+        Очистка кэша CDN в памяти процесса на время теста
+        """
+        EdgeCache.configure('local')
+        LocalEdgePurger.reset()
+
+        yield
+
+        EdgeCache.configure(edge.EDGE_PURGER)
+
+    def test_headers_no_cache(self) -> None:
+        """
+        Проверка, что без времени хранения на CDN ответ перепроверяется, а суррогатные ключи передаются
+        """
+        headers = EdgeCache.headers('unknown', EdgeCache.menu(menu_id='1'), EdgeCache.menu_tree(menu_id='1'))
+
+        assert headers[EdgeCache.CACHE_CONTROL_HEADER] == 'no-cache'
+        assert headers[EdgeCache.SURROGATE_KEY_HEADER] == 'menu_1 menu_1_tree'
+
+    def test_headers_max_age(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Проверка, что время хранения на CDN передается в s-maxage вместе с stale-while-revalidate
+        """
+        monkeypatch.setitem(EdgeCache._EdgeCache__POLICIES, EdgeRoute.DISH, (60, 30))
+
+        headers = EdgeCache.headers(EdgeRoute.DISH, EdgeCache.dish(dish_id='1'))
+
+        assert headers[EdgeCache.CACHE_CONTROL_HEADER] == 'public, max-age=0, s-maxage=60, stale-while-revalidate=30'
+
+    def test_headers_per_route(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Проверка, что время хранения на CDN и stale-while-revalidate задаются для каждого роута отдельно
+        """
+        monkeypatch.setitem(EdgeCache._EdgeCache__POLICIES, EdgeRoute.MENUS, (10, 0))
+        monkeypatch.setitem(EdgeCache._EdgeCache__POLICIES, EdgeRoute.DISHES, (300, 60))
+
+        menus = EdgeCache.headers(EdgeRoute.MENUS, EdgeCache.MENUS)
+        dishes = EdgeCache.headers(EdgeRoute.DISHES, EdgeCache.dishes(submenu_id='1'))
+
+        assert menus[EdgeCache.CACHE_CONTROL_HEADER] == 'public, max-age=0, s-maxage=10'
+        assert dishes[EdgeCache.CACHE_CONTROL_HEADER] == 'public, max-age=0, s-maxage=300, stale-while-revalidate=60'
+
+    async def test_purge(self) -> None:
+        """
+        Проверка, что повторяющиеся суррогатные ключи очищаются один раз
+        """
+        await EdgeCache.purge(EdgeCache.ALL_DATA, EdgeCache.MENUS, EdgeCache.ALL_DATA)
+
+        assert LocalEdgePurger.purged == [EdgeCache.ALL_DATA, EdgeCache.MENUS]
+
+    async def test_purge_error(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Проверка, что ошибка очистки кэша CDN не прерывает очистку кэша
+        """
+        monkeypatch.setattr(EdgeCache, '_EdgeCache__purger', FailingEdgePurger)
+
+        await EdgeCache.purge(EdgeCache.ALL_DATA)
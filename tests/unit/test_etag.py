@@ -0,0 +1,37 @@
+import pytest
+
+from src.utils.etag import etag_matches, make_etag
+
+
+@pytest.mark.unit
+class TestEtag:
+    """
+    Тестирование формирования и сравнения ETag
+    """
+
+    def test_make_etag(self) -> None:
+        """
+        Проверка, что ETag - строка в кавычках, зависящая только от содержимого документа
+        """
+        etag = make_etag(b'[]')
+
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag == make_etag(b'[]')
+        assert etag != make_etag(b'[{}]')
+
+    @pytest.mark.parametrize(
+        'if_none_match, matches',
+        [
+            (None, False),
+            ('"other"', False),
+            ('"etag"', True),
+            ('"other", "etag"', True),
+            ('W/"etag"', True),
+            ('*', True),
+        ],
+    )
+    def test_etag_matches(self, if_none_match: str | None, matches: bool) -> None:
+        """
+        Проверка сравнения ETag с заголовком If-None-Match (список ETag, слабые ETag, *)
+        """
+        assert etag_matches(if_none_match, '"etag"') is matches
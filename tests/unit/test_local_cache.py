@@ -0,0 +1,86 @@
+import pytest
+
+from src.repositories.cache.local import LocalCache
+
+
+@pytest.mark.unit
+class TestLocalCache:
+    """
+    Тестирование процессного (L1) кэша
+    """
+
+    @pytest.fixture(autouse=True)
+    def active_cache(self):
+        """
+        Включение L1-кэша на время теста (в тестах подписка на инвалидацию не запускается)
+        """
+        LocalCache.active = True
+
+        yield
+
+        LocalCache.active = False
+        LocalCache.clear()
+
+    def test_get_set(self) -> None:
+        """
+        Проверка записи и чтения значения и страницы списка
+        """
+        LocalCache.set('menu_1', {'id': '1'}, size=10)
+        LocalCache.set('menus_list', {'items': []}, size=10, field='all')
+
+        assert LocalCache.get('menu_1') == {'id': '1'}
+        assert LocalCache.get('menus_list', field='all') == {'items': []}
+        assert LocalCache.get('menus_list') is None
+
+    def test_delete_with_fields(self) -> None:
+        """
+        Проверка очистки ключа вместе со всеми страницами списка
+        """
+        LocalCache.set('menus_list', {'items': []}, size=10, field='all')
+        LocalCache.set('menus_list', {'items': []}, size=10, field='10:')
+        LocalCache.delete('menus_list')
+
+        assert LocalCache.get('menus_list', field='all') is None
+        assert LocalCache.get('menus_list', field='10:') is None
+
+    def test_disabled_without_subscription(self) -> None:
+        """
+        Проверка, что без подписки на инвалидацию L1-кэш не используется
+        """
+        LocalCache.active = False
+        LocalCache.set('menu_1', {'id': '1'}, size=10)
+        LocalCache.active = True
+
+        assert LocalCache.get('menu_1') is None
+
+    def test_skip_invalidated_during_read(self) -> None:
+        """
+        Проверка, что значение, прочитанное до очистки ключа, не записывается в L1-кэш
+        (значения других ключей записываются)
+        """
+        version = LocalCache.version()
+        LocalCache.delete('menu_1')
+
+        LocalCache.set('menu_1', {'id': '1'}, size=10, version=version)
+        LocalCache.set('menu_2', {'id': '2'}, size=10, version=version)
+
+        assert LocalCache.get('menu_1') is None
+        assert LocalCache.get('menu_2') == {'id': '2'}
+
+    def test_skip_after_clear(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Проверка, что после полной очистки либо вытеснения номеров очистки значения, прочитанные раньше,
+        не записываются в L1-кэш
+        """
+        version = LocalCache.version()
+        LocalCache.clear()
+        LocalCache.set('menu_1', {'id': '1'}, size=10, version=version)
+
+        assert LocalCache.get('menu_1') is None
+
+        monkeypatch.setattr(LocalCache, 'INVALIDATED_KEYS', 1)
+        version = LocalCache.version()
+        LocalCache.delete('menu_2', 'menu_3')
+        LocalCache.set('menu_4', {'id': '4'}, size=10, version=version)
+
+        assert LocalCache.get('menu_4') is None
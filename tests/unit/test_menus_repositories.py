@@ -23,10 +23,13 @@ class TestMenusRepositoriess:
         """
         Проверка метода для создания меню
         """
-        menu_id = await MenuRepository.create(new_menu=menu_schema, session=session)
+        new_menu = await MenuRepository.create(new_menu=menu_schema, session=session)
 
-        assert menu_id
-        assert isinstance(menu_id, str)
+        assert new_menu
+        assert isinstance(new_menu['id'], str)
+        assert new_menu['title'] == menu_schema.title
+        assert new_menu['submenus_count'] == 0
+        assert new_menu['dishes_count'] == 0
 
     async def test_get_menu(
             self,
@@ -54,6 +57,49 @@ class TestMenusRepositoriess:
         assert menus_list
         assert isinstance(menus_list, list)
 
+    async def test_get_menu_with_counts(
+            self,
+            session: AsyncSession,
+            menu: Menu,
+    ) -> None:
+        """
+        Проверка метода для получения меню по id с кол-вом подменю и блюд, подсчитанным в БД
+        """
+        menu_res = await MenuRepository.get_with_counts(menu_id=menu.id, session=session)
+
+        assert menu_res
+        assert menu_res['id'] == str(menu.id)
+        assert menu_res['submenus_count'] == 0
+        assert menu_res['dishes_count'] == 0
+
+    @pytest.mark.usefixtures('menu')
+    async def test_get_list_menus_with_counts(
+            self,
+            session: AsyncSession
+    ) -> None:
+        """
+        Проверка метода для получения списка меню с кол-вом подменю и блюд, подсчитанным в БД
+        """
+        menus_list = await MenuRepository.get_list_with_counts(session=session)
+
+        assert menus_list
+        assert isinstance(menus_list, list)
+        assert all(isinstance(menu['submenus_count'], int) for menu in menus_list)
+        assert all(isinstance(menu['dishes_count'], int) for menu in menus_list)
+
+    async def test_get_many_menus_with_counts(
+            self,
+            session: AsyncSession,
+            menu: Menu,
+    ) -> None:
+        """
+        Проверка метода для получения нескольких меню по списку id одним запросом
+        """
+        menus_list = await MenuRepository.get_many_with_counts(menus_ids=[menu.id], session=session)
+
+        assert len(menus_list) == 1
+        assert menus_list[0]['id'] == str(menu.id)
+
     async def test_update_menu(
             self,
             menu: Menu,
@@ -63,7 +109,9 @@ class TestMenusRepositoriess:
         """
         Проверка метода для обновления меню
         """
-        await MenuRepository.update(menu_id=menu.id, data=menu_update_schema, session=session)
+        updated = await MenuRepository.update(menu_id=menu.id, data=menu_update_schema, session=session)
+
+        assert updated['title'] == menu_update_schema.title
 
         query = select(Menu).where(Menu.id == menu.id)
         res = await session.execute(query)
@@ -79,7 +127,9 @@ class TestMenusRepositoriess:
         """
         Проверка метода для удаления меню по id
         """
-        await MenuRepository.delete(delete_menu=menu, session=session)
+        deleted = await MenuRepository.delete(menu_id=menu.id, session=session)
+
+        assert deleted['menu_id'] == str(menu.id)
 
         query = select(Menu).where(Menu.id == menu.id)
         res = await session.execute(query)
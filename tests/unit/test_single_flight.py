@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+from aioredis.exceptions import ConnectionError
+from fastapi_redis import redis_client
+
+from src.repositories.cache.breaker import CacheCircuitBreaker
+from src.repositories.cache.single_flight import SingleFlight
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    """
+    Тестирование пересборки отсутствующей в кэше записи одним запросом
+    """
+
+    async def test_concurrent_misses_load_once(self) -> None:
+        """
+        Проверка, что одновременные промахи кэша по одному ключу выполняют один запрос к БД
+        """
+        calls = []
+
+        async def get_cached() -> None:
+            return None
+
+        async def load() -> dict:
+            calls.append(1)
+            await asyncio.sleep(0.1)
+
+            return {'items': [], 'next_after': None}
+
+        res = await asyncio.gather(
+            *(SingleFlight.run(key='test_single_flight', get_cached=get_cached, load=load) for _ in range(10))
+        )
+
+        assert len(calls) == 1
+        assert all(page == {'items': [], 'next_after': None} for page in res)
+
+    async def test_lock_check_failure_loads(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Проверка, что при ошибке Redis во время ожидания пересборки другим процессом запись запрашивается из БД
+        """
+        async def get_cached() -> None:
+            return None
+
+        async def load() -> dict:
+            return {'items': [], 'next_after': None}
+
+        async def exists(*args) -> None:
+            raise ConnectionError('Redis недоступен')
+
+        # Блокировка удерживается другим процессом
+        await redis_client.execute_command('SET', SingleFlight.LOCK_PREFIX + 'test_lock_check', 1, 'EX', 10)
+        monkeypatch.setattr(redis_client, 'exists', exists)
+
+        try:
+            res = await SingleFlight.run(key='test_lock_check', get_cached=get_cached, load=load)
+
+        finally:
+            monkeypatch.undo()
+            await redis_client.delete(SingleFlight.LOCK_PREFIX + 'test_lock_check')
+            CacheCircuitBreaker.reset()
+
+        assert res == {'items': [], 'next_after': None}
@@ -25,10 +25,12 @@ class TestSubmenusRepositories:
         """
         Проверка метода для создания подменю
         """
-        submenu_id = await SubmenuRepository.create(menu_id=menu.id, new_submenu=submenu_schema, session=session)
+        new_submenu = await SubmenuRepository.create(menu_id=menu.id, new_submenu=submenu_schema, session=session)
 
-        assert submenu_id
-        assert isinstance(submenu_id, str)
+        assert new_submenu
+        assert isinstance(new_submenu['id'], str)
+        assert new_submenu['menu_id'] == str(menu.id)
+        assert new_submenu['dishes_count'] == 0
 
     async def test_get_submenu(
             self,
@@ -58,6 +60,34 @@ class TestSubmenusRepositories:
         assert isinstance(submenus_list, list)
         assert len(submenus_list) == 2
 
+    async def test_get_submenu_with_counts(
+            self,
+            submenu: Submenu,
+            session: AsyncSession,
+    ) -> None:
+        """
+        Проверка метода для получения подменю по id с кол-вом блюд, подсчитанным в БД
+        """
+        submenu_res = await SubmenuRepository.get_with_counts(submenu_id=submenu.id, session=session)
+
+        assert submenu_res
+        assert submenu_res['id'] == str(submenu.id)
+        assert submenu_res['dishes_count'] == 0
+
+    async def test_get_list_submenus_with_counts(
+            self,
+            menu: Menu,
+            session: AsyncSession
+    ) -> None:
+        """
+        Проверка метода для получения списка подменю с кол-вом блюд, подсчитанным в БД
+        """
+        submenus_list = await SubmenuRepository.get_list_with_counts(menu_id=menu.id, session=session)
+
+        assert isinstance(submenus_list, list)
+        assert len(submenus_list) == 2
+        assert all(submenu['dishes_count'] == 0 for submenu in submenus_list)
+
     async def test_update_submenu(
             self,
             submenu: Submenu,
@@ -67,7 +97,9 @@ class TestSubmenusRepositories:
         """
         Проверка метода для обновления меню
         """
-        await SubmenuRepository.update(submenu_id=submenu.id, data=submenu_update_schema, session=session)
+        updated = await SubmenuRepository.update(submenu_id=submenu.id, data=submenu_update_schema, session=session)
+
+        assert updated['title'] == submenu_update_schema.title
 
         query = select(Submenu).where(Submenu.id == submenu.id)
         res = await session.execute(query)
@@ -83,7 +115,9 @@ class TestSubmenusRepositories:
         """
         Проверка метода для удаления подменю по id
         """
-        await SubmenuRepository.delete(delete_submenu=submenu, session=session)
+        deleted = await SubmenuRepository.delete(submenu_id=submenu.id, session=session)
+
+        assert deleted['submenu_id'] == str(submenu.id)
 
         query = select(Submenu).where(Submenu.id == submenu.id)
         res = await session.execute(query)